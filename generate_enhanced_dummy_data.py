@@ -6,14 +6,22 @@ COVID-19 Indonesia Enhanced Database
 
 import pandas as pd
 import numpy as np
-import random
-from datetime import datetime, timedelta, date
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date
+from functools import lru_cache
 import json
 import os
+import re
 
-# Set random seed untuk reproducibility
-np.random.seed(42)
-random.seed(42)
+# Seed untuk reproducibility; semua kolom ditarik sekaligus dari satu Generator.
+# main() memberi tiap tabel stream sendiri (SeedSequence.spawn), RNG hanya
+# dipakai jika generator dipanggil langsung tanpa rng
+RANDOM_SEED = 42
+RNG = np.random.default_rng(RANDOM_SEED)
+
+# Proses paralel untuk generate tabel (satu tabel per proses)
+GENERATOR_WORKERS = int(os.getenv('GENERATOR_WORKERS', os.cpu_count() or 1))
 
 # Data provinsi Indonesia
 PROVINSI_DATA = {
@@ -29,216 +37,271 @@ PROVINSI_DATA = {
     'ID-PA': 'Papua', 'ID-PB': 'Papua Barat'
 }
 
-def generate_rumah_sakit_data():
+# Ukuran provinsi menentukan jumlah fasilitas dan cluster
+PROVINSI_BESAR = ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT']
+PROVINSI_SEDANG = ['ID-SU', 'ID-SB', 'ID-SS', 'ID-BA', 'ID-SN']
+
+ISO_CODES = np.array(list(PROVINSI_DATA.keys()))
+NAMA_PROVINSI = np.array(list(PROVINSI_DATA.values()))
+
+# Populasi estimasi per provinsi (dalam jutaan), default 3 juta
+POPULASI_JUTA = {
+    'ID-JB': 48, 'ID-JI': 40, 'ID-JT': 36, 'ID-SU': 15, 'ID-JK': 11,
+    'ID-SN': 9, 'ID-RI': 6, 'ID-LA': 8, 'ID-SS': 8, 'ID-AC': 5
+}
+
+# --scale N: N kabupaten sintetis per provinsi (kode ID-XX-001), data harian
+# dan N kali lebih banyak rumah sakit, lab dan cluster. Skala 1 = data asli.
+MAX_SCALE = 999
+
+# Baris per chunk; generator menghasilkan DataFrame per chunk yang langsung ditulis ke CSV,
+# sehingga memori tetap konstan berapa pun skalanya
+CHUNK_ROWS = 100_000
+
+def _rng(rng):
+    """Generator to draw from: the given one or the module-wide seeded RNG"""
+    return RNG if rng is None else rng
+
+@lru_cache(maxsize=None)
+def synthetic_locations(scale=1):
+    """Lokasi data untuk skala ini: 34 provinsi, atau `scale` kabupaten sintetis per provinsi
+
+    Returns (iso_code, nama, provinsi) arrays where provinsi is the parent
+    province's iso_code (equal to iso_code at scale 1).
+    """
+    if not 1 <= scale <= MAX_SCALE:
+        raise ValueError(f"scale must be between 1 and {MAX_SCALE}, got {scale}")
+    if scale == 1:
+        return ISO_CODES, NAMA_PROVINSI, ISO_CODES
+    
+    provinsi = np.repeat(ISO_CODES, scale)
+    nomor = np.char.zfill(np.tile(np.arange(1, scale + 1), len(ISO_CODES)).astype(str), 3)
+    iso_code = np.asarray(_text(provinsi, '-', nomor), dtype=str)
+    nama = np.asarray(_text('Kabupaten ', np.repeat(NAMA_PROVINSI, scale), ' ', nomor), dtype=str)
+    return iso_code, nama, provinsi
+
+def cadence_days(scale=1):
+    """Jarak hari data time series: mingguan pada skala 1, harian jika diskalakan"""
+    return 7 if scale == 1 else 1
+
+def location_population(scale=1):
+    """Populasi per lokasi: estimasi provinsi dibagi rata ke kabupatennya
+
+    Dipakai bersama oleh LOKASI, STATISTIK_HARIAN dan VAKSINASI_DETAIL agar
+    angka per juta dan target vaksinasi konsisten antar tabel.
+    """
+    _, _, provinsi = synthetic_locations(scale)
+    return _lookup(POPULASI_JUTA, provinsi, 3) * 1000000 // scale
+
+def _per_location_counts(rng, scale, besar, sedang, kecil):
+    """Random row count per location from (low, high) ranges by the parent province's size"""
+    _, _, provinsi = synthetic_locations(scale)
+    ranges = np.array([besar if iso in PROVINSI_BESAR else sedang if iso in PROVINSI_SEDANG else kecil
+                       for iso in provinsi])
+    return rng.integers(ranges[:, 0], ranges[:, 1] + 1)
+
+def _chunks(total, chunk_rows):
+    """(start, stop) row ranges of at most chunk_rows rows covering total rows"""
+    return ((start, min(start + chunk_rows, total)) for start in range(0, total, chunk_rows))
+
+def _location_rows(counts, scale, start, stop):
+    """Rows start..stop of per-location counts expanded to (iso_code, nama lokasi, 1-based number) columns"""
+    iso_codes, nama, _ = synthetic_locations(scale)
+    ends = np.cumsum(counts)
+    rows = np.arange(start, stop)
+    idx = np.searchsorted(ends, rows, side='right')
+    nomor = rows - (ends - counts)[idx] + 1
+    return iso_codes[idx], nama[idx], nomor
+
+def _dates(start_date, end_date, scale):
+    """Every cadence_days(scale)-th day from start_date to end_date"""
+    return np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1, cadence_days(scale))
+
+def _grid_rows(n_locations, start, stop):
+    """Rows start..stop of an (outer key x location) grid as (outer index, location index) columns"""
+    rows = np.arange(start, stop)
+    return rows // n_locations, rows % n_locations
+
+def _period(values, boundaries):
+    """Index of the period each value falls in: 0 before boundaries[0], 1 before boundaries[1], ..."""
+    return np.searchsorted(np.asarray(boundaries), values, side='right')
+
+def _uniform(rng, ranges, idx):
+    """Uniform draws with per-row (low, high) picked from ranges by idx"""
+    ranges = np.asarray(ranges, dtype=float)
+    return rng.uniform(ranges[idx, 0], ranges[idx, 1])
+
+def _randint(rng, ranges, idx):
+    """Inclusive integer draws with per-row (low, high) picked from ranges by idx"""
+    ranges = np.asarray(ranges)
+    return rng.integers(ranges[idx, 0], ranges[idx, 1] + 1)
+
+def _frac(total, rng, low, high):
+    """int(total * uniform(low, high)) for every row"""
+    return (total * rng.uniform(low, high, len(total))).astype(np.int64)
+
+def _coin(rng, n, p=0.5):
+    """random.choice([True, False]) style booleans with P(True) = p"""
+    return rng.random(n) < p
+
+def _text(*parts):
+    """Concatenate strings and per-row values element-wise"""
+    result = ''
+    for part in parts:
+        result = result + (part if isinstance(part, str) else pd.Series(part).astype(str).to_numpy(dtype=object))
+    return result
+
+def _lookup(mapping, keys, default):
+    """Per-row mapping[key] with a default"""
+    return np.array([mapping.get(key, default) for key in keys])
+
+def generate_rumah_sakit_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data rumah sakit dummy"""
     print("🏥 Generating Rumah Sakit data...")
+    rng = _rng(rng)
     
-    data = []
-    id_counter = 1
-    
-    for iso_code, nama_provinsi in PROVINSI_DATA.items():
-        # Tentukan jumlah rumah sakit berdasarkan populasi provinsi
-        if iso_code in ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT']:  # Provinsi besar
-            num_hospitals = random.randint(15, 25)
-        elif iso_code in ['ID-SU', 'ID-SB', 'ID-SS', 'ID-BA', 'ID-SN']:  # Provinsi sedang
-            num_hospitals = random.randint(8, 15)
-        else:  # Provinsi kecil
-            num_hospitals = random.randint(3, 8)
-        
-        for i in range(num_hospitals):
-            # Tipe rumah sakit
-            tipe_rs = np.random.choice(['Pemerintah', 'Swasta', 'TNI/Polri', 'BUMN'], 
-                                    p=[0.4, 0.45, 0.1, 0.05])
-            
-            # Kelas rumah sakit
-            if tipe_rs == 'Pemerintah':
-                kelas_rs = np.random.choice(['A', 'B', 'C', 'D'], p=[0.1, 0.3, 0.4, 0.2])
-            else:
-                kelas_rs = np.random.choice(['A', 'B', 'C'], p=[0.2, 0.5, 0.3])
-            
-            # Kapasitas berdasarkan kelas
-            if kelas_rs == 'A':
-                total_bed = random.randint(300, 800)
-                icu_bed = int(total_bed * random.uniform(0.05, 0.1))
-                isolation_bed = int(total_bed * random.uniform(0.1, 0.2))
-            elif kelas_rs == 'B':
-                total_bed = random.randint(150, 300)
-                icu_bed = int(total_bed * random.uniform(0.03, 0.08))
-                isolation_bed = int(total_bed * random.uniform(0.08, 0.15))
-            elif kelas_rs == 'C':
-                total_bed = random.randint(50, 150)
-                icu_bed = int(total_bed * random.uniform(0.02, 0.05))
-                isolation_bed = int(total_bed * random.uniform(0.05, 0.1))
-            else:  # Kelas D
-                total_bed = random.randint(20, 50)
-                icu_bed = int(total_bed * random.uniform(0.01, 0.03))
-                isolation_bed = int(total_bed * random.uniform(0.03, 0.08))
-            
-            emergency_bed = int(total_bed * random.uniform(0.05, 0.1))
-            
-            # Fasilitas medis
-            ventilator_count = max(1, int(icu_bed * random.uniform(0.8, 1.2)))
-            oxygen_capacity = total_bed * random.randint(5, 15)  # liter per menit per bed
-            
-            # Tenaga medis
-            doctor_count = max(5, int(total_bed * random.uniform(0.1, 0.3)))
-            nurse_count = max(10, int(total_bed * random.uniform(0.5, 1.2)))
-            specialist_count = max(2, int(doctor_count * random.uniform(0.2, 0.5)))
-            
+    # Tentukan jumlah rumah sakit berdasarkan populasi provinsi
+    counts = _per_location_counts(rng, scale, (15, 25), (8, 15), (3, 8))
+    for start, stop in _chunks(counts.sum(), chunk_rows):
+        iso_code, nama_lokasi, nomor = _location_rows(counts, scale, start, stop)
+        n = stop - start
+        
+        # Tipe rumah sakit
+        tipe_rs = rng.choice(['Pemerintah', 'Swasta', 'TNI/Polri', 'BUMN'], n, p=[0.4, 0.45, 0.1, 0.05])
+        
+        # Kelas rumah sakit (0=A, 1=B, 2=C, 3=D); kelas D hanya untuk RS pemerintah
+        kelas_idx = np.where(tipe_rs == 'Pemerintah',
+                             rng.choice(4, n, p=[0.1, 0.3, 0.4, 0.2]),
+                             rng.choice(3, n, p=[0.2, 0.5, 0.3]))
+        kelas_rs = np.array(['A', 'B', 'C', 'D'])[kelas_idx]
+        
+        # Kapasitas berdasarkan kelas
+        total_bed = _randint(rng, [(300, 800), (150, 300), (50, 150), (20, 50)], kelas_idx)
+        icu_bed = (total_bed * _uniform(rng, [(0.05, 0.1), (0.03, 0.08), (0.02, 0.05), (0.01, 0.03)], kelas_idx)).astype(np.int64)
+        isolation_bed = (total_bed * _uniform(rng, [(0.1, 0.2), (0.08, 0.15), (0.05, 0.1), (0.03, 0.08)], kelas_idx)).astype(np.int64)
+        emergency_bed = _frac(total_bed, rng, 0.05, 0.1)
+        
+        # Fasilitas medis
+        ventilator_count = np.maximum(1, _frac(icu_bed, rng, 0.8, 1.2))
+        oxygen_capacity = total_bed * rng.integers(5, 16, n)  # liter per menit per bed
+        
+        # Tenaga medis
+        doctor_count = np.maximum(5, _frac(total_bed, rng, 0.1, 0.3))
+        nurse_count = np.maximum(10, _frac(total_bed, rng, 0.5, 1.2))
+        specialist_count = np.maximum(2, _frac(doctor_count, rng, 0.2, 0.5))
+        
+        kelas_besar = kelas_idx <= 1  # Kelas A dan B
+        
+        yield pd.DataFrame({
+            'id_rumah_sakit': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'nama_rumah_sakit': _text('RS ', rng.choice(["Umum", "Daerah", "Swasta", "Bhayangkara", "TNI"], n),
+                                      ' ', nama_lokasi, ' ', nomor),
+            'tipe_rumah_sakit': tipe_rs,
+            'kelas_rumah_sakit': kelas_rs,
+            'total_bed': total_bed,
+            'icu_bed': icu_bed,
+            'isolation_bed': isolation_bed,
+            'emergency_bed': emergency_bed,
+            'ventilator_count': ventilator_count,
+            'oxygen_capacity': oxygen_capacity,
+            'ct_scan_available': kelas_besar & _coin(rng, n),
+            'pcr_lab_available': _coin(rng, n, np.where(kelas_besar, 1 / 2, 1 / 3)),
+            'doctor_count': doctor_count,
+            'nurse_count': nurse_count,
+            'specialist_count': specialist_count,
             # Koordinat dummy (sekitar Indonesia)
-            latitude = random.uniform(-11, 6)  # Range latitude Indonesia
-            longitude = random.uniform(95, 141)  # Range longitude Indonesia
-            
-            data.append({
-                'id_rumah_sakit': id_counter,
-                'iso_code': iso_code,
-                'nama_rumah_sakit': f'RS {random.choice(["Umum", "Daerah", "Swasta", "Bhayangkara", "TNI"])} {nama_provinsi} {i+1}',
-                'tipe_rumah_sakit': tipe_rs,
-                'kelas_rumah_sakit': kelas_rs,
-                'total_bed': total_bed,
-                'icu_bed': icu_bed,
-                'isolation_bed': isolation_bed,
-                'emergency_bed': emergency_bed,
-                'ventilator_count': ventilator_count,
-                'oxygen_capacity': oxygen_capacity,
-                'ct_scan_available': random.choice([True, False]) if kelas_rs in ['A', 'B'] else False,
-                'pcr_lab_available': random.choice([True, False]) if kelas_rs in ['A', 'B'] else random.choice([True, False, False]),
-                'doctor_count': doctor_count,
-                'nurse_count': nurse_count,
-                'specialist_count': specialist_count,
-                'latitude': round(latitude, 6),
-                'longitude': round(longitude, 6),
-                'alamat': f'Jl. Kesehatan No. {random.randint(1, 100)}, {nama_provinsi}',
-                'covid_referral': random.choice([True, False]),
-                'operational_status': np.random.choice(['Aktif', 'Tutup Sementara', 'Renovasi'], p=[0.9, 0.08, 0.02])
-            })
-            
-            id_counter += 1
-    
-    return pd.DataFrame(data)
+            'latitude': np.round(rng.uniform(-11, 6, n), 6),
+            'longitude': np.round(rng.uniform(95, 141, n), 6),
+            'alamat': _text('Jl. Kesehatan No. ', rng.integers(1, 101, n), ', ', nama_lokasi),
+            'covid_referral': _coin(rng, n),
+            'operational_status': rng.choice(['Aktif', 'Tutup Sementara', 'Renovasi'], n, p=[0.9, 0.08, 0.02])
+        })
 
-def generate_vaksinasi_detail_data():
+def generate_vaksinasi_detail_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data vaksinasi detail dummy"""
     print("💉 Generating Vaksinasi Detail data...")
+    rng = _rng(rng)
     
-    data = []
-    id_counter = 1
-    
-    # Generate data untuk periode Maret 2021 - September 2022 (program vaksinasi)
-    start_date = date(2021, 3, 1)
-    end_date = date(2022, 9, 15)
-    current_date = start_date
-    
-    while current_date <= end_date:
-        for iso_code, nama_provinsi in PROVINSI_DATA.items():
-            # Populasi estimasi per provinsi (dalam jutaan)
-            pop_estimates = {
-                'ID-JB': 48, 'ID-JI': 40, 'ID-JT': 36, 'ID-SU': 15, 'ID-JK': 11,
-                'ID-SN': 9, 'ID-RI': 6, 'ID-LA': 8, 'ID-SS': 8, 'ID-AC': 5
-            }
-            populasi = pop_estimates.get(iso_code, 3) * 1000000  # default 3 juta
-            
-            # Target vaksinasi harian (0.1% - 0.5% populasi per hari)
-            target_harian = int(populasi * random.uniform(0.001, 0.005))
-            
-            # Distribusi jenis vaksin berdasarkan periode
-            if current_date < date(2021, 6, 1):  # Awal program
-                vaksin_sinovac = int(target_harian * random.uniform(0.7, 0.9))
-                vaksin_astrazeneca = int(target_harian * random.uniform(0.1, 0.3))
-                vaksin_pfizer = 0
-                vaksin_moderna = 0
-            elif current_date < date(2021, 10, 1):  # Pertengahan
-                vaksin_sinovac = int(target_harian * random.uniform(0.4, 0.6))
-                vaksin_astrazeneca = int(target_harian * random.uniform(0.2, 0.4))
-                vaksin_pfizer = int(target_harian * random.uniform(0.1, 0.2))
-                vaksin_moderna = int(target_harian * random.uniform(0.05, 0.15))
-            else:  # Akhir program
-                vaksin_sinovac = int(target_harian * random.uniform(0.2, 0.4))
-                vaksin_astrazeneca = int(target_harian * random.uniform(0.1, 0.3))
-                vaksin_pfizer = int(target_harian * random.uniform(0.3, 0.5))
-                vaksin_moderna = int(target_harian * random.uniform(0.1, 0.3))
-            
-            vaksin_lainnya = max(0, target_harian - (vaksin_sinovac + vaksin_astrazeneca + vaksin_pfizer + vaksin_moderna))
-            
-            # Distribusi dosis
-            total_vaksin = vaksin_sinovac + vaksin_astrazeneca + vaksin_pfizer + vaksin_moderna + vaksin_lainnya
-            
-            if current_date < date(2021, 8, 1):  # Fokus dosis 1
-                dosis_1 = int(total_vaksin * random.uniform(0.7, 0.9))
-                dosis_2 = int(total_vaksin * random.uniform(0.1, 0.3))
-                dosis_booster = 0
-            elif current_date < date(2022, 1, 1):  # Fokus dosis 2
-                dosis_1 = int(total_vaksin * random.uniform(0.3, 0.5))
-                dosis_2 = int(total_vaksin * random.uniform(0.5, 0.7))
-                dosis_booster = int(total_vaksin * random.uniform(0.0, 0.1))
-            else:  # Program booster
-                dosis_1 = int(total_vaksin * random.uniform(0.2, 0.3))
-                dosis_2 = int(total_vaksin * random.uniform(0.3, 0.5))
-                dosis_booster = int(total_vaksin * random.uniform(0.2, 0.5))
-            
-            # Kelompok sasaran
-            lansia_vaksin = int(total_vaksin * random.uniform(0.15, 0.25))
-            dewasa_vaksin = int(total_vaksin * random.uniform(0.6, 0.75))
-            remaja_vaksin = int(total_vaksin * random.uniform(0.05, 0.15))
-            anak_vaksin = int(total_vaksin * random.uniform(0.0, 0.1)) if current_date > date(2021, 12, 1) else 0
-            
+    # Generate data untuk periode Maret 2021 - September 2022 (program vaksinasi),
+    # data mingguan untuk mengurangi volume (harian jika diskalakan)
+    iso_codes, _, provinsi = synthetic_locations(scale)
+    dates = _dates(date(2021, 3, 1), date(2022, 9, 15), scale)
+    for start, stop in _chunks(len(dates) * len(iso_codes), chunk_rows):
+        hari, lokasi = _grid_rows(len(iso_codes), start, stop)
+        tanggal = dates[hari]
+        iso_code = iso_codes[lokasi]
+        n = stop - start
+        
+        # Populasi estimasi, dibagi rata ke kabupaten
+        populasi = location_population(scale)[lokasi]
+        
+        # Target vaksinasi harian (0.1% - 0.5% populasi per hari)
+        target_harian = _frac(populasi, rng, 0.001, 0.005)
+        
+        # Distribusi jenis vaksin berdasarkan periode: awal program, pertengahan, akhir program
+        periode = _period(tanggal, np.array(['2021-06-01', '2021-10-01'], dtype='datetime64[D]'))
+        vaksin_sinovac = (target_harian * _uniform(rng, [(0.7, 0.9), (0.4, 0.6), (0.2, 0.4)], periode)).astype(np.int64)
+        vaksin_astrazeneca = (target_harian * _uniform(rng, [(0.1, 0.3), (0.2, 0.4), (0.1, 0.3)], periode)).astype(np.int64)
+        vaksin_pfizer = (target_harian * _uniform(rng, [(0, 0), (0.1, 0.2), (0.3, 0.5)], periode)).astype(np.int64)
+        vaksin_moderna = (target_harian * _uniform(rng, [(0, 0), (0.05, 0.15), (0.1, 0.3)], periode)).astype(np.int64)
+        
+        vaksin_utama = vaksin_sinovac + vaksin_astrazeneca + vaksin_pfizer + vaksin_moderna
+        vaksin_lainnya = np.maximum(0, target_harian - vaksin_utama)
+        
+        # Distribusi dosis: fokus dosis 1, fokus dosis 2, program booster
+        total_vaksin = vaksin_utama + vaksin_lainnya
+        periode_dosis = _period(tanggal, np.array(['2021-08-01', '2022-01-01'], dtype='datetime64[D]'))
+        dosis_1 = (total_vaksin * _uniform(rng, [(0.7, 0.9), (0.3, 0.5), (0.2, 0.3)], periode_dosis)).astype(np.int64)
+        dosis_2 = (total_vaksin * _uniform(rng, [(0.1, 0.3), (0.5, 0.7), (0.3, 0.5)], periode_dosis)).astype(np.int64)
+        dosis_booster = (total_vaksin * _uniform(rng, [(0, 0), (0.0, 0.1), (0.2, 0.5)], periode_dosis)).astype(np.int64)
+        
+        yield pd.DataFrame({
+            'id_vaksinasi': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'tanggal': tanggal,
+            'vaksin_sinovac': vaksin_sinovac,
+            'vaksin_astrazeneca': vaksin_astrazeneca,
+            'vaksin_pfizer': vaksin_pfizer,
+            'vaksin_moderna': vaksin_moderna,
+            'vaksin_novavax': (vaksin_lainnya * 0.3).astype(np.int64),
+            'vaksin_lainnya': (vaksin_lainnya * 0.7).astype(np.int64),
+            'dosis_1': dosis_1,
+            'dosis_2': dosis_2,
+            'dosis_booster': dosis_booster,
+            # Kelompok sasaran; anak baru divaksin setelah 1 Desember 2021
+            'lansia_vaksin': _frac(total_vaksin, rng, 0.15, 0.25),
+            'dewasa_vaksin': _frac(total_vaksin, rng, 0.6, 0.75),
+            'remaja_vaksin': _frac(total_vaksin, rng, 0.05, 0.15),
+            'anak_vaksin': np.where(tanggal > np.datetime64('2021-12-01'), _frac(total_vaksin, rng, 0.0, 0.1), 0),
             # Profesi prioritas
-            nakes_vaksin = int(total_vaksin * random.uniform(0.05, 0.15))
-            guru_vaksin = int(total_vaksin * random.uniform(0.03, 0.1))
-            petugas_publik_vaksin = int(total_vaksin * random.uniform(0.02, 0.08))
-            
+            'nakes_vaksin': _frac(total_vaksin, rng, 0.05, 0.15),
+            'guru_vaksin': _frac(total_vaksin, rng, 0.03, 0.1),
+            'petugas_publik_vaksin': _frac(total_vaksin, rng, 0.02, 0.08),
             # Lokasi vaksinasi
-            puskesmas_vaksin = int(total_vaksin * random.uniform(0.4, 0.6))
-            rumah_sakit_vaksin = int(total_vaksin * random.uniform(0.2, 0.3))
-            sentra_vaksin = int(total_vaksin * random.uniform(0.1, 0.2))
-            drive_thru_vaksin = int(total_vaksin * random.uniform(0.05, 0.15))
-            
+            'puskesmas_vaksin': _frac(total_vaksin, rng, 0.4, 0.6),
+            'rumah_sakit_vaksin': _frac(total_vaksin, rng, 0.2, 0.3),
+            'sentra_vaksin': _frac(total_vaksin, rng, 0.1, 0.2),
+            'drive_thru_vaksin': _frac(total_vaksin, rng, 0.05, 0.15),
             # KIPI (Kejadian Ikutan Pasca Imunisasi)
-            kipi_ringan = int(total_vaksin * random.uniform(0.01, 0.05))
-            kipi_sedang = int(total_vaksin * random.uniform(0.001, 0.01))
-            kipi_berat = int(total_vaksin * random.uniform(0.0001, 0.001))
-            
-            data.append({
-                'id_vaksinasi': id_counter,
-                'iso_code': iso_code,
-                'tanggal': current_date,
-                'vaksin_sinovac': vaksin_sinovac,
-                'vaksin_astrazeneca': vaksin_astrazeneca,
-                'vaksin_pfizer': vaksin_pfizer,
-                'vaksin_moderna': vaksin_moderna,
-                'vaksin_novavax': int(vaksin_lainnya * 0.3),
-                'vaksin_lainnya': int(vaksin_lainnya * 0.7),
-                'dosis_1': dosis_1,
-                'dosis_2': dosis_2,
-                'dosis_booster': dosis_booster,
-                'lansia_vaksin': lansia_vaksin,
-                'dewasa_vaksin': dewasa_vaksin,
-                'remaja_vaksin': remaja_vaksin,
-                'anak_vaksin': anak_vaksin,
-                'nakes_vaksin': nakes_vaksin,
-                'guru_vaksin': guru_vaksin,
-                'petugas_publik_vaksin': petugas_publik_vaksin,
-                'puskesmas_vaksin': puskesmas_vaksin,
-                'rumah_sakit_vaksin': rumah_sakit_vaksin,
-                'sentra_vaksin': sentra_vaksin,
-                'drive_thru_vaksin': drive_thru_vaksin,
-                'kipi_ringan': kipi_ringan,
-                'kipi_sedang': kipi_sedang,
-                'kipi_berat': kipi_berat
-            })
-            
-            id_counter += 1
-        
-        current_date += timedelta(days=7)  # Data mingguan untuk mengurangi volume
-    
-    return pd.DataFrame(data)
+            'kipi_ringan': _frac(total_vaksin, rng, 0.01, 0.05),
+            'kipi_sedang': _frac(total_vaksin, rng, 0.001, 0.01),
+            'kipi_berat': _frac(total_vaksin, rng, 0.0001, 0.001)
+        })
+
+# Sektor terdampak per jenis kebijakan: True/False tetap, None = acak
+# (pendidikan, ekonomi, transportasi, pariwisata, ibadah)
+SEKTOR_KEBIJAKAN = {
+    'ketat': (True, True, True, True, True),        # PPKM Level 4, PSBB
+    'PPKM Level 3': (True, True, None, True, None),
+    'Work From Home': (False, True, False, False, False),
+    'lainnya': (None, None, None, None, None)
+}
 
-def generate_kebijakan_pemerintah_data():
+def generate_kebijakan_pemerintah_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data kebijakan pemerintah dummy"""
     print("📋 Generating Kebijakan Pemerintah data...")
-    
-    data = []
-    id_counter = 1
+    rng = _rng(rng)
     
     # Timeline kebijakan nasional dan regional
     kebijakan_timeline = [
@@ -261,557 +324,865 @@ def generate_kebijakan_pemerintah_data():
         {'tanggal': '2022-06-01', 'jenis': 'PPKM Level 1', 'tingkat': 2, 'nasional': False},
     ]
     
+    # Lokasi yang terkena tiap kebijakan (semua kabupaten di provinsi yang terkena)
+    iso_codes, nama, provinsi = synthetic_locations(scale)
+    lokasi_per_kebijakan = []
     for kebijakan in kebijakan_timeline:
         if kebijakan['nasional']:
             # Kebijakan nasional - berlaku untuk semua provinsi
-            provinsi_list = list(PROVINSI_DATA.keys())
+            provinsi_list = ISO_CODES
+        elif 'PPKM Level 4' in kebijakan['jenis']:
+            # PPKM Level 4 biasanya di daerah dengan kasus tinggi
+            provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT', 'ID-BT', 'ID-BA']
+        elif 'PPKM Level 3' in kebijakan['jenis']:
+            provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT', 'ID-BT', 'ID-BA', 'ID-SU', 'ID-SN', 'ID-SS']
+        elif 'PSBB' in kebijakan['jenis']:
+            provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI']
         else:
-            # Kebijakan regional - hanya beberapa provinsi
-            if 'PPKM Level 4' in kebijakan['jenis']:
-                # PPKM Level 4 biasanya di daerah dengan kasus tinggi
-                provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT', 'ID-BT', 'ID-BA']
-            elif 'PPKM Level 3' in kebijakan['jenis']:
-                provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT', 'ID-BT', 'ID-BA', 'ID-SU', 'ID-SN', 'ID-SS']
-            elif 'PSBB' in kebijakan['jenis']:
-                provinsi_list = ['ID-JK', 'ID-JB', 'ID-JI']
-            else:
-                # Pilih random beberapa provinsi
-                provinsi_list = random.sample(list(PROVINSI_DATA.keys()), random.randint(5, 15))
-        
-        for iso_code in provinsi_list:
-            tanggal_mulai = datetime.strptime(kebijakan['tanggal'], '%Y-%m-%d').date()
-            
-            # Durasi kebijakan (2 minggu - 3 bulan)
-            durasi_hari = random.randint(14, 90)
-            tanggal_selesai = tanggal_mulai + timedelta(days=durasi_hari)
-            
-            # Sektor yang terdampak berdasarkan jenis kebijakan
-            if 'PPKM Level 4' in kebijakan['jenis'] or 'PSBB' in kebijakan['jenis']:
-                sektor_pendidikan = True
-                sektor_ekonomi = True
-                sektor_transportasi = True
-                sektor_pariwisata = True
-                sektor_ibadah = True
-            elif 'PPKM Level 3' in kebijakan['jenis']:
-                sektor_pendidikan = True
-                sektor_ekonomi = True
-                sektor_transportasi = random.choice([True, False])
-                sektor_pariwisata = True
-                sektor_ibadah = random.choice([True, False])
-            elif 'Work From Home' in kebijakan['jenis']:
-                sektor_pendidikan = False
-                sektor_ekonomi = True
-                sektor_transportasi = False
-                sektor_pariwisata = False
-                sektor_ibadah = False
-            else:
-                sektor_pendidikan = random.choice([True, False])
-                sektor_ekonomi = random.choice([True, False])
-                sektor_transportasi = random.choice([True, False])
-                sektor_pariwisata = random.choice([True, False])
-                sektor_ibadah = random.choice([True, False])
-            
-            # Compliance rate dan dampak ekonomi
-            compliance_rate = random.uniform(60, 90)  # 60-90%
-            dampak_ekonomi_pct = kebijakan['tingkat'] * random.uniform(2, 5)  # 2-5% per tingkat keketatan
-            
-            data.append({
-                'id_kebijakan': id_counter,
-                'iso_code': iso_code,
-                'tanggal_mulai': tanggal_mulai,
-                'tanggal_selesai': tanggal_selesai,
-                'jenis_kebijakan': kebijakan['jenis'],
-                'nama_kebijakan': f"{kebijakan['jenis']} {PROVINSI_DATA[iso_code]}",
-                'deskripsi_kebijakan': f"Implementasi {kebijakan['jenis']} di {PROVINSI_DATA[iso_code]} untuk mengendalikan penyebaran COVID-19",
-                'tingkat_keketatan': kebijakan['tingkat'],
-                'sektor_pendidikan': sektor_pendidikan,
-                'sektor_ekonomi': sektor_ekonomi,
-                'sektor_transportasi': sektor_transportasi,
-                'sektor_pariwisata': sektor_pariwisata,
-                'sektor_ibadah': sektor_ibadah,
-                'compliance_rate': round(compliance_rate, 1),
-                'dampak_ekonomi_pct': round(dampak_ekonomi_pct, 1),
-                'status_kebijakan': 'Berakhir' if tanggal_selesai < date.today() else 'Aktif'
-            })
-            
-            id_counter += 1
+            # Pilih random beberapa provinsi
+            provinsi_list = rng.choice(ISO_CODES, rng.integers(5, 16), replace=False)
+        lokasi_per_kebijakan.append(np.concatenate([np.flatnonzero(provinsi == iso) for iso in provinsi_list]))
     
-    return pd.DataFrame(data)
+    # Satu baris per (kebijakan, lokasi)
+    counts = np.array([len(lokasi) for lokasi in lokasi_per_kebijakan])
+    semua_lokasi = np.concatenate(lokasi_per_kebijakan)
+    semua_kebijakan = np.repeat(np.arange(len(kebijakan_timeline)), counts)
+    for start, stop in _chunks(len(semua_lokasi), chunk_rows):
+        lokasi = semua_lokasi[start:stop]
+        iso_code = iso_codes[lokasi]
+        timeline = pd.DataFrame(kebijakan_timeline).loc[semua_kebijakan[start:stop]]
+        jenis = timeline['jenis'].to_numpy()
+        tingkat = timeline['tingkat'].to_numpy()
+        n = stop - start
+        nama_lokasi = nama[lokasi]
+        
+        # Durasi kebijakan (2 minggu - 3 bulan)
+        tanggal_mulai = pd.to_datetime(timeline['tanggal']).to_numpy().astype('datetime64[D]')
+        tanggal_selesai = tanggal_mulai + rng.integers(14, 91, n)
+        
+        # Sektor yang terdampak berdasarkan jenis kebijakan
+        aturan = np.array([
+            'ketat' if 'PPKM Level 4' in j or 'PSBB' in j else
+            'PPKM Level 3' if 'PPKM Level 3' in j else
+            'Work From Home' if 'Work From Home' in j else 'lainnya'
+            for j in jenis
+        ])
+        sektor = {}
+        for pos, nama_sektor in enumerate(['pendidikan', 'ekonomi', 'transportasi', 'pariwisata', 'ibadah']):
+            acak = _coin(rng, n)
+            nilai = acak.copy()
+            for kunci, flags in SEKTOR_KEBIJAKAN.items():
+                if flags[pos] is not None:
+                    nilai[aturan == kunci] = flags[pos]
+            sektor[f'sektor_{nama_sektor}'] = nilai
+        
+        # Compliance rate dan dampak ekonomi (2-5% per tingkat keketatan)
+        compliance_rate = rng.uniform(60, 90, n)
+        dampak_ekonomi_pct = tingkat * rng.uniform(2, 5, n)
+        
+        yield pd.DataFrame({
+            'id_kebijakan': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'tanggal_mulai': tanggal_mulai,
+            'tanggal_selesai': tanggal_selesai,
+            'jenis_kebijakan': jenis,
+            'nama_kebijakan': _text(jenis, ' ', nama_lokasi),
+            'deskripsi_kebijakan': _text('Implementasi ', jenis, ' di ', nama_lokasi,
+                                         ' untuk mengendalikan penyebaran COVID-19'),
+            'tingkat_keketatan': tingkat,
+            **sektor,
+            'compliance_rate': np.round(compliance_rate, 1),
+            'dampak_ekonomi_pct': np.round(dampak_ekonomi_pct, 1),
+            'status_kebijakan': np.where(tanggal_selesai < np.datetime64(date.today()), 'Berakhir', 'Aktif')
+        })
 
-def generate_ekonomi_regional_data():
+def generate_ekonomi_regional_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data ekonomi regional dummy"""
     print("💰 Generating Ekonomi Regional data...")
+    rng = _rng(rng)
     
-    data = []
-    id_counter = 1
-    
-    # Generate data untuk 2020-2022 (bulanan)
-    for tahun in [2020, 2021, 2022]:
-        bulan_range = range(1, 13) if tahun < 2022 else range(1, 10)  # 2022 sampai September
-        
-        for bulan in bulan_range:
-            for iso_code, nama_provinsi in PROVINSI_DATA.items():
-                # PDRB base berdasarkan ukuran provinsi (dalam triliun rupiah)
-                pdrb_base = {
-                    'ID-JK': 2500, 'ID-JB': 1800, 'ID-JI': 1600, 'ID-JT': 1200,
-                    'ID-SU': 700, 'ID-RI': 600, 'ID-SN': 500, 'ID-BA': 300
-                }.get(iso_code, 200)  # default 200 miliar
-                
-                # Dampak COVID-19 pada pertumbuhan ekonomi
-                if tahun == 2020:
-                    if bulan <= 3:  # Sebelum pandemi
-                        pertumbuhan_base = random.uniform(4, 6)
-                    else:  # Selama pandemi
-                        pertumbuhan_base = random.uniform(-8, -2)
-                elif tahun == 2021:
-                    # Pemulihan bertahap
-                    pertumbuhan_base = random.uniform(-2, 4)
-                else:  # 2022
-                    # Pemulihan lebih baik
-                    pertumbuhan_base = random.uniform(2, 6)
-                
-                # PDRB dengan fluktuasi
-                pdrb_milyar = pdrb_base * random.uniform(0.9, 1.1)
-                pertumbuhan_ekonomi = pertumbuhan_base + random.uniform(-1, 1)
-                
-                # Inflasi
-                inflasi_rate = random.uniform(1, 4) if tahun != 2020 else random.uniform(0.5, 3)
-                
-                # Ketenagakerjaan
-                if tahun == 2020 and bulan > 3:
-                    tingkat_pengangguran = random.uniform(6, 12)  # Meningkat saat pandemi
-                else:
-                    tingkat_pengangguran = random.uniform(3, 8)
-                
-                tingkat_partisipasi_kerja = random.uniform(60, 75)
-                
-                # UMR berdasarkan provinsi
-                umr_base = {
-                    'ID-JK': 4500000, 'ID-JB': 1800000, 'ID-JI': 1900000, 'ID-JT': 1700000,
-                    'ID-BA': 2500000, 'ID-SU': 2000000
-                }.get(iso_code, 1500000)
-                
-                upah_minimum_regional = int(umr_base * random.uniform(0.95, 1.05))
-                
-                # Sektor ekonomi (kontribusi PDRB dalam %)
-                if iso_code in ['ID-JK', 'ID-JB', 'ID-JI']:  # Provinsi industri
-                    sektor_pertanian = random.uniform(5, 15)
-                    sektor_industri = random.uniform(30, 45)
-                    sektor_perdagangan = random.uniform(20, 30)
-                    sektor_jasa = random.uniform(15, 25)
-                    sektor_pariwisata = random.uniform(3, 8)
-                else:  # Provinsi agraris
-                    sektor_pertanian = random.uniform(20, 40)
-                    sektor_industri = random.uniform(10, 25)
-                    sektor_perdagangan = random.uniform(15, 25)
-                    sektor_jasa = random.uniform(10, 20)
-                    sektor_pariwisata = random.uniform(5, 15)
-                
-                # Dampak COVID-19
-                if tahun == 2020 and bulan > 3:
-                    penurunan_omzet_umkm = random.uniform(30, 70)
-                    penutupan_usaha = random.randint(100, 1000)
-                    bantuan_sosial_milyar = random.uniform(50, 500)
-                elif tahun == 2021:
-                    penurunan_omzet_umkm = random.uniform(10, 40)
-                    penutupan_usaha = random.randint(50, 300)
-                    bantuan_sosial_milyar = random.uniform(20, 200)
-                else:  # 2022
-                    penurunan_omzet_umkm = random.uniform(0, 20)
-                    penutupan_usaha = random.randint(10, 100)
-                    bantuan_sosial_milyar = random.uniform(10, 100)
-                
-                # Recovery index (0-100)
-                if tahun == 2020:
-                    recovery_index = random.uniform(20, 50)
-                elif tahun == 2021:
-                    recovery_index = random.uniform(40, 70)
-                else:  # 2022
-                    recovery_index = random.uniform(60, 90)
-                
-                business_confidence = recovery_index + random.uniform(-10, 10)
-                business_confidence = max(0, min(100, business_confidence))
-                
-                data.append({
-                    'id_ekonomi': id_counter,
-                    'iso_code': iso_code,
-                    'tahun': tahun,
-                    'bulan': bulan,
-                    'pdrb_milyar': round(pdrb_milyar, 2),
-                    'pertumbuhan_ekonomi': round(pertumbuhan_ekonomi, 2),
-                    'inflasi_rate': round(inflasi_rate, 2),
-                    'tingkat_pengangguran': round(tingkat_pengangguran, 2),
-                    'tingkat_partisipasi_kerja': round(tingkat_partisipasi_kerja, 2),
-                    'upah_minimum_regional': upah_minimum_regional,
-                    'sektor_pertanian': round(sektor_pertanian, 2),
-                    'sektor_industri': round(sektor_industri, 2),
-                    'sektor_perdagangan': round(sektor_perdagangan, 2),
-                    'sektor_jasa': round(sektor_jasa, 2),
-                    'sektor_pariwisata': round(sektor_pariwisata, 2),
-                    'penurunan_omzet_umkm': round(penurunan_omzet_umkm, 2),
-                    'penutupan_usaha': penutupan_usaha,
-                    'bantuan_sosial_milyar': round(bantuan_sosial_milyar, 2),
-                    'recovery_index': round(recovery_index, 2),
-                    'business_confidence': round(business_confidence, 2)
-                })
-                
-                id_counter += 1
-    
-    return pd.DataFrame(data)
+    # Generate data untuk 2020-2022 (bulanan), 2022 sampai September
+    periode = [(tahun, bulan) for tahun in [2020, 2021, 2022]
+               for bulan in (range(1, 13) if tahun < 2022 else range(1, 10))]
+    iso_codes, _, provinsi_lokasi = synthetic_locations(scale)
+    for start, stop in _chunks(len(periode) * len(iso_codes), chunk_rows):
+        bulan_ke, lokasi = _grid_rows(len(iso_codes), start, stop)
+        tahun = np.array([t for t, _ in periode])[bulan_ke]
+        bulan = np.array([b for _, b in periode])[bulan_ke]
+        iso_code = iso_codes[lokasi]
+        provinsi = provinsi_lokasi[lokasi]
+        n = stop - start
+        
+        # PDRB base berdasarkan ukuran provinsi (dalam triliun rupiah), default 200 miliar;
+        # kabupaten mendapat bagian rata dari PDRB provinsinya
+        pdrb_base = _lookup({
+            'ID-JK': 2500, 'ID-JB': 1800, 'ID-JI': 1600, 'ID-JT': 1200,
+            'ID-SU': 700, 'ID-RI': 600, 'ID-SN': 500, 'ID-BA': 300
+        }, provinsi, 200) / scale
+        
+        # Fase: 0 = 2020 sebelum pandemi, 1 = 2020 selama pandemi, 2 = 2021, 3 = 2022
+        pandemi_2020 = (tahun == 2020) & (bulan > 3)
+        fase = np.select([(tahun == 2020) & ~pandemi_2020, pandemi_2020, tahun == 2021], [0, 1, 2], 3)
+        
+        # Dampak COVID-19 pada pertumbuhan ekonomi: pemulihan bertahap 2021, lebih baik 2022
+        pertumbuhan_base = _uniform(rng, [(4, 6), (-8, -2), (-2, 4), (2, 6)], fase)
+        
+        # PDRB dengan fluktuasi
+        pdrb_milyar = pdrb_base * rng.uniform(0.9, 1.1, n)
+        pertumbuhan_ekonomi = pertumbuhan_base + rng.uniform(-1, 1, n)
+        
+        # Inflasi
+        inflasi_rate = np.where(tahun != 2020, rng.uniform(1, 4, n), rng.uniform(0.5, 3, n))
+        
+        # Ketenagakerjaan, pengangguran meningkat saat pandemi
+        tingkat_pengangguran = np.where(pandemi_2020, rng.uniform(6, 12, n), rng.uniform(3, 8, n))
+        tingkat_partisipasi_kerja = rng.uniform(60, 75, n)
+        
+        # UMR berdasarkan provinsi
+        umr_base = _lookup({
+            'ID-JK': 4500000, 'ID-JB': 1800000, 'ID-JI': 1900000, 'ID-JT': 1700000,
+            'ID-BA': 2500000, 'ID-SU': 2000000
+        }, provinsi, 1500000)
+        upah_minimum_regional = _frac(umr_base, rng, 0.95, 1.05)
+        
+        # Sektor ekonomi (kontribusi PDRB dalam %): provinsi industri vs agraris
+        agraris = (~np.isin(provinsi, ['ID-JK', 'ID-JB', 'ID-JI'])).astype(int)
+        sektor_pertanian = _uniform(rng, [(5, 15), (20, 40)], agraris)
+        sektor_industri = _uniform(rng, [(30, 45), (10, 25)], agraris)
+        sektor_perdagangan = _uniform(rng, [(20, 30), (15, 25)], agraris)
+        sektor_jasa = _uniform(rng, [(15, 25), (10, 20)], agraris)
+        sektor_pariwisata = _uniform(rng, [(3, 8), (5, 15)], agraris)
+        
+        # Dampak COVID-19: 0 = 2020 selama pandemi, 1 = 2021, 2 = lainnya
+        dampak = np.select([pandemi_2020, tahun == 2021], [0, 1], 2)
+        penurunan_omzet_umkm = _uniform(rng, [(30, 70), (10, 40), (0, 20)], dampak)
+        penutupan_usaha = _randint(rng, [(100, 1000), (50, 300), (10, 100)], dampak)
+        bantuan_sosial_milyar = _uniform(rng, [(50, 500), (20, 200), (10, 100)], dampak)
+        
+        # Recovery index (0-100)
+        recovery_index = _uniform(rng, [(20, 50), (40, 70), (60, 90)], tahun - 2020)
+        business_confidence = np.clip(recovery_index + rng.uniform(-10, 10, n), 0, 100)
+        
+        yield pd.DataFrame({
+            'id_ekonomi': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'tahun': tahun,
+            'bulan': bulan,
+            'pdrb_milyar': np.round(pdrb_milyar, 2),
+            'pertumbuhan_ekonomi': np.round(pertumbuhan_ekonomi, 2),
+            'inflasi_rate': np.round(inflasi_rate, 2),
+            'tingkat_pengangguran': np.round(tingkat_pengangguran, 2),
+            'tingkat_partisipasi_kerja': np.round(tingkat_partisipasi_kerja, 2),
+            'upah_minimum_regional': upah_minimum_regional,
+            'sektor_pertanian': np.round(sektor_pertanian, 2),
+            'sektor_industri': np.round(sektor_industri, 2),
+            'sektor_perdagangan': np.round(sektor_perdagangan, 2),
+            'sektor_jasa': np.round(sektor_jasa, 2),
+            'sektor_pariwisata': np.round(sektor_pariwisata, 2),
+            'penurunan_omzet_umkm': np.round(penurunan_omzet_umkm, 2),
+            'penutupan_usaha': penutupan_usaha,
+            'bantuan_sosial_milyar': np.round(bantuan_sosial_milyar, 2),
+            'recovery_index': np.round(recovery_index, 2),
+            'business_confidence': np.round(business_confidence, 2)
+        })
 
-def generate_testing_labs_data():
+def generate_testing_labs_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data laboratorium testing dummy"""
     print("🔬 Generating Testing Labs data...")
+    rng = _rng(rng)
     
-    data = []
-    id_counter = 1
-    
-    for iso_code, nama_provinsi in PROVINSI_DATA.items():
-        # Jumlah lab berdasarkan ukuran provinsi
-        if iso_code in ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT']:  # Provinsi besar
-            num_labs = random.randint(8, 15)
-        elif iso_code in ['ID-SU', 'ID-SB', 'ID-SS', 'ID-BA', 'ID-SN']:  # Provinsi sedang
-            num_labs = random.randint(4, 8)
-        else:  # Provinsi kecil
-            num_labs = random.randint(2, 5)
-        
-        for i in range(num_labs):
-            # Jenis lab
-            jenis_lab = np.random.choice(['PCR', 'Antigen', 'Antibodi', 'Kombinasi'], 
-                                       p=[0.3, 0.4, 0.1, 0.2])
-            
-            # Tipe kepemilikan
-            tipe_kepemilikan = np.random.choice(['Pemerintah', 'Swasta', 'Universitas', 'TNI/Polri'], 
-                                              p=[0.4, 0.45, 0.1, 0.05])
-            
-            # Kapasitas berdasarkan jenis lab
-            if jenis_lab == 'PCR':
-                kapasitas_harian_pcr = random.randint(100, 1000)
-                kapasitas_harian_antigen = random.randint(0, 200)
-                kapasitas_harian_antibodi = random.randint(0, 100)
-                mesin_pcr_count = random.randint(2, 10)
-                turnaround_time_pcr = random.randint(6, 24)
-            elif jenis_lab == 'Antigen':
-                kapasitas_harian_pcr = 0
-                kapasitas_harian_antigen = random.randint(200, 2000)
-                kapasitas_harian_antibodi = random.randint(0, 100)
-                mesin_pcr_count = 0
-                turnaround_time_pcr = 24
-            elif jenis_lab == 'Antibodi':
-                kapasitas_harian_pcr = 0
-                kapasitas_harian_antigen = 0
-                kapasitas_harian_antibodi = random.randint(100, 500)
-                mesin_pcr_count = 0
-                turnaround_time_pcr = 24
-            else:  # Kombinasi
-                kapasitas_harian_pcr = random.randint(50, 500)
-                kapasitas_harian_antigen = random.randint(100, 1000)
-                kapasitas_harian_antibodi = random.randint(50, 300)
-                mesin_pcr_count = random.randint(1, 5)
-                turnaround_time_pcr = random.randint(8, 24)
-            
+    # Jumlah lab berdasarkan ukuran provinsi
+    counts = _per_location_counts(rng, scale, (8, 15), (4, 8), (2, 5))
+    for start, stop in _chunks(counts.sum(), chunk_rows):
+        iso_code, nama_lokasi, nomor = _location_rows(counts, scale, start, stop)
+        n = stop - start
+        
+        # Jenis lab (0=PCR, 1=Antigen, 2=Antibodi, 3=Kombinasi)
+        jenis_idx = rng.choice(4, n, p=[0.3, 0.4, 0.1, 0.2])
+        jenis_lab = np.array(['PCR', 'Antigen', 'Antibodi', 'Kombinasi'])[jenis_idx]
+        
+        # Tipe kepemilikan
+        tipe_kepemilikan = rng.choice(['Pemerintah', 'Swasta', 'Universitas', 'TNI/Polri'], n,
+                                      p=[0.4, 0.45, 0.1, 0.05])
+        
+        # Kapasitas berdasarkan jenis lab, (0, 0) = tidak tersedia
+        kapasitas_harian_pcr = _randint(rng, [(100, 1000), (0, 0), (0, 0), (50, 500)], jenis_idx)
+        kapasitas_harian_antigen = _randint(rng, [(0, 200), (200, 2000), (0, 0), (100, 1000)], jenis_idx)
+        kapasitas_harian_antibodi = _randint(rng, [(0, 100), (0, 100), (100, 500), (50, 300)], jenis_idx)
+        mesin_pcr_count = _randint(rng, [(2, 10), (0, 0), (0, 0), (1, 5)], jenis_idx)
+        turnaround_time_pcr = _randint(rng, [(6, 24), (24, 24), (24, 24), (8, 24)], jenis_idx)
+        
+        yield pd.DataFrame({
+            'id_lab': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'nama_lab': _text('Lab ', jenis_lab, ' ', nama_lokasi, ' ', nomor),
+            'jenis_lab': jenis_lab,
+            'tipe_kepemilikan': tipe_kepemilikan,
+            'kapasitas_harian_pcr': kapasitas_harian_pcr,
+            'kapasitas_harian_antigen': kapasitas_harian_antigen,
+            'kapasitas_harian_antibodi': kapasitas_harian_antibodi,
+            'mesin_pcr_count': mesin_pcr_count,
             # Stok dan tenaga ahli
-            extraction_kit_stock = random.randint(100, 5000)
-            reagent_stock = random.randint(500, 10000)
-            analis_count = random.randint(3, 20)
-            teknisi_count = random.randint(2, 15)
-            
+            'extraction_kit_stock': rng.integers(100, 5001, n),
+            'reagent_stock': rng.integers(500, 10001, n),
+            'analis_count': rng.integers(3, 21, n),
+            'teknisi_count': rng.integers(2, 16, n),
             # Waktu pemrosesan
-            turnaround_time_antigen = random.randint(1, 4)
-            
+            'turnaround_time_pcr': turnaround_time_pcr,
+            'turnaround_time_antigen': rng.integers(1, 5, n),
             # Akreditasi
-            akreditasi_kemenkes = random.choice([True, False])
-            iso_certified = random.choice([True, False]) if tipe_kepemilikan == 'Swasta' else random.choice([True, False, False])
-            
+            'akreditasi_kemenkes': _coin(rng, n),
+            'iso_certified': _coin(rng, n, np.where(tipe_kepemilikan == 'Swasta', 1 / 2, 1 / 3)),
             # Koordinat dummy
-            latitude = random.uniform(-11, 6)
-            longitude = random.uniform(95, 141)
-            
+            'latitude': np.round(rng.uniform(-11, 6, n), 6),
+            'longitude': np.round(rng.uniform(95, 141, n), 6),
+            'alamat': _text('Jl. Laboratorium No. ', rng.integers(1, 101, n), ', ', nama_lokasi),
             # Fasilitas
-            operational_24_hours = random.choice([True, False]) if tipe_kepemilikan in ['Pemerintah', 'Swasta'] else False
-            drive_thru_available = random.choice([True, False])
-            
-            data.append({
-                'id_lab': id_counter,
-                'iso_code': iso_code,
-                'nama_lab': f'Lab {jenis_lab} {nama_provinsi} {i+1}',
-                'jenis_lab': jenis_lab,
-                'tipe_kepemilikan': tipe_kepemilikan,
-                'kapasitas_harian_pcr': kapasitas_harian_pcr,
-                'kapasitas_harian_antigen': kapasitas_harian_antigen,
-                'kapasitas_harian_antibodi': kapasitas_harian_antibodi,
-                'mesin_pcr_count': mesin_pcr_count,
-                'extraction_kit_stock': extraction_kit_stock,
-                'reagent_stock': reagent_stock,
-                'analis_count': analis_count,
-                'teknisi_count': teknisi_count,
-                'turnaround_time_pcr': turnaround_time_pcr,
-                'turnaround_time_antigen': turnaround_time_antigen,
-                'akreditasi_kemenkes': akreditasi_kemenkes,
-                'iso_certified': iso_certified,
-                'latitude': round(latitude, 6),
-                'longitude': round(longitude, 6),
-                'alamat': f'Jl. Laboratorium No. {random.randint(1, 100)}, {nama_provinsi}',
-                'operational_24_hours': operational_24_hours,
-                'drive_thru_available': drive_thru_available
-            })
-            
-            id_counter += 1
-    
-    return pd.DataFrame(data)
+            'operational_24_hours': np.isin(tipe_kepemilikan, ['Pemerintah', 'Swasta']) & _coin(rng, n),
+            'drive_thru_available': _coin(rng, n)
+        })
 
-def generate_cluster_penularan_data():
+def generate_cluster_penularan_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data cluster penularan dummy"""
     print("🦠 Generating Cluster Penularan data...")
-    
-    data = []
-    id_counter = 1
+    rng = _rng(rng)
     
     # Generate cluster untuk periode Maret 2020 - September 2022
     start_date = date(2020, 3, 1)
     end_date = date(2022, 9, 15)
     
-    # Jenis cluster dan probabilitas berdasarkan periode
-    jenis_cluster_list = [
-        'Perkantoran', 'Pabrik', 'Sekolah', 'Universitas', 'Pasar',
-        'Mall', 'Rumah Sakit', 'Panti Jompo', 'Asrama', 'Pernikahan',
-        'Keagamaan', 'Olahraga', 'Transportasi', 'Keluarga', 'Lainnya'
-    ]
-    
-    for iso_code, nama_provinsi in PROVINSI_DATA.items():
-        # Jumlah cluster berdasarkan ukuran provinsi dan periode
-        if iso_code in ['ID-JK', 'ID-JB', 'ID-JI', 'ID-JT']:  # Provinsi besar
-            num_clusters = random.randint(50, 100)
-        elif iso_code in ['ID-SU', 'ID-SB', 'ID-SS', 'ID-BA', 'ID-SN']:  # Provinsi sedang
-            num_clusters = random.randint(20, 50)
-        else:  # Provinsi kecil
-            num_clusters = random.randint(5, 20)
-        
-        for i in range(num_clusters):
-            # Tanggal terdeteksi (random dalam periode)
-            days_diff = (end_date - start_date).days
-            random_days = random.randint(0, days_diff)
-            tanggal_terdeteksi = start_date + timedelta(days=random_days)
-            
-            # Jenis cluster berdasarkan periode
-            if tanggal_terdeteksi < date(2020, 6, 1):  # Awal pandemi
-                jenis_cluster = np.random.choice(['Perkantoran', 'Pasar', 'Rumah Sakit', 'Keluarga', 'Lainnya'])
-            elif tanggal_terdeteksi < date(2021, 1, 1):  # Pertengahan 2020
-                jenis_cluster = np.random.choice(['Pabrik', 'Perkantoran', 'Keluarga', 'Pernikahan', 'Keagamaan'])
-            elif tanggal_terdeteksi < date(2021, 8, 1):  # Awal 2021
-                jenis_cluster = np.random.choice(['Perkantoran', 'Pabrik', 'Keluarga', 'Mall', 'Transportasi'])
-            else:  # Akhir periode
-                jenis_cluster = np.random.choice(['Sekolah', 'Universitas', 'Perkantoran', 'Keluarga', 'Olahraga'])
-            
-            # Durasi cluster (1-8 minggu)
-            durasi_hari = random.randint(7, 56)
-            tanggal_selesai = tanggal_terdeteksi + timedelta(days=durasi_hari)
-            
-            # Ukuran cluster berdasarkan jenis
-            if jenis_cluster in ['Pabrik', 'Perkantoran', 'Sekolah', 'Universitas']:
-                total_kasus_terkait = random.randint(10, 100)
-            elif jenis_cluster in ['Pernikahan', 'Keagamaan', 'Olahraga']:
-                total_kasus_terkait = random.randint(20, 200)
-            elif jenis_cluster in ['Rumah Sakit', 'Panti Jompo']:
-                total_kasus_terkait = random.randint(5, 50)
-            else:  # Keluarga, dll
-                total_kasus_terkait = random.randint(3, 30)
-            
-            total_kontak_erat = int(total_kasus_terkait * random.uniform(2, 5))
-            total_suspect = int(total_kontak_erat * random.uniform(0.1, 0.3))
-            
-            # Demografi terdampak
-            if jenis_cluster in ['Sekolah', 'Universitas']:
-                kasus_anak = int(total_kasus_terkait * random.uniform(0.3, 0.7))
-                kasus_dewasa = int(total_kasus_terkait * random.uniform(0.2, 0.5))
-                kasus_lansia = int(total_kasus_terkait * random.uniform(0.0, 0.1))
-            elif jenis_cluster == 'Panti Jompo':
-                kasus_anak = 0
-                kasus_dewasa = int(total_kasus_terkait * random.uniform(0.2, 0.4))
-                kasus_lansia = int(total_kasus_terkait * random.uniform(0.6, 0.8))
-            else:  # Umum
-                kasus_anak = int(total_kasus_terkait * random.uniform(0.1, 0.3))
-                kasus_dewasa = int(total_kasus_terkait * random.uniform(0.5, 0.7))
-                kasus_lansia = int(total_kasus_terkait * random.uniform(0.1, 0.2))
-            
-            # Gender
-            kasus_laki = int(total_kasus_terkait * random.uniform(0.4, 0.6))
-            kasus_perempuan = total_kasus_terkait - kasus_laki
-            
+    # Jumlah cluster berdasarkan ukuran provinsi
+    counts = _per_location_counts(rng, scale, (50, 100), (20, 50), (5, 20))
+    for start, stop in _chunks(counts.sum(), chunk_rows):
+        iso_code, nama_lokasi, nomor = _location_rows(counts, scale, start, stop)
+        n = stop - start
+        
+        # Tanggal terdeteksi (random dalam periode)
+        days_diff = (end_date - start_date).days
+        tanggal_terdeteksi = np.datetime64(start_date) + rng.integers(0, days_diff + 1, n)
+        
+        # Jenis cluster berdasarkan periode: awal pandemi, pertengahan 2020, awal 2021, akhir periode
+        jenis_per_periode = np.array([
+            ['Perkantoran', 'Pasar', 'Rumah Sakit', 'Keluarga', 'Lainnya'],
+            ['Pabrik', 'Perkantoran', 'Keluarga', 'Pernikahan', 'Keagamaan'],
+            ['Perkantoran', 'Pabrik', 'Keluarga', 'Mall', 'Transportasi'],
+            ['Sekolah', 'Universitas', 'Perkantoran', 'Keluarga', 'Olahraga']
+        ])
+        periode = _period(tanggal_terdeteksi, np.array(['2020-06-01', '2021-01-01', '2021-08-01'],
+                                                       dtype='datetime64[D]'))
+        jenis_cluster = jenis_per_periode[periode, rng.integers(0, 5, n)]
+        
+        # Durasi cluster (1-8 minggu)
+        tanggal_selesai = tanggal_terdeteksi + rng.integers(7, 57, n)
+        
+        # Ukuran cluster berdasarkan jenis
+        ukuran = np.select([
+            np.isin(jenis_cluster, ['Pabrik', 'Perkantoran', 'Sekolah', 'Universitas']),
+            np.isin(jenis_cluster, ['Pernikahan', 'Keagamaan', 'Olahraga']),
+            np.isin(jenis_cluster, ['Rumah Sakit', 'Panti Jompo'])
+        ], [0, 1, 2], 3)  # 3 = Keluarga, dll
+        total_kasus_terkait = _randint(rng, [(10, 100), (20, 200), (5, 50), (3, 30)], ukuran)
+        
+        total_kontak_erat = _frac(total_kasus_terkait, rng, 2, 5)
+        total_suspect = _frac(total_kontak_erat, rng, 0.1, 0.3)
+        
+        # Demografi terdampak: 0 = sekolah/universitas, 1 = panti jompo, 2 = umum
+        demografi = np.select([np.isin(jenis_cluster, ['Sekolah', 'Universitas']), jenis_cluster == 'Panti Jompo'],
+                              [0, 1], 2)
+        kasus_anak = (total_kasus_terkait * _uniform(rng, [(0.3, 0.7), (0, 0), (0.1, 0.3)], demografi)).astype(np.int64)
+        kasus_dewasa = (total_kasus_terkait * _uniform(rng, [(0.2, 0.5), (0.2, 0.4), (0.5, 0.7)], demografi)).astype(np.int64)
+        kasus_lansia = (total_kasus_terkait * _uniform(rng, [(0.0, 0.1), (0.6, 0.8), (0.1, 0.2)], demografi)).astype(np.int64)
+        
+        # Gender
+        kasus_laki = _frac(total_kasus_terkait, rng, 0.4, 0.6)
+        
+        # Status cluster
+        selesai = tanggal_selesai < np.datetime64(date.today())
+        status_cluster = np.where(selesai, rng.choice(['Terkendali', 'Selesai'], n, p=[0.3, 0.7]), 'Aktif')
+        
+        yield pd.DataFrame({
+            'id_cluster': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'tanggal_terdeteksi': tanggal_terdeteksi,
+            'tanggal_selesai': np.where(status_cluster != 'Aktif', tanggal_selesai, np.datetime64('NaT')),
+            'nama_cluster': _text('Cluster ', jenis_cluster, ' ', nama_lokasi, ' ', nomor),
+            'jenis_cluster': jenis_cluster,
+            'nama_lokasi': _text('Lokasi ', jenis_cluster, ' ', nama_lokasi),
+            'alamat_lokasi': _text('Jl. ', jenis_cluster, ' No. ', rng.integers(1, 101, n), ', ', nama_lokasi),
+            # Koordinat dummy
+            'latitude': np.round(rng.uniform(-11, 6, n), 6),
+            'longitude': np.round(rng.uniform(95, 141, n), 6),
+            'kasus_index': 1,
+            'total_kasus_terkait': total_kasus_terkait,
+            'total_kontak_erat': total_kontak_erat,
+            'total_suspect': total_suspect,
+            'kasus_anak': kasus_anak,
+            'kasus_dewasa': kasus_dewasa,
+            'kasus_lansia': kasus_lansia,
+            'kasus_laki': kasus_laki,
+            'kasus_perempuan': total_kasus_terkait - kasus_laki,
             # Tingkat keparahan
-            kasus_tanpa_gejala = int(total_kasus_terkait * random.uniform(0.2, 0.4))
-            kasus_ringan = int(total_kasus_terkait * random.uniform(0.4, 0.6))
-            kasus_sedang = int(total_kasus_terkait * random.uniform(0.1, 0.2))
-            kasus_berat = int(total_kasus_terkait * random.uniform(0.02, 0.08))
-            kasus_kritis = int(total_kasus_terkait * random.uniform(0.01, 0.03))
-            kasus_meninggal = int(total_kasus_terkait * random.uniform(0.005, 0.02))
-            
+            'kasus_tanpa_gejala': _frac(total_kasus_terkait, rng, 0.2, 0.4),
+            'kasus_ringan': _frac(total_kasus_terkait, rng, 0.4, 0.6),
+            'kasus_sedang': _frac(total_kasus_terkait, rng, 0.1, 0.2),
+            'kasus_berat': _frac(total_kasus_terkait, rng, 0.02, 0.08),
+            'kasus_kritis': _frac(total_kasus_terkait, rng, 0.01, 0.03),
+            'kasus_meninggal': _frac(total_kasus_terkait, rng, 0.005, 0.02),
             # Tindakan pengendalian
-            contact_tracing_completed = random.choice([True, False])
-            area_disinfection = random.choice([True, True, False])  # Lebih sering True
-            temporary_closure = random.choice([True, False]) if jenis_cluster in ['Perkantoran', 'Sekolah', 'Mall'] else False
-            mass_testing = random.choice([True, False])
-            
-            # Status cluster
-            if tanggal_selesai < date.today():
-                status_cluster = np.random.choice(['Terkendali', 'Selesai'], p=[0.3, 0.7])
-            else:
-                status_cluster = 'Aktif'
-            
-            # Koordinat dummy
-            latitude = random.uniform(-11, 6)
-            longitude = random.uniform(95, 141)
-            
-            data.append({
-                'id_cluster': id_counter,
-                'iso_code': iso_code,
-                'tanggal_terdeteksi': tanggal_terdeteksi,
-                'tanggal_selesai': tanggal_selesai if status_cluster != 'Aktif' else None,
-                'nama_cluster': f'Cluster {jenis_cluster} {nama_provinsi} {i+1}',
-                'jenis_cluster': jenis_cluster,
-                'nama_lokasi': f'Lokasi {jenis_cluster} {nama_provinsi}',
-                'alamat_lokasi': f'Jl. {jenis_cluster} No. {random.randint(1, 100)}, {nama_provinsi}',
-                'latitude': round(latitude, 6),
-                'longitude': round(longitude, 6),
-                'kasus_index': 1,
-                'total_kasus_terkait': total_kasus_terkait,
-                'total_kontak_erat': total_kontak_erat,
-                'total_suspect': total_suspect,
-                'kasus_anak': kasus_anak,
-                'kasus_dewasa': kasus_dewasa,
-                'kasus_lansia': kasus_lansia,
-                'kasus_laki': kasus_laki,
-                'kasus_perempuan': kasus_perempuan,
-                'kasus_tanpa_gejala': kasus_tanpa_gejala,
-                'kasus_ringan': kasus_ringan,
-                'kasus_sedang': kasus_sedang,
-                'kasus_berat': kasus_berat,
-                'kasus_kritis': kasus_kritis,
-                'kasus_meninggal': kasus_meninggal,
-                'contact_tracing_completed': contact_tracing_completed,
-                'area_disinfection': area_disinfection,
-                'temporary_closure': temporary_closure,
-                'mass_testing': mass_testing,
-                'status_cluster': status_cluster,
-                'catatan': f'Cluster {jenis_cluster} terdeteksi di {nama_provinsi} dengan {total_kasus_terkait} kasus terkait'
-            })
-            
-            id_counter += 1
-    
-    return pd.DataFrame(data)
+            'contact_tracing_completed': _coin(rng, n),
+            'area_disinfection': _coin(rng, n, 2 / 3),  # Lebih sering True
+            'temporary_closure': np.isin(jenis_cluster, ['Perkantoran', 'Sekolah', 'Mall']) & _coin(rng, n),
+            'mass_testing': _coin(rng, n),
+            'status_cluster': status_cluster,
+            'catatan': _text('Cluster ', jenis_cluster, ' terdeteksi di ', nama_lokasi, ' dengan ',
+                             total_kasus_terkait, ' kasus terkait')
+        })
 
-def generate_mobilitas_harian_data():
+def generate_mobilitas_harian_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
     """Generate data mobilitas harian dummy"""
     print("🚶 Generating Mobilitas Harian data...")
+    rng = _rng(rng)
+    
+    # Generate data untuk periode Maret 2020 - September 2022 (mingguan untuk mengurangi volume,
+    # harian jika diskalakan)
+    iso_codes, _, _ = synthetic_locations(scale)
+    dates = _dates(date(2020, 3, 1), date(2022, 9, 15), scale)
+    for start, stop in _chunks(len(dates) * len(iso_codes), chunk_rows):
+        hari, lokasi = _grid_rows(len(iso_codes), start, stop)
+        tanggal = dates[hari]
+        iso_code = iso_codes[lokasi]
+        n = stop - start
+        
+        # Baseline mobilitas (0% = normal, negatif = berkurang, positif = meningkat)
+        # Faktor periode (dampak kebijakan): lockdown awal, PSBB, PPKM awal, PPKM ketat, pemulihan
+        periode = _period(tanggal, np.array(['2020-06-01', '2020-12-01', '2021-06-01', '2021-12-01'],
+                                            dtype='datetime64[D]'))
+        mobility_factor = _uniform(rng, [(-80, -40), (-60, -20), (-40, -10), (-50, -15), (-20, 10)], periode)
+        
+        # Mobilitas berdasarkan lokasi
+        retail_recreation = mobility_factor + rng.uniform(-20, 20, n)
+        grocery_pharmacy = mobility_factor * 0.5 + rng.uniform(-10, 10, n)  # Lebih stabil
+        parks = mobility_factor + rng.uniform(-30, 30, n)
+        transit_stations = mobility_factor * 1.2 + rng.uniform(-15, 15, n)
+        workplaces = mobility_factor * 0.8 + rng.uniform(-15, 15, n)
+        residential = -mobility_factor * 0.3 + rng.uniform(-5, 5, n)  # Berlawanan dengan mobilitas luar
+        
+        # Mobilitas berdasarkan transportasi
+        private_vehicle_movement = mobility_factor * 0.7 + rng.uniform(-10, 10, n)
+        public_transport_usage = mobility_factor * 1.5 + rng.uniform(-20, 20, n)  # Lebih terpengaruh
+        walking_cycling = mobility_factor * 0.5 + rng.uniform(-15, 15, n)
+        
+        # Mobilitas berdasarkan waktu
+        morning_rush_hour = mobility_factor * 0.9 + rng.uniform(-10, 10, n)
+        afternoon_activity = mobility_factor * 0.8 + rng.uniform(-15, 15, n)
+        evening_rush_hour = mobility_factor * 0.9 + rng.uniform(-10, 10, n)
+        night_activity = mobility_factor * 1.2 + rng.uniform(-20, 20, n)
+        
+        # Indeks mobilitas gabungan
+        overall_mobility_index = (retail_recreation + transit_stations + workplaces) / 3
+        
+        yield pd.DataFrame({
+            'id_mobilitas': np.arange(start + 1, stop + 1),
+            'iso_code': iso_code,
+            'tanggal': tanggal,
+            'retail_recreation': np.round(retail_recreation, 1),
+            'grocery_pharmacy': np.round(grocery_pharmacy, 1),
+            'parks': np.round(parks, 1),
+            'transit_stations': np.round(transit_stations, 1),
+            'workplaces': np.round(workplaces, 1),
+            'residential': np.round(residential, 1),
+            'private_vehicle_movement': np.round(private_vehicle_movement, 1),
+            'public_transport_usage': np.round(public_transport_usage, 1),
+            'walking_cycling': np.round(walking_cycling, 1),
+            'morning_rush_hour': np.round(morning_rush_hour, 1),
+            'afternoon_activity': np.round(afternoon_activity, 1),
+            'evening_rush_hour': np.round(evening_rush_hour, 1),
+            'night_activity': np.round(night_activity, 1),
+            'overall_mobility_index': np.round(overall_mobility_index, 1)
+        })
+
+# Pulau, zona waktu dan status khusus per provinsi (LOKASI sintetis)
+PULAU_PROVINSI = {
+    'Sumatera': ['ID-AC', 'ID-SU', 'ID-SB', 'ID-RI', 'ID-JA', 'ID-SS', 'ID-BE', 'ID-LA', 'ID-BB', 'ID-KR'],
+    'Jawa': ['ID-JK', 'ID-JB', 'ID-JT', 'ID-YO', 'ID-JI', 'ID-BT'],
+    'Bali & Nusa Tenggara': ['ID-BA', 'ID-NB', 'ID-NT'],
+    'Kalimantan': ['ID-KB', 'ID-KT', 'ID-KS', 'ID-KI', 'ID-KU'],
+    'Sulawesi': ['ID-SA', 'ID-ST', 'ID-SN', 'ID-SG', 'ID-GO', 'ID-SR'],
+    'Maluku': ['ID-MA', 'ID-MU'],
+    'Papua': ['ID-PA', 'ID-PB']
+}
+PULAU = {iso: pulau for pulau, codes in PULAU_PROVINSI.items() for iso in codes}
+
+# Kotak koordinat kasar per pulau: (lat min, lat max, lon min, lon max)
+KOORDINAT_PULAU = {
+    'Sumatera': (-6, 6, 95, 108), 'Jawa': (-8.5, -6, 105, 114.5),
+    'Bali & Nusa Tenggara': (-10.5, -8, 114.5, 125), 'Kalimantan': (-4, 4.5, 108.5, 119),
+    'Sulawesi': (-6, 2, 118.5, 125.5), 'Maluku': (-8, 3, 124, 135), 'Papua': (-9, -0.5, 130.5, 141)
+}
+
+# Provinsi di luar WIB
+ZONA_WAKTU = {
+    'ID-BA': 'WITA', 'ID-NB': 'WITA', 'ID-NT': 'WITA', 'ID-KS': 'WITA', 'ID-KI': 'WITA',
+    'ID-KU': 'WITA', 'ID-SA': 'WITA', 'ID-ST': 'WITA', 'ID-SN': 'WITA', 'ID-SG': 'WITA',
+    'ID-GO': 'WITA', 'ID-SR': 'WITA', 'ID-MA': 'WIT', 'ID-MU': 'WIT', 'ID-PA': 'WIT', 'ID-PB': 'WIT'
+}
+
+STATUS_KHUSUS = {
+    'ID-AC': 'Otonomi Khusus', 'ID-JK': 'Daerah Khusus Ibukota', 'ID-YO': 'Daerah Istimewa',
+    'ID-PA': 'Otonomi Khusus', 'ID-PB': 'Otonomi Khusus'
+}
+
+def generate_lokasi_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
+    """Generate data LOKASI sintetis (34 provinsi, atau kabupaten jika diskalakan)"""
+    print("📍 Generating Lokasi data...")
+    rng = _rng(rng)
     
-    data = []
-    id_counter = 1
+    iso_codes, nama, provinsi_lokasi = synthetic_locations(scale)
+    populasi_lokasi = location_population(scale)
+    for start, stop in _chunks(len(iso_codes), chunk_rows):
+        n = stop - start
+        provinsi = provinsi_lokasi[start:stop]
+        populasi = populasi_lokasi[start:stop]
+        pulau = _lookup(PULAU, provinsi, None)
+        kotak = np.array([KOORDINAT_PULAU[p] for p in pulau])
+        
+        # Luas wilayah (km2), dibagi rata ke kabupaten; DKI Jakarta jauh lebih kecil
+        luas_wilayah = np.where(provinsi == 'ID-JK', rng.uniform(600, 700, n), rng.uniform(3000, 150000, n)) / scale
+        
+        # Pembagian administratif: provinsi, atau satu kabupaten per baris jika diskalakan
+        if scale == 1:
+            total_regencies = rng.integers(5, 30, n)
+            total_cities = rng.integers(1, 10, n)
+            total_districts = rng.integers(50, 500, n)
+        else:
+            total_regencies = np.ones(n, dtype=np.int64)
+            total_cities = np.zeros(n, dtype=np.int64)
+            total_districts = rng.integers(5, 30, n)
+        
+        yield pd.DataFrame({
+            'iso_code': iso_codes[start:stop],
+            'nama_provinsi': nama[start:stop],
+            'populasi': populasi,
+            'luas_wilayah': np.round(luas_wilayah, 2),
+            'latitude': np.round(rng.uniform(kotak[:, 0], kotak[:, 1]), 6),
+            'longitude': np.round(rng.uniform(kotak[:, 2], kotak[:, 3]), 6),
+            'island': pulau,
+            'population_density': np.round(populasi / luas_wilayah, 2),
+            'area_km2': np.round(luas_wilayah, 2),
+            'total_regencies': total_regencies,
+            'total_cities': total_cities,
+            'total_districts': total_districts,
+            'total_urban_villages': (total_districts * rng.uniform(2, 4, n)).astype(np.int64),
+            'total_rural_villages': (total_districts * rng.uniform(4, 8, n)).astype(np.int64),
+            'time_zone': _lookup(ZONA_WAKTU, provinsi, 'WIB'),
+            'special_status': _lookup(STATUS_KHUSUS, provinsi, None)
+        })
+
+# Periode STATISTIK_HARIAN (selalu harian)
+STATISTIK_START = date(2020, 3, 1)
+STATISTIK_END = date(2022, 9, 15)
+
+# Gelombang COVID-19 nasional: (puncak, lebar dalam hari, kasus baru per juta per hari di puncak)
+GELOMBANG_COVID = [
+    ('2020-09-15', 90, 12),
+    ('2021-01-28', 40, 45),
+    ('2021-07-15', 22, 190),   # Delta
+    ('2022-02-16', 18, 200),   # Omicron
+    ('2022-07-25', 25, 20)
+]
+
+VAKSINASI_MULAI = np.datetime64('2021-01-13')
+
+# Stringency (min, max) per periode kebijakan: PSBB awal, transisi, PPKM, PPKM darurat, pelonggaran, endemi
+STRINGENCY_BATAS = np.array(['2020-06-01', '2021-01-11', '2021-07-03', '2021-10-01', '2022-03-01'],
+                            dtype='datetime64[D]')
+STRINGENCY_PERIODE = [(70, 85), (50, 65), (55, 70), (80, 95), (45, 60), (25, 40)]
+
+def _epidemic_curve(dates):
+    """Kasus baru per juta per hari untuk tiap tanggal: baseline + gelombang Gaussian"""
+    hari = dates.astype(np.int64)
+    kurva = np.full(len(dates), 1.5)
+    for puncak, lebar, tinggi in GELOMBANG_COVID:
+        kurva += tinggi * np.exp(-0.5 * ((hari - np.datetime64(puncak, 'D').astype(np.int64)) / lebar) ** 2)
+    return kurva
+
+def _ratio(numerator, denominator, scale=1.0, empty=0.0):
+    """numerator / denominator * scale, `empty` where the denominator is 0"""
+    return np.divide(numerator * scale, denominator, out=np.full(len(numerator), empty, dtype=float),
+                     where=denominator > 0)
+
+def generate_statistik_harian_data(rng=None, scale=1, chunk_rows=CHUNK_ROWS):
+    """Generate data STATISTIK_HARIAN sintetis dengan total kumulatif yang konsisten
+
+    Satu baris per lokasi per hari. Kasus baru mengikuti kurva gelombang
+    nasional; total_* adalah jumlah kumulatif kasus/kematian/kesembuhan baru
+    dan total_aktif = total_kasus - total_kematian - total_sembuh. Tiap hari
+    ditarik sekaligus untuk semua lokasi; chunk berisi hari utuh (sekitar
+    chunk_rows baris) dan total kumulatif dibawa antar chunk.
+    """
+    print("📈 Generating Statistik Harian data...")
+    rng = _rng(rng)
     
-    # Generate data untuk periode Maret 2020 - September 2022 (mingguan untuk mengurangi volume)
-    start_date = date(2020, 3, 1)
-    end_date = date(2022, 9, 15)
-    current_date = start_date
+    iso_codes, _, provinsi = synthetic_locations(scale)
+    L = len(iso_codes)
+    populasi = location_population(scale)
+    dates = np.arange(np.datetime64(STATISTIK_START), np.datetime64(STATISTIK_END) + 1)
+    kurva = _epidemic_curve(dates)
+    intensitas = kurva / kurva.max()
+    stringency_periode = _period(dates, STRINGENCY_BATAS)
     
-    while current_date <= end_date:
-        for iso_code, nama_provinsi in PROVINSI_DATA.items():
-            # Baseline mobilitas (0% = normal, negatif = berkurang, positif = meningkat)
-            
-            # Faktor periode (dampak kebijakan)
-            if current_date < date(2020, 6, 1):  # Lockdown awal
-                mobility_factor = random.uniform(-80, -40)
-            elif current_date < date(2020, 12, 1):  # PSBB
-                mobility_factor = random.uniform(-60, -20)
-            elif current_date < date(2021, 6, 1):  # PPKM awal
-                mobility_factor = random.uniform(-40, -10)
-            elif current_date < date(2021, 12, 1):  # PPKM ketat
-                mobility_factor = random.uniform(-50, -15)
-            else:  # Pemulihan
-                mobility_factor = random.uniform(-20, 10)
-            
-            # Mobilitas berdasarkan lokasi
-            retail_recreation = mobility_factor + random.uniform(-20, 20)
-            grocery_pharmacy = mobility_factor * 0.5 + random.uniform(-10, 10)  # Lebih stabil
-            parks = mobility_factor + random.uniform(-30, 30)
-            transit_stations = mobility_factor * 1.2 + random.uniform(-15, 15)
-            workplaces = mobility_factor * 0.8 + random.uniform(-15, 15)
-            residential = -mobility_factor * 0.3 + random.uniform(-5, 5)  # Berlawanan dengan mobilitas luar
+    # Karakteristik tetap per lokasi
+    faktor_lokasi = rng.lognormal(0, 0.35, L) * np.where(np.isin(provinsi, PROVINSI_BESAR), 1.4, 1.0)
+    median_age = rng.uniform(25, 35, L)
+    elderly_population_pct = rng.uniform(5, 13, L)
+    urban_population_pct = np.where(provinsi == 'ID-JK', 100.0, rng.uniform(20, 80, L))
+    age_group_risk = np.select([median_age > 32, median_age > 29, median_age > 27],
+                               ['Very High', 'High', 'Medium'], 'Low')
+    comorbidity_rate = rng.uniform(10, 30, L)
+    aqi_dasar = rng.uniform(30, 120, L)
+    unemployment_dasar = rng.uniform(3, 8, L)
+    poverty_rate = rng.uniform(4, 25, L)
+    education_index = rng.uniform(0.6, 0.85, L)
+    internet_dasar = rng.uniform(40, 80, L)
+    hospital_beds_per_1000 = rng.uniform(0.8, 3, L)
+    doctors_per_1000 = rng.uniform(0.2, 1.5, L)
+    nurses_per_1000 = rng.uniform(1, 4, L)
+    ventilators_available = (populasi / 100000 * rng.uniform(1, 5, L)).astype(np.int64)
+    transport_dasar = np.where(np.isin(provinsi, PROVINSI_BESAR), rng.uniform(30, 60, L), rng.uniform(5, 30, L))
+    private_vehicle_density = rng.uniform(100, 500, L)
+    flight_dasar = rng.uniform(5, 200, L)
+    
+    # Total kumulatif per lokasi, dibawa dari hari ke hari
+    total_kasus = np.zeros(L, dtype=np.int64)
+    total_kematian = np.zeros(L, dtype=np.int64)
+    total_sembuh = np.zeros(L, dtype=np.int64)
+    vaccinations_total = np.zeros(L, dtype=np.int64)
+    kasus_kemarin = np.zeros(L, dtype=np.int64)
+    kematian_kemarin = np.zeros(L, dtype=np.int64)
+    
+    hari_per_chunk = max(1, chunk_rows // L)
+    next_id = 1
+    for awal in range(0, len(dates), hari_per_chunk):
+        kolom = {}
+        for h in range(awal, min(awal + hari_per_chunk, len(dates))):
+            tanggal = dates[h]
             
-            # Mobilitas berdasarkan transportasi
-            private_vehicle_movement = mobility_factor * 0.7 + random.uniform(-10, 10)
-            public_transport_usage = mobility_factor * 1.5 + random.uniform(-20, 20)  # Lebih terpengaruh
-            walking_cycling = mobility_factor * 0.5 + random.uniform(-15, 15)
+            # Kasus, kematian dan kesembuhan baru; kematian diambil dari kasus baru,
+            # kesembuhan dari kasus aktif kemarin, sehingga total_aktif tidak pernah negatif
+            kasus_baru = rng.poisson(populasi * kurva[h] * faktor_lokasi / 1e6 * rng.lognormal(0, 0.3, L))
+            cfr_harian = np.interp(h, [0, len(dates) - 1], [0.045, 0.012])
+            kematian_baru = rng.binomial(kasus_baru, cfr_harian)
+            sembuh_baru = rng.binomial(total_kasus - total_kematian - total_sembuh, 1 / 14)
+            total_kasus += kasus_baru
+            total_kematian += kematian_baru
+            total_sembuh += sembuh_baru
+            total_aktif = total_kasus - total_kematian - total_sembuh
             
-            # Mobilitas berdasarkan waktu
-            morning_rush_hour = mobility_factor * 0.9 + random.uniform(-10, 10)
-            afternoon_activity = mobility_factor * 0.8 + random.uniform(-15, 15)
-            evening_rush_hour = mobility_factor * 0.9 + random.uniform(-10, 10)
-            night_activity = mobility_factor * 1.2 + random.uniform(-20, 20)
+            # Testing dan rumah sakit mengikuti intensitas gelombang
+            positivity_rate = np.clip(3 + 30 * intensitas[h] + rng.normal(0, 2, L), 0.5, 50)
+            hospital_capacity = np.clip(15 + 75 * intensitas[h] + rng.normal(0, 5, L), 0, 100)
             
-            # Indeks mobilitas gabungan
-            overall_mobility_index = (retail_recreation + transit_stations + workplaces) / 3
+            # Vaksinasi sejak 13 Januari 2021, maksimal ~2.2 dosis per penduduk
+            if tanggal >= VAKSINASI_MULAI:
+                hari_vaksin = (tanggal - VAKSINASI_MULAI).astype(np.int64)
+                laju = np.interp(hari_vaksin, [0, 150, 400, 610], [0.0005, 0.004, 0.003, 0.001])
+                vaccinations_new = np.minimum((populasi * laju * rng.lognormal(0, 0.2, L)).astype(np.int64),
+                                              (populasi * 2.2).astype(np.int64) - vaccinations_total)
+            else:
+                vaccinations_new = np.zeros(L, dtype=np.int64)
+            vaccinations_total += vaccinations_new
+            fully_vaccinated = (vaccinations_total * 0.45).astype(np.int64)  # ~45% dosis adalah dosis kedua
             
-            data.append({
-                'id_mobilitas': id_counter,
-                'iso_code': iso_code,
-                'tanggal': current_date,
-                'retail_recreation': round(retail_recreation, 1),
-                'grocery_pharmacy': round(grocery_pharmacy, 1),
-                'parks': round(parks, 1),
-                'transit_stations': round(transit_stations, 1),
-                'workplaces': round(workplaces, 1),
-                'residential': round(residential, 1),
-                'private_vehicle_movement': round(private_vehicle_movement, 1),
-                'public_transport_usage': round(public_transport_usage, 1),
-                'walking_cycling': round(walking_cycling, 1),
-                'morning_rush_hour': round(morning_rush_hour, 1),
-                'afternoon_activity': round(afternoon_activity, 1),
-                'evening_rush_hour': round(evening_rush_hour, 1),
-                'night_activity': round(night_activity, 1),
-                'overall_mobility_index': round(overall_mobility_index, 1)
-            })
+            # Kebijakan dan mobilitas
+            stringency = np.clip(rng.uniform(*STRINGENCY_PERIODE[stringency_periode[h]], L), 0, 100)
+            mobility_index = -0.6 * stringency + rng.normal(0, 5, L)
+            musim = np.cos(2 * np.pi * (tanggal.astype(np.int64) % 365.25 - 15) / 365.25)  # puncak hujan Januari
+            tahun_ke = h / 365.25
             
-            id_counter += 1
+            hari_ini = {
+                'iso_code': iso_codes,
+                'tanggal': np.full(L, tanggal),
+                'kasus_baru': kasus_baru,
+                'kematian_baru': kematian_baru,
+                'sembuh_baru': sembuh_baru,
+                'total_kasus': total_kasus.copy(),
+                'total_kematian': total_kematian.copy(),
+                'total_sembuh': total_sembuh.copy(),
+                'total_aktif': total_aktif,
+                'kasus_baru_per_juta': np.round(kasus_baru / populasi * 1e6, 2),
+                'total_kasus_per_juta': np.round(total_kasus / populasi * 1e6, 2),
+                'kematian_baru_per_juta': np.round(kematian_baru / populasi * 1e6, 2),
+                'total_kematian_per_juta': np.round(total_kematian / populasi * 1e6, 2),
+                'case_fatality_rate': np.round(_ratio(total_kematian, total_kasus, 100), 2),
+                'case_recovered_rate': np.round(_ratio(total_sembuh, total_kasus, 100), 2),
+                'growth_factor_cases': np.round(_ratio(kasus_baru, kasus_kemarin, empty=np.nan), 4),
+                'growth_factor_deaths': np.round(_ratio(kematian_baru, kematian_kemarin, empty=np.nan), 4),
+                # Healthcare & testing
+                'tests_conducted': np.maximum(kasus_baru, (kasus_baru / positivity_rate * 100).astype(np.int64)),
+                'positivity_rate': np.round(positivity_rate, 2),
+                'hospital_capacity': np.round(hospital_capacity, 2),
+                'icu_occupancy': np.round(np.clip(hospital_capacity + rng.normal(5, 5, L), 0, 100), 2),
+                # Vaccination
+                'vaccinations_total': vaccinations_total.copy(),
+                'vaccinations_new': vaccinations_new,
+                'fully_vaccinated': fully_vaccinated,
+                'vaccination_rate': np.round(fully_vaccinated / populasi * 100, 2),
+                # Economic & social impact
+                'mobility_index': np.round(mobility_index, 2),
+                'economic_impact_score': np.clip(np.round(stringency / 10).astype(np.int64) + rng.integers(-1, 2, L), 1, 10),
+                'school_closure_level': np.digitize(stringency, [40, 60, 80]),
+                'stringency_index': np.round(stringency, 2),
+                # Demographics & risk factors
+                'age_group_risk': age_group_risk,
+                'comorbidity_rate': np.round(comorbidity_rate, 2),
+                'healthcare_workers_infected': rng.binomial(kasus_baru, 0.03),
+                # Weather & environment
+                'temperature_avg': np.round(27 - 1.2 * musim + rng.normal(0, 0.8, L), 2),
+                'humidity_avg': np.round(np.clip(80 + 8 * musim + rng.normal(0, 4, L), 40, 100), 2),
+                'air_quality_index': np.clip((aqi_dasar * (1 - 0.3 * stringency / 100) + rng.normal(0, 10, L)).astype(np.int64), 0, 500),
+                'rainfall_mm': np.round(rng.gamma(2, 4 * (1 + 0.8 * musim), L), 2),
+                # Social & economic indicators
+                'unemployment_rate': np.round(unemployment_dasar + 2 * stringency / 100, 2),
+                'poverty_rate': np.round(poverty_rate, 2),
+                'education_index': np.round(education_index, 3),
+                'internet_penetration': np.round(np.minimum(internet_dasar + 5 * tahun_ke, 100), 2),
+                # Healthcare infrastructure
+                'hospital_beds_per_1000': np.round(hospital_beds_per_1000, 2),
+                'doctors_per_1000': np.round(doctors_per_1000, 3),
+                'nurses_per_1000': np.round(nurses_per_1000, 3),
+                'ventilators_available': ventilators_available,
+                # Transportation & mobility
+                'public_transport_usage': np.round(np.clip(transport_dasar * (1 + mobility_index / 100), 0, 100), 2),
+                'private_vehicle_density': np.round(private_vehicle_density, 2),
+                'flight_frequency': np.maximum(0, (flight_dasar * (1 + mobility_index / 100)).astype(np.int64)),
+                # Demographic details
+                'median_age': np.round(median_age, 1),
+                'elderly_population_pct': np.round(elderly_population_pct, 2),
+                'urban_population_pct': np.round(urban_population_pct, 2)
+            }
+            for name, values in hari_ini.items():
+                kolom.setdefault(name, []).append(values)
+            kasus_kemarin, kematian_kemarin = kasus_baru, kematian_baru
         
-        current_date += timedelta(days=7)  # Data mingguan
+        n = sum(len(values) for values in kolom['iso_code'])
+        chunk = pd.DataFrame({name: np.concatenate(values) for name, values in kolom.items()})
+        chunk.insert(0, 'id_transaksi', np.arange(next_id, next_id + n))
+        next_id += n
+        yield chunk
+
+# Tabel output dan generatornya. Stream tabel ke-i adalah child ke-i dari
+# SeedSequence(seed), jadi tabel baru harus ditambahkan di akhir agar data
+# tabel yang sudah ada tidak berubah
+GENERATORS = {
+    'rumah_sakit': generate_rumah_sakit_data,
+    'vaksinasi_detail': generate_vaksinasi_detail_data,
+    'kebijakan_pemerintah': generate_kebijakan_pemerintah_data,
+    'ekonomi_regional': generate_ekonomi_regional_data,
+    'testing_labs': generate_testing_labs_data,
+    'cluster_penularan': generate_cluster_penularan_data,
+    'mobilitas_harian': generate_mobilitas_harian_data,
+    'lokasi': generate_lokasi_data,
+    'statistik_harian': generate_statistik_harian_data,
+}
+
+# Tabel inti (--core); LOKASI dimuat lebih dulu di mode database karena direferensikan tabel lain
+CORE_TABLES = ('lokasi', 'statistik_harian')
+
+# Skema database; tipe kolom Parquet diturunkan dari CREATE TABLE di sini
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'supabase_schema.sql')
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+# SQL type -> Arrow type name; DECIMAL disimpan sebagai float64 (seperti DataFrame dan CSV)
+SQL_TO_ARROW = {
+    'BIGSERIAL': 'int64', 'BIGINT': 'int64', 'SERIAL': 'int32', 'INTEGER': 'int32',
+    'SMALLINT': 'int16', 'DECIMAL': 'float64', 'NUMERIC': 'float64',
+    'VARCHAR': 'string', 'CHAR': 'string', 'TEXT': 'string',
+    'DATE': 'date32', 'BOOLEAN': 'bool', 'TIMESTAMP': 'timestamp[us, tz=UTC]'
+}
+
+def sql_column_types(table_name, schema_file=SCHEMA_FILE):
+    """{column: SQL type} from the table's CREATE TABLE in supabase_schema.sql"""
+    with open(schema_file) as f:
+        sql = f.read()
+    match = re.search(rf"CREATE TABLE IF NOT EXISTS {table_name.upper()} \((.*?)\n\);", sql, re.S)
+    if match is None:
+        raise KeyError(f"{table_name.upper()} not found in {schema_file}")
+    columns = {}
+    for line in match.group(1).splitlines():
+        column = re.match(r"\s+([a-z_0-9]+)\s+([A-Z]+)", line)
+        if column:
+            columns[column.group(1)] = column.group(2)
+    return columns
+
+def parquet_schema(table_name, columns):
+    """Explicit Arrow schema for the given columns, typed as in supabase_schema.sql"""
+    import pyarrow as pa
+    arrow_types = {
+        'int64': pa.int64(), 'int32': pa.int32(), 'int16': pa.int16(), 'float64': pa.float64(),
+        'string': pa.string(), 'date32': pa.date32(), 'bool': pa.bool_(),
+        'timestamp[us, tz=UTC]': pa.timestamp('us', tz='UTC')
+    }
+    sql_types = sql_column_types(table_name)
+    return pa.schema([(col, arrow_types[SQL_TO_ARROW[sql_types[col]]]) for col in columns])
+
+def write_parquet_chunks(chunks, filename, table_name):
+    """Write each generated chunk as a zstd row group of filename; returns (records, columns)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
     
-    return pd.DataFrame(data)
+    records, columns, writer = 0, [], None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                columns = list(chunk.columns)
+                schema = parquet_schema(table_name, columns)
+                writer = pq.ParquetWriter(filename, schema, compression='zstd')
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            records += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return records, columns
 
-def main():
-    """Main function untuk generate semua data dummy"""
+def write_csv_chunks(chunks, filename):
+    """Append each generated chunk to filename as it is produced; returns (records, columns)"""
+    records, columns = 0, []
+    with open(filename, 'w', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=not records)
+            records += len(chunk)
+            columns = list(chunk.columns)
+    return records, columns
+
+def connect_database(dsn=''):
+    """Connection to dsn, or to the project's database (supabase_config_standalone) when empty"""
+    if dsn:
+        import psycopg2
+        return psycopg2.connect(dsn)
+    from supabase_config_standalone import get_db_connection
+    conn = get_db_connection()
+    if not conn:
+        raise ConnectionError("Could not connect to the project database")
+    return conn
+
+def missing_locations(dsn, iso_codes):
+    """Location codes not yet in LOKASI, which every generated table references"""
+    conn = connect_database(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT iso_code FROM lokasi WHERE iso_code = ANY(%s)", (list(iso_codes),))
+            present = {row[0] for row in cur.fetchall()}
+    finally:
+        conn.close()
+    return [iso for iso in iso_codes if iso not in present]
+
+def copy_generated(table_name, chunks, dsn=''):
+    """Stream generated chunks straight into the table with COPY, no CSV in between
+
+    Returns (records, columns loaded).
+    """
+    from import_engine import run_generated_import
+    from table_specs import ENHANCED_SPECS, SYNTHETIC_MAIN_SPECS
+    
+    spec = {**SYNTHETIC_MAIN_SPECS, **ENHANCED_SPECS}[table_name.upper()]
+    conn = connect_database(dsn)
+    try:
+        stats = run_generated_import(conn, spec, chunks)
+    finally:
+        conn.close()
+    print(f"📤 {spec.name}: {stats['rows']:,} rows in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/s, generate {stats['parse_seconds']:.1f}s)")
+    return stats['rows'], list(spec.columns)
+
+def table_seeds(seed=RANDOM_SEED):
+    """Independent SeedSequence per table, spawned from one root seed"""
+    return dict(zip(GENERATORS, np.random.SeedSequence(seed).spawn(len(GENERATORS))))
+
+def generate_table(table_name, seed_seq, scale=1, chunk_rows=CHUNK_ROWS, database=None, output_format='csv'):
+    """Generate one table from its own stream into dummy_data/; returns (records, columns)
+
+    Runs in a worker process; output depends only on the table's seed,
+    scale and chunk_rows, not on which process runs it or when. The file is
+    CSV or zstd Parquet (output_format). With a database DSN ('' = the
+    project database) the rows are COPYed into the table instead.
+    """
+    generate = GENERATORS[table_name]
+    rng = np.random.default_rng(seed_seq)
+    chunks = generate(rng, scale, chunk_rows)
+    if database is not None:
+        return copy_generated(table_name, chunks, database)
+    if output_format == 'parquet':
+        return write_parquet_chunks(chunks, f'dummy_data/{table_name}.parquet', table_name)
+    return write_csv_chunks(chunks, f'dummy_data/{table_name}.csv')
+
+def main(scale=1, chunk_rows=CHUNK_ROWS, workers=None, seed=RANDOM_SEED, database=None, output_format='csv',
+         core=False):
+    """Main function untuk generate semua data dummy
+
+    core=True juga membuat LOKASI dan STATISTIK_HARIAN sintetis, sehingga
+    benchmark end-to-end tidak butuh covid_19_indonesia_enhanced.csv. Pada
+    scale > 1 ke file, core selalu aktif: kode kabupaten (ID-JK-001) tidak
+    ada di LOKASI asli, jadi hasilnya harus diimport dengan
+    supabase_data_import.py --synthetic.
+    """
     print("🚀 Starting Enhanced COVID-19 Dummy Data Generation")
     print("=" * 60)
+    iso_codes, _, _ = synthetic_locations(scale)
+    if scale > 1:
+        print(f"📈 Scale {scale}: {len(iso_codes):,} kabupaten sintetis, data harian")
+        if database is None and not core:
+            print("📍 Kabupaten sintetis tidak ada di LOKASI asli: LOKASI dan STATISTIK_HARIAN "
+                  "sintetis ikut dibuat (--core); import dengan supabase_data_import.py --synthetic")
+            core = True
     
     # Create output directory
     os.makedirs('dummy_data', exist_ok=True)
     
-    # Generate semua tabel
-    datasets = {}
+    if database is not None and not core:
+        # Mode database: tabel hasil generate mereferensikan LOKASI
+        missing = missing_locations(database, iso_codes)
+        if missing:
+            print(f"❌ {len(missing):,} locations are not in LOKASI (e.g. {missing[0]}); import LOKASI first")
+            return None
+    if database is not None:
+        print("🗄️  Streaming generated rows straight into the database with COPY")
     
-    print("\n📊 Generating all dummy datasets...")
+    # Generate semua tabel paralel; tiap chunk langsung ditulis ke CSV atau database.
+    # Seed stream tetap per tabel, juga untuk tabel yang tidak dipilih
+    datasets = {}
+    seeds = {table_name: seed_seq for table_name, seed_seq in table_seeds(seed).items()
+             if core or table_name not in CORE_TABLES}
+    results = {}
+    if core and database is not None:
+        # LOKASI harus ada sebelum tabel lain di-COPY (foreign key)
+        results['lokasi'] = generate_table('lokasi', seeds.pop('lokasi'), scale, chunk_rows, database)
+    workers = max(1, min(workers or GENERATOR_WORKERS, len(seeds)))
     
-    datasets['rumah_sakit'] = generate_rumah_sakit_data()
-    datasets['vaksinasi_detail'] = generate_vaksinasi_detail_data()
-    datasets['kebijakan_pemerintah'] = generate_kebijakan_pemerintah_data()
-    datasets['ekonomi_regional'] = generate_ekonomi_regional_data()
-    datasets['testing_labs'] = generate_testing_labs_data()
-    datasets['cluster_penularan'] = generate_cluster_penularan_data()
-    datasets['mobilitas_harian'] = generate_mobilitas_harian_data()
+    print(f"\n📊 Generating all dummy datasets with {workers} workers...")
     
-    # Save to CSV files
-    print("\n💾 Saving datasets to CSV files...")
+    if workers == 1:
+        results.update({table_name: generate_table(table_name, seed_seq, scale, chunk_rows, database, output_format)
+                        for table_name, seed_seq in seeds.items()})
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {table_name: pool.submit(generate_table, table_name, seed_seq, scale, chunk_rows,
+                                               database, output_format)
+                       for table_name, seed_seq in seeds.items()}
+            results.update({table_name: future.result() for table_name, future in futures.items()})
     
-    for table_name, df in datasets.items():
-        filename = f'dummy_data/{table_name}.csv'
-        df.to_csv(filename, index=False)
-        print(f"✅ {filename} - {len(df):,} records")
+    for table_name, (records, columns) in results.items():
+        datasets[table_name] = {'records': records, 'columns': columns}
+        target = table_name.upper() if database is not None else f"dummy_data/{table_name}.{output_format}"
+        print(f"✅ {target} - {records:,} records")
     
     # Generate summary report
     print("\n📋 SUMMARY REPORT")
     print("=" * 40)
     
     total_records = 0
-    for table_name, df in datasets.items():
-        record_count = len(df)
+    for table_name, info in datasets.items():
+        record_count = info['records']
         total_records += record_count
         print(f"{table_name:20}: {record_count:,} records")
     
@@ -823,28 +1194,71 @@ def main():
         'total_tables': len(datasets),
         'total_records': total_records,
         'provinsi_count': len(PROVINSI_DATA),
+        'seed': seed,
+        'scale': scale,
+        'location_level': 'provinsi' if scale == 1 else 'kabupaten',
+        'location_count': len(iso_codes),
+        'cadence_days': cadence_days(scale),
+        'core_tables': core,
+        'output': output_format if database is None else 'database',
         'date_range': {
             'start': '2020-03-01',
             'end': '2022-09-15'
         },
         'tables': {
             table_name: {
-                'records': len(df),
-                'columns': list(df.columns),
-                'file': f'{table_name}.csv'
+                'records': info['records'],
+                'columns': info['columns'],
+                'file': f'{table_name}.{output_format}' if database is None else None
             }
-            for table_name, df in datasets.items()
+            for table_name, info in datasets.items()
         }
     }
+    if output_format == 'parquet' and database is None:
+        # Skema eksplisit yang dipakai file Parquet
+        for table_name, info in metadata['tables'].items():
+            schema = parquet_schema(table_name, info['columns'])
+            info['schema'] = {field.name: str(field.type) for field in schema}
     
     with open('dummy_data/metadata.json', 'w') as f:
         json.dump(metadata, f, indent=2)
     
     print(f"\n🎉 Data generation completed!")
-    print(f"📁 Files saved in: dummy_data/")
+    if database is None:
+        print(f"📁 Files saved in: dummy_data/")
     print(f"📄 Metadata saved in: dummy_data/metadata.json")
     
     return datasets
 
 if __name__ == "__main__":
-    datasets = main()
+    parser = argparse.ArgumentParser(description="Generate enhanced COVID-19 dummy data")
+    parser.add_argument('--scale', type=int, default=1,
+                        help=f"volume multiplier (1-{MAX_SCALE}): N synthetic regencies per province, "
+                             f"daily instead of weekly time series and N times more hospitals, "
+                             f"labs and clusters (default 1 = the original toy dataset); writing "
+                             f"files with N > 1 implies --core")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help=f"rows generated and written per chunk (default {CHUNK_ROWS:,}); "
+                             f"output for a given seed depends on this value")
+    parser.add_argument('--workers', type=int, default=GENERATOR_WORKERS,
+                        help=f"tables generated in parallel (default {GENERATOR_WORKERS}); "
+                             f"the output does not depend on it")
+    parser.add_argument('--seed', type=int, default=RANDOM_SEED,
+                        help=f"root seed; each table gets its own stream spawned from it (default {RANDOM_SEED})")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', dest='output_format',
+                        help="file format in dummy_data/ (parquet: zstd, typed as in supabase_schema.sql)")
+    parser.add_argument('--database', nargs='?', const='', default=None, metavar='DSN',
+                        help="COPY the generated rows straight into the database instead of writing CSVs "
+                             "(DSN, or the project database from supabase_config_standalone when omitted)")
+    parser.add_argument('--core', action='store_true',
+                        help="also generate synthetic LOKASI and daily STATISTIK_HARIAN (import them with "
+                             "supabase_data_import.py --synthetic), so no source CSV is needed")
+    args = parser.parse_args()
+    if not 1 <= args.scale <= MAX_SCALE:
+        parser.error(f"--scale must be between 1 and {MAX_SCALE}")
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be positive")
+    if args.database is not None and args.output_format != 'csv':
+        parser.error("--database writes no files and cannot be combined with --format")
+    datasets = main(args.scale, args.chunk_rows, args.workers, args.seed, args.database, args.output_format,
+                    args.core)
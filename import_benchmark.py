@@ -0,0 +1,172 @@
+"""
+Import benchmark: per-row execute vs execute_values vs COPY
+
+Runs the import pipeline for each table against a local PostgreSQL stand-in
+and writes the same prepared rows with each method. Rows go into TEMP copies
+of the tables, so nothing in the stand-in database is changed; only the
+schema is created there from supabase_schema.sql when it is missing.
+"""
+import os
+import time
+
+from psycopg2.extras import execute_values
+
+from import_engine import (_commit, copy_chunks, get_column_types, prepare_for_copy,
+                           prepare_source)
+
+# Local database used by --benchmark; never point this at the Supabase project
+BENCHMARK_DSN = os.getenv('BENCHMARK_DATABASE_URL', 'postgresql://postgres@localhost:5432/postgres')
+
+BENCHMARK_METHODS = ('execute', 'execute_values', 'copy')
+
+# Rows per INSERT statement for execute_values (psycopg2's default is 100)
+EXECUTE_VALUES_PAGE_SIZE = 1000
+
+# Comparison table written by --benchmark
+BENCHMARK_REPORT = 'import_benchmark.md'
+
+SCHEMA_FILE = 'supabase_schema.sql'
+
+
+def ensure_schema(conn, schema_file=SCHEMA_FILE):
+    """Create the dashboard schema in the stand-in database if it is missing"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('lokasi')")
+        if cur.fetchone()[0] is None:
+            with open(schema_file) as f:
+                cur.execute(f.read())
+    conn.commit()
+
+
+def _bench_table(conn, table_name):
+    """TEMP copy of a table with its defaults, checks and indexes (no foreign keys)"""
+    bench = f"_bench_{table_name.lower()}"
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {bench}")
+        cur.execute(f"CREATE TEMP TABLE {bench} (LIKE {table_name} INCLUDING ALL)")
+    conn.commit()
+    return bench
+
+
+def benchmark_method(conn, spec, data, method):
+    """Write prepared rows into a TEMP copy of spec's table with one method
+
+    Returns stats with convert_seconds (building parameter tuples for
+    execute / execute_values), write_seconds (statements or COPY, including
+    COPY's CSV rendering) and commit_seconds.
+    """
+    bench = _bench_table(conn, spec.name)
+    column_types = get_column_types(conn, bench)
+    columns = [col for col in data.columns if col in column_types]
+    column_list = ', '.join(columns)
+    convert_seconds = 0.0
+    bytes_sent = None
+
+    try:
+        start = time.perf_counter()
+        if method == 'copy':
+            rows, bytes_sent = copy_chunks(conn, bench, data, columns)
+        else:
+            out = prepare_for_copy(data, columns, column_types)
+            values = list(out.astype(object).where(out.notna(), None)
+                          .itertuples(index=False, name=None))
+            convert_seconds = time.perf_counter() - start
+
+            with conn.cursor() as cur:
+                if method == 'execute':
+                    sql = f"INSERT INTO {bench} ({column_list}) VALUES ({', '.join(['%s'] * len(columns))})"
+                    for row in values:
+                        cur.execute(sql, row)
+                elif method == 'execute_values':
+                    execute_values(cur, f"INSERT INTO {bench} ({column_list}) VALUES %s", values,
+                                   page_size=EXECUTE_VALUES_PAGE_SIZE)
+                else:
+                    raise ValueError(f"Unknown benchmark method '{method}'")
+            rows = len(values)
+        write_seconds = time.perf_counter() - start - convert_seconds
+        commit_seconds = _commit(conn)
+    except Exception:
+        conn.rollback()
+        raise
+
+    seconds = convert_seconds + write_seconds + commit_seconds
+    return {
+        'table': spec.name,
+        'method': method,
+        'rows': rows,
+        'bytes': bytes_sent,
+        'convert_seconds': convert_seconds,
+        'write_seconds': write_seconds,
+        'commit_seconds': commit_seconds,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else float('inf')
+    }
+
+
+def run_benchmark(connect, specs, methods=BENCHMARK_METHODS, max_rows=None):
+    """Benchmark every spec with every method on one connection
+
+    Each source is read and prepared once (prepare_seconds, shared by all
+    methods); the methods are timed on the same prepared rows. Returns a
+    list of stats.
+    """
+    results = []
+    conn = connect()
+    try:
+        ensure_schema(conn)
+        for spec in specs.values():
+            data, timings = prepare_source(spec)
+            if max_rows:
+                data = data.head(max_rows)
+
+            for method in methods:
+                stats = benchmark_method(conn, spec, data, method)
+                stats['prepare_seconds'] = timings['parse_seconds'] + timings['convert_seconds']
+                results.append(stats)
+    finally:
+        conn.close()
+    return results
+
+
+def _speedups(results):
+    """{(table, method): time of 'execute' / time of this method}"""
+    baseline = {stats['table']: stats['seconds'] for stats in results if stats['method'] == 'execute'}
+    return {
+        (stats['table'], stats['method']): baseline[stats['table']] / stats['seconds']
+        for stats in results if stats['table'] in baseline and stats['seconds'] > 0
+    }
+
+
+def benchmark_lines(results):
+    """Comparison table of run_benchmark results for the console"""
+    speedups = _speedups(results)
+    lines = [f"{'TABLE':22} {'METHOD':15} {'ROWS':>9} {'PREPARE':>8} {'CONVERT':>8} {'WRITE':>8} "
+             f"{'COMMIT':>7} {'ROWS/S':>10} {'VS EXECUTE':>11}"]
+    for stats in results:
+        speedup = speedups.get((stats['table'], stats['method']))
+        lines.append(f"{stats['table']:22} {stats['method']:15} {stats['rows']:>9,} "
+                     f"{stats['prepare_seconds']:>7.2f}s {stats['convert_seconds']:>7.2f}s "
+                     f"{stats['write_seconds']:>7.2f}s {stats['commit_seconds']:>6.3f}s "
+                     f"{stats['rows_per_sec']:>10,.0f} "
+                     f"{'-' if speedup is None else f'{speedup:.1f}x':>11}")
+    return lines
+
+
+def write_benchmark_report(results, conn_params, path=BENCHMARK_REPORT):
+    """Write the comparison as a Markdown table"""
+    speedups = _speedups(results)
+    with open(path, 'w') as f:
+        f.write("# Import Benchmark\n\n")
+        f.write(f"Run {time.strftime('%Y-%m-%d %H:%M')} against "
+                f"`{conn_params.get('host')}:{conn_params.get('port')}/{conn_params.get('dbname')}`. ")
+        f.write("Prepare (read + clean the source) is shared by all methods. Rows/s and the speedup "
+                "cover convert + write + commit.\n\n")
+        f.write("| Table | Method | Rows | Prepare (s) | Convert (s) | Write (s) | Commit (s) "
+                "| Rows/s | vs execute |\n")
+        f.write("|---|---|---:|---:|---:|---:|---:|---:|---:|\n")
+        for stats in results:
+            speedup = speedups.get((stats['table'], stats['method']))
+            f.write(f"| {stats['table']} | {stats['method']} | {stats['rows']:,} "
+                    f"| {stats['prepare_seconds']:.2f} | {stats['convert_seconds']:.2f} "
+                    f"| {stats['write_seconds']:.2f} | {stats['commit_seconds']:.3f} "
+                    f"| {stats['rows_per_sec']:,.0f} | {'-' if speedup is None else f'{speedup:.1f}x'} |\n")
@@ -0,0 +1,1550 @@
+"""
+Bulk Import Engine for COVID-19 Indonesia Dashboard
+Streams pandas DataFrames into PostgreSQL with COPY ... FROM STDIN
+"""
+
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import pandas as pd
+import psycopg2
+import psycopg2.errors
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL integer types - values must be written without a decimal part for COPY
+INTEGER_TYPES = {'smallint', 'integer', 'bigint'}
+
+# Rows rendered to CSV per chunk while streaming to the server
+COPY_CHUNK_ROWS = 50000
+
+# Bytes handed to the server per read() call
+COPY_BUFFER_SIZE = 1 << 20
+
+
+# Spellings accepted for boolean columns when they were not parsed as bool
+BOOL_VALUES = {
+    'true': True, 't': True, '1': True, 'yes': True, 'y': True,
+    'false': False, 'f': False, '0': False, 'no': False, 'n': False
+}
+
+
+def _strip_percent(series):
+    """Drop a trailing '%' from text values so '12.5%' parses as 12.5"""
+    if series.dtype.kind in 'iufb':
+        return series
+    return series.astype('string').str.strip().str.rstrip('%')
+
+
+def apply_schema(df, schema):
+    """Cast every column once, vectorized, according to a {column: dtype} schema
+
+    Supported dtypes are 'str', 'category', 'int', 'float', 'percent' ('12.5%'
+    -> 12.5), 'bool' and 'date'. Columns the parser already typed are passed
+    through untouched. Values that cannot be parsed become NULL (e.g. an empty
+    tanggal_selesai), and columns come out in schema order, ready for the writer.
+    """
+    columns = {}
+
+    for col, dtype in schema.items():
+        series = df[col]
+
+        if dtype == 'int':
+            if series.dtype.kind != 'i':
+                series = pd.to_numeric(_strip_percent(series), errors='coerce').round().astype('Int64')
+        elif dtype in ('float', 'percent'):
+            if series.dtype.kind != 'f':
+                series = pd.to_numeric(_strip_percent(series), errors='coerce').astype('float64')
+        elif dtype == 'bool':
+            if series.dtype.kind != 'b':
+                series = series.astype('string').str.strip().str.lower().map(BOOL_VALUES).astype('boolean')
+        elif dtype == 'date':
+            if series.dtype.kind != 'M':
+                series = pd.to_datetime(series, errors='coerce')
+        elif dtype == 'str':
+            if series.dtype.kind != 'O' and not isinstance(series.dtype, pd.StringDtype):
+                series = series.astype('string')
+        elif dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+        else:
+            raise ValueError(f"Unknown dtype '{dtype}' for column {col}")
+
+        columns[col] = series
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def get_column_types(conn, table_name):
+    """Get {column: data_type} for a table from information_schema"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = %s
+        """, (table_name.lower(),))
+        return dict(cur.fetchall())
+
+
+def prepare_for_copy(df, columns, column_types):
+    """Select the target columns and coerce values PostgreSQL COPY would reject"""
+    out = df[columns].copy()
+
+    for col in columns:
+        if column_types.get(col) in INTEGER_TYPES and out[col].dtype.kind != 'i':
+            # 12.0 is fine for INSERT but COPY needs 12; nullable Int64 keeps NaN as NULL
+            out[col] = pd.to_numeric(out[col], errors='coerce').round().astype('Int64')
+
+    return out
+
+
+def iter_slices(df, chunk_rows=COPY_CHUNK_ROWS):
+    """Yield consecutive row slices of a DataFrame"""
+    for offset in range(0, len(df), chunk_rows):
+        yield df.iloc[offset:offset + chunk_rows]
+
+
+def as_chunks(data, columns=None):
+    """Normalize a DataFrame or an iterable of DataFrames to (columns, chunks)
+
+    Loaders accept either; a chunk iterator is only consumed once, while
+    the COPY runs.
+    """
+    if isinstance(data, pd.DataFrame):
+        columns = list(columns if columns is not None else data.columns)
+        return columns, iter_slices(data)
+
+    chunks = iter(data)
+    first = next(chunks, None)
+    if first is None:
+        return list(columns or []), iter(())
+    columns = list(columns if columns is not None else first.columns)
+    return columns, itertools.chain([first], chunks)
+
+
+class DataFrameCopyReader:
+    """File-like object that renders DataFrame chunks to CSV one at a time
+
+    COPY pulls data through read(), so only one chunk of CSV text is held in
+    memory regardless of how many rows are streamed.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._current = io.StringIO()
+        self.rows = 0
+        self.bytes_sent = 0
+
+    def _next_chunk(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self.rows += len(chunk)
+        self._current = io.StringIO(
+            chunk.to_csv(header=False, index=False, date_format='%Y-%m-%d')
+        )
+        return True
+
+    def read(self, size=-1):
+        data = self._current.read(size)
+        while (size < 0 or len(data) < size) and self._next_chunk():
+            data += self._current.read(size - len(data) if size >= 0 else -1)
+        self.bytes_sent += len(data.encode())
+        return data
+
+    def readline(self, size=-1):
+        line = self._current.readline(size)
+        while not line and self._next_chunk():
+            line = self._current.readline(size)
+        self.bytes_sent += len(line.encode())
+        return line
+
+
+def copy_chunks(conn, table_name, data, columns=None):
+    """COPY a DataFrame or DataFrame chunks into a table (no commit)
+
+    Returns (rows, bytes sent).
+    """
+    columns, chunks = as_chunks(data, columns)
+    if not columns:
+        return 0, 0
+
+    column_types = get_column_types(conn, table_name)
+    reader = DataFrameCopyReader(prepare_for_copy(chunk, columns, column_types) for chunk in chunks)
+    sql = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    with conn.cursor() as cur:
+        cur.copy_expert(sql, reader, size=COPY_BUFFER_SIZE)
+
+    return reader.rows, reader.bytes_sent
+
+
+def copy_dataframe(conn, table_name, df, columns=None):
+    """COPY a DataFrame into a table (no commit); returns bytes sent"""
+    return copy_chunks(conn, table_name, df, columns)[1]
+
+
+def _commit(conn):
+    """Commit and return how long the commit took"""
+    start = time.perf_counter()
+    conn.commit()
+    return time.perf_counter() - start
+
+
+def _load_stats(table_name, rows, seconds, bytes_sent, commit_seconds=0.0):
+    return {
+        'table': table_name,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else float('inf'),
+        'bytes': bytes_sent,
+        'commit_seconds': commit_seconds
+    }
+
+
+def load_table(conn, table_name, df, columns=None, replace=True):
+    """Replace (or append to) a table with a DataFrame in a single transaction
+
+    `df` may also be an iterable of DataFrame chunks, which are streamed.
+    Returns a dict with rows, seconds, rows_per_sec, bytes and commit_seconds.
+    """
+    start = time.perf_counter()
+
+    try:
+        if replace:
+            with conn.cursor() as cur:
+                cur.execute(f"DELETE FROM {table_name}")
+
+        rows, bytes_sent = copy_chunks(conn, table_name, df, columns)
+        commit_seconds = _commit(conn)
+    except Exception:
+        conn.rollback()
+        raise
+
+    return _load_stats(table_name, rows, time.perf_counter() - start, bytes_sent, commit_seconds)
+
+
+def merge_chunks(conn, table_name, data, conflict_key, columns=None):
+    """Stage rows in a temp table and merge them on the natural key (no commit)
+
+    Returns (rows, inserted, updated, bytes sent), rows counting distinct keys.
+    """
+    columns, chunks = as_chunks(data, columns)
+    if not columns:
+        return 0, 0, 0, 0
+    conflict_key = list(conflict_key)
+    values = [col for col in columns if col not in conflict_key]
+
+    stage = f"_stage_{table_name.lower()}"
+    column_list = ', '.join(columns)
+    key_list = ', '.join(conflict_key)
+
+    if values:
+        changed = ' OR '.join(f"t.{col} IS DISTINCT FROM EXCLUDED.{col}" for col in values)
+        on_conflict = (f"DO UPDATE SET {', '.join(f'{col} = EXCLUDED.{col}' for col in values)} "
+                       f"WHERE {changed}")
+    else:
+        on_conflict = "DO NOTHING"
+
+    with conn.cursor() as cur:
+        # Same column types as the target, but no constraints, defaults or indexes
+        cur.execute(f"DROP TABLE IF EXISTS {stage}")
+        cur.execute(f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {table_name} WITH NO DATA")
+
+    _, bytes_sent = copy_chunks(conn, stage, chunks, columns)
+
+    with conn.cursor() as cur:
+        # ON CONFLICT cannot touch the same row twice: the last staged row
+        # per key wins. xmax = 0 only for freshly inserted tuples.
+        cur.execute(f"""
+            WITH source AS (
+                SELECT DISTINCT ON ({key_list}) {column_list}
+                FROM {stage}
+                ORDER BY {key_list}, ctid DESC
+            ), merged AS (
+                INSERT INTO {table_name} AS t ({column_list})
+                SELECT {column_list} FROM source
+                ON CONFLICT ({key_list}) {on_conflict}
+                RETURNING (t.xmax = 0) AS inserted
+            )
+            SELECT (SELECT COUNT(*) FROM source),
+                   COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+            FROM merged
+        """)
+        rows, inserted, updated = cur.fetchone()
+
+    return rows, inserted, updated, bytes_sent
+
+
+def upsert_table(conn, table_name, df, conflict_key, columns=None):
+    """Merge a DataFrame into a table on its natural key in a single transaction
+
+    Rows are COPYed into a temp staging table, then one
+    INSERT ... ON CONFLICT DO UPDATE adds new keys and rewrites only rows
+    whose values changed, so unchanged history and its indexes are untouched.
+    `df` may also be an iterable of DataFrame chunks.
+    Returns load_table's stats plus inserted, updated and unchanged counts.
+    """
+    start = time.perf_counter()
+
+    try:
+        rows, inserted, updated, bytes_sent = merge_chunks(conn, table_name, df, conflict_key, columns)
+        commit_seconds = _commit(conn)
+    except Exception:
+        conn.rollback()
+        raise
+
+    stats = _load_stats(table_name, rows, time.perf_counter() - start, bytes_sent, commit_seconds)
+    stats.update(inserted=inserted, updated=updated, unchanged=rows - inserted - updated)
+    return stats
+
+
+# =====================================================
+# SHADOW TABLE SWAP
+# =====================================================
+
+# Readers queue behind the rename for at most this long before the swap gives up
+SWAP_LOCK_TIMEOUT = '10s'
+
+# Advisory lock serializing swaps: concurrent renames/drops of tables that
+# reference LOKASI would otherwise deadlock upgrading their locks on it
+SWAP_LOCK_KEY = 0x636f7669
+
+# Attempts at dropping a swapped-out table before leaving it for the next run
+SWAP_DROP_ATTEMPTS = 3
+
+
+def get_table_objects(conn, table_name):
+    """Collect what a shadow copy of a table must recreate before it can replace it"""
+    table = table_name.lower()
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c
+                  WHERE c.conrelid = x.indrelid AND c.conindid = x.indexrelid
+                    AND c.contype IN ('p', 'u', 'x')
+              )
+        """, (table,))
+        indexes = cur.fetchall()
+
+        # CHECK and NOT NULL constraints come along with CREATE TABLE ... LIKE
+        cur.execute("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x', 'f')
+            ORDER BY contype = 'f'
+        """, (table,))
+        constraints = cur.fetchall()
+
+        cur.execute("""
+            SELECT pg_get_triggerdef(oid)
+            FROM pg_trigger
+            WHERE tgrelid = %s::regclass AND NOT tgisinternal
+        """, (table,))
+        triggers = [row[0] for row in cur.fetchall()]
+
+        cur.execute("""
+            SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid)
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            JOIN pg_class v ON v.oid = r.ev_class
+            WHERE d.classid = 'pg_rewrite'::regclass
+              AND d.refobjid = %s::regclass
+              AND v.relkind = 'v'
+        """, (table,))
+        views = cur.fetchall()
+
+        cur.execute("""
+            SELECT attname, pg_get_serial_sequence(%s, attname)
+            FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+        """, (table, table))
+        sequences = [row for row in cur.fetchall() if row[1]]
+
+        cur.execute("""
+            SELECT CASE WHEN a.grantee = 0 THEN 'PUBLIC'
+                        ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+                   a.privilege_type
+            FROM pg_class c, aclexplode(c.relacl) a
+            WHERE c.oid = %s::regclass
+        """, (table,))
+        grants = cur.fetchall()
+
+    return {
+        'indexes': indexes,
+        'constraints': constraints,
+        'triggers': triggers,
+        'views': views,
+        'sequences': sequences,
+        'grants': grants
+    }
+
+
+def can_swap(conn, table_name):
+    """A table can be swapped unless other tables reference it or it uses row level security
+
+    Foreign keys and policies are bound to the table itself, so a renamed
+    copy would leave them pointing at the old data.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.relrowsecurity OR EXISTS (
+                SELECT 1 FROM pg_constraint f
+                WHERE f.confrelid = c.oid AND f.contype = 'f' AND f.conrelid <> c.oid
+            )
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
+        """, (table_name.lower(),))
+        blocked = cur.fetchone()[0]
+    conn.rollback()
+    return not blocked
+
+
+def _swap_name(name):
+    # Temporary name for an index/constraint while the original still exists
+    return f"{name[:57]}_swap"
+
+
+def _old_name(name):
+    # Name an index/constraint of the swapped-out table is parked under
+    return f"{name[:58]}_old"
+
+
+def _drop_old_table(conn, old):
+    """Drop a swapped-out table; returns False if it is left for the next run"""
+    for attempt in range(SWAP_DROP_ATTEMPTS):
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (SWAP_LOCK_KEY,))
+                cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+                cur.execute(f"DROP TABLE IF EXISTS {old}")
+            conn.commit()
+            return True
+        except psycopg2.errors.LockNotAvailable:
+            conn.rollback()
+        except psycopg2.errors.DependentObjectsStillExist as e:
+            # e.g. a view on one of the re-pointed views; the swap itself has committed
+            conn.rollback()
+            logger.warning(f"Kept {old}: other objects still depend on it ({e.diag.message_detail}); "
+                           f"drop or re-point them and drop {old} by hand")
+            return False
+    logger.warning(f"Kept {old}: could not lock it within {SWAP_DROP_ATTEMPTS} attempts; "
+                   f"it is dropped on the next swap")
+    return False
+
+
+def swap_table(conn, table_name, df, columns=None):
+    """Reload a table through an unindexed shadow copy and swap it in by rename
+
+    The shadow is created without indexes, loaded with COPY, then indexed,
+    constrained and ANALYZEd. A second, short transaction renames it into
+    place and re-points dependent views, triggers and sequences - readers
+    see either the old rows or the new ones. The old table is dropped
+    afterwards, or kept with a warning while other objects (e.g. a
+    materialized view) still depend on it. `df` may also be an iterable
+    of DataFrame chunks.
+    Returns the same stats as load_table.
+    """
+    start = time.perf_counter()
+    table = table_name.lower()
+    shadow = f"{table}_shadow"
+    old = f"{table}_old"
+
+    # Leftover from an interrupted run
+    _drop_old_table(conn, old)
+    objects = get_table_objects(conn, table)
+
+    # Phase 1: build the shadow table at unindexed speed
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+            cur.execute(f"CREATE TABLE {shadow} (LIKE {table} INCLUDING DEFAULTS "
+                        f"INCLUDING CONSTRAINTS INCLUDING GENERATED INCLUDING IDENTITY "
+                        f"INCLUDING STORAGE INCLUDING COMMENTS)")
+
+        rows, bytes_sent = copy_chunks(conn, shadow, df, columns)
+
+        with conn.cursor() as cur:
+            for name, definition in objects['constraints']:
+                cur.execute(f"ALTER TABLE {shadow} ADD CONSTRAINT {_swap_name(name)} {definition}")
+            for name, definition in objects['indexes']:
+                definition = re.sub(r' INDEX \S+ ON \S+ ',
+                                    f' INDEX {_swap_name(name)} ON {shadow} ', definition, count=1)
+                cur.execute(definition)
+            for grantee, privilege in objects['grants']:
+                cur.execute(f"GRANT {privilege} ON {shadow} TO {grantee}")
+            cur.execute(f"ANALYZE {shadow}")
+        commit_seconds = _commit(conn)
+    except Exception:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+        conn.commit()
+        raise
+
+    # Phase 2: swap in one short transaction
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (SWAP_LOCK_KEY,))
+            cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+            cur.execute(f"ALTER TABLE {table} RENAME TO {old}")
+            cur.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+
+            # Definitions were captured by name, so they now resolve to the new table
+            for view, definition in objects['views']:
+                cur.execute(f"CREATE OR REPLACE VIEW {view} AS {definition}")
+            for definition in objects['triggers']:
+                cur.execute(definition)
+            for column, sequence in objects['sequences']:
+                cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.{column}")
+
+            for name, _ in objects['constraints']:
+                cur.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {name} TO {_old_name(name)}")
+                cur.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {_swap_name(name)} TO {name}")
+            for name, _ in objects['indexes']:
+                cur.execute(f"ALTER INDEX {name} RENAME TO {_old_name(name)}")
+                cur.execute(f"ALTER INDEX {_swap_name(name)} RENAME TO {name}")
+        commit_seconds += _commit(conn)
+    except Exception:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+        conn.commit()
+        raise
+
+    # Phase 3: dropping the old table needs a brief exclusive lock on LOKASI
+    _drop_old_table(conn, old)
+
+    return _load_stats(table_name, rows, time.perf_counter() - start, bytes_sent, commit_seconds)
+
+
+# =====================================================
+# SPEC-DRIVEN IMPORTS (see table_specs.py)
+# =====================================================
+
+# Source rows parsed per chunk in streaming mode
+CSV_CHUNK_ROWS = 100000
+
+
+# Parsed sources are cached here as Parquet, keyed by the CSV's content hash ('' disables)
+SOURCE_CACHE_DIR = os.getenv('IMPORT_CACHE_DIR', '.import_cache')
+
+# Part of every cache key; bump when parse_csv's typing changes so old caches are not reused
+SOURCE_CACHE_VERSION = 2
+
+
+# file_hash results keyed by (path, size, mtime), so a file is hashed once per run
+_FILE_HASHES = {}
+
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _FILE_HASHES:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+                digest.update(block)
+        _FILE_HASHES[key] = digest.hexdigest()
+    return _FILE_HASHES[key]
+
+
+def is_parquet(path):
+    """Whether a source file is Parquet rather than CSV"""
+    return path.lower().endswith('.parquet')
+
+
+def read_parquet(path):
+    """Read a Parquet source with dates as datetime64 columns"""
+    import pyarrow.parquet as pq
+    return pq.read_table(path).to_pandas(date_as_object=False)
+
+
+def _cache_key(path, dtypes):
+    """Fingerprint of a source's location and of the dtypes it is parsed with"""
+    key = json.dumps([SOURCE_CACHE_VERSION, os.path.abspath(path), sorted((dtypes or {}).items())])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def source_cache_path(path, dtypes=None, digest=None):
+    """Parquet cache file for a source CSV's current content (None when caching is off)
+
+    The name is <source name>.<path + dtypes key>.<content SHA-256>.parquet,
+    so a cache typed with other dtypes, or of another file with the same
+    name, is never reused.
+    """
+    if not SOURCE_CACHE_DIR:
+        return None
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(SOURCE_CACHE_DIR,
+                        f"{name}.{_cache_key(path, dtypes)}.{digest or file_hash(path)}.parquet")
+
+
+def _write_source_cache(df, cache_path):
+    """Store a parsed source as Parquet and drop caches of older versions of the same file and dtypes"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # No Parquet engine (pyarrow) or a column it cannot store - just don't cache
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    cache_dir, cache_name = os.path.split(cache_path)
+    prefix = cache_name.rsplit('.', 2)[0]
+    older = re.compile(rf"{re.escape(prefix)}\.[0-9a-f]{{64}}\.parquet")
+    for stale in os.listdir(cache_dir):
+        if stale != cache_name and older.fullmatch(stale):
+            os.remove(os.path.join(cache_dir, stale))
+    return True
+
+
+def _parse_csv_arrow(path, dtypes):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    # Text-like columns are pinned so codes keep their zeros; numbers are inferred
+    arrow_types = {'str': pa.string(), 'category': pa.string(), 'percent': pa.string(),
+                   'date': pa.timestamp('s')}
+    convert_options = pacsv.ConvertOptions(
+        column_types={col: arrow_types[dtype] for col, dtype in dtypes.items() if dtype in arrow_types},
+        strings_can_be_null=True,
+        # Sources are ISO or M/D/Y only; anything else goes to the pandas fallback
+        timestamp_parsers=[pacsv.ISO8601, '%m/%d/%Y']
+    )
+    table = pacsv.read_csv(path, convert_options=convert_options)
+
+    # '12.5%' -> 12.5 with Arrow kernels, one pass per percent column
+    for col, dtype in dtypes.items():
+        if dtype != 'percent' or col not in table.column_names:
+            continue
+        text = pc.utf8_rtrim(pc.utf8_trim_whitespace(table[col]), characters='%')
+        try:
+            values = pc.cast(text, pa.float64())
+        except pa.ArrowInvalid:
+            values = pa.array(pd.to_numeric(text.to_pandas(), errors='coerce'), pa.float64())
+        table = table.set_column(table.column_names.index(col), col, values)
+
+    return table.to_pandas()
+
+
+def parse_csv(path, dtypes=None, table=None):
+    """Parse a source CSV, typing columns while reading
+
+    `dtypes` maps source headers to schema dtypes (TableSpec.source_dtypes).
+    Uses the multithreaded pyarrow CSV reader when available - 'percent'
+    columns are converted there - and falls back to pandas' C parser when
+    pyarrow is missing or cannot convert the file (logged with `table`).
+    """
+    dtypes = dtypes or {}
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    if pa is not None:
+        try:
+            return _parse_csv_arrow(path, dtypes)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # e.g. a date column in an unexpected format - let pandas infer it
+            logger.warning(f"{table or path}: pyarrow could not parse {path} ({e}); "
+                           f"falling back to pandas")
+
+    text_columns = {col: 'string' for col, dtype in dtypes.items() if dtype in ('str', 'category')}
+    df = pd.read_csv(path, dtype=text_columns)
+    for col, dtype in dtypes.items():
+        if dtype == 'percent' and col in df.columns:
+            df[col] = pd.to_numeric(_strip_percent(df[col]), errors='coerce')
+    return df
+
+
+def read_source(path, dtypes=None, table=None):
+    """Read a source CSV, from its Parquet cache when the file is unchanged
+
+    The first read parses the CSV and caches the typed result, so later
+    specs on the same source and re-runs skip CSV parsing entirely.
+    Parquet sources are already typed and are read directly.
+    """
+    if is_parquet(path):
+        return read_parquet(path)
+
+    cache_path = source_cache_path(path, dtypes)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            return read_parquet(cache_path)
+        except Exception:
+            pass  # unreadable cache - parse the CSV again
+
+    df = parse_csv(path, dtypes, table)
+    if cache_path:
+        _write_source_cache(df, cache_path)
+    return df
+
+
+def cache_source(path, dtypes=None, table=None):
+    """Make sure a source's Parquet cache exists; returns its path or None"""
+    if is_parquet(path):
+        return path
+    cache_path = source_cache_path(path, dtypes)
+    if cache_path and not os.path.exists(cache_path):
+        if not _write_source_cache(parse_csv(path, dtypes, table), cache_path):
+            return None
+    return cache_path
+
+
+def read_source_chunks(path, chunksize=CSV_CHUNK_ROWS, dtypes=None):
+    """Read a source as an iterator of DataFrames of `chunksize` rows
+
+    Batches come from a Parquet source, or from the Parquet cache when it is
+    current, else from the CSV.
+    """
+    cache_path = path if is_parquet(path) else source_cache_path(path, dtypes)
+    if cache_path and os.path.exists(cache_path):
+        import pyarrow.parquet as pq
+        return (batch.to_pandas(date_as_object=False) for batch in
+                pq.ParquetFile(cache_path).iter_batches(batch_size=chunksize))
+
+    text_columns = {col: 'string' for col, dtype in (dtypes or {}).items() if dtype in ('str', 'category')}
+    return pd.read_csv(path, chunksize=chunksize, dtype=text_columns)
+
+
+def prepare_table(spec, df):
+    """Apply a TableSpec's mapping, cleaning rules and dtypes to raw source rows"""
+    if spec.strip_whitespace:
+        df = df.rename(columns=lambda col: col.strip())
+        for col in df.select_dtypes(include=['object', 'string']).columns:
+            df[col] = df[col].str.strip()
+
+    if spec.column_mapping:
+        df = df.rename(columns=spec.column_mapping)
+
+    if spec.transform is not None:
+        df = spec.transform(df)
+
+    missing = [col for col in spec.required_columns if col not in df.columns]
+    if missing:
+        raise KeyError(f"{spec.name}: source is missing columns {missing}")
+
+    schema = {col: dtype for col, dtype in spec.columns.items() if col in df.columns}
+    data = apply_schema(df, schema)
+
+    if spec.fill_numeric is not None:
+        numeric = [col for col, dtype in schema.items() if dtype in ('int', 'float', 'percent')]
+        data[numeric] = data[numeric].fillna(spec.fill_numeric)
+
+    for col, value in spec.fill_values.items():
+        if col in data.columns:
+            series = data[col]
+            if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                series = series.cat.add_categories([value])
+            data[col] = series.fillna(value)
+
+    return data
+
+
+def iter_prepared(spec, source=None, chunksize=CSV_CHUNK_ROWS, timings=None, dtypes=None):
+    """Yield prepared chunks of a spec's source, holding one chunk at a time
+
+    `dtypes` overrides spec.source_dtypes for reading, as in prepare_source.
+
+    For specs with unique_rows (LOKASI) rows whose conflict key appeared in an
+    earlier chunk are dropped, so only the keys are remembered across chunks.
+    Time spent reading and preparing is added to timings['parse_seconds']
+    and timings['convert_seconds'] when a dict is given.
+    """
+    seen = set()
+    key = list(spec.conflict_key)
+    timings = {} if timings is None else timings
+    timings.setdefault('parse_seconds', 0.0)
+    timings.setdefault('convert_seconds', 0.0)
+
+    chunks = read_source_chunks(source or spec.source, chunksize, dtypes or spec.source_dtypes)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        parsed = time.perf_counter()
+        timings['parse_seconds'] += parsed - start
+        if chunk is None:
+            return
+
+        data = prepare_table(spec, chunk)
+
+        if spec.unique_rows:
+            keys = pd.MultiIndex.from_frame(data[key])
+            fresh = ~keys.isin(seen)
+            data = data[fresh]
+            seen.update(keys[fresh])
+        timings['convert_seconds'] += time.perf_counter() - parsed
+
+        yield data
+
+
+def resolve_strategy(conn, spec, strategy=None):
+    """Pick the load strategy for a spec
+
+    'upsert' needs a conflict key; 'swap' is not possible for tables that
+    others reference (LOKASI), which are merged or reloaded in place instead.
+    """
+    strategy = strategy or spec.load_strategy
+    if strategy == 'swap' and not can_swap(conn, spec.name):
+        strategy = 'upsert'
+    if strategy == 'upsert' and not spec.conflict_key:
+        # No natural key to merge on - reload the whole table instead
+        return 'replace'
+    return strategy
+
+
+def load_prepared(conn, spec, data, strategy=None):
+    """Load rows already run through prepare_table with the resolved strategy"""
+    strategy = resolve_strategy(conn, spec, strategy)
+
+    if strategy == 'replace':
+        stats = load_table(conn, spec.name, data)
+    elif strategy == 'append':
+        stats = load_table(conn, spec.name, data, replace=False)
+    elif strategy == 'upsert':
+        stats = upsert_table(conn, spec.name, data, spec.conflict_key)
+    elif strategy == 'swap':
+        stats = swap_table(conn, spec.name, data)
+    else:
+        raise ValueError(f"Unknown load strategy '{strategy}' for {spec.name}")
+
+    stats['strategy'] = strategy
+    return stats
+
+
+# =====================================================
+# IMPORT MANIFEST AND CHECKPOINTS
+# =====================================================
+
+# Last successful load per table; see IMPORT_MANIFEST in supabase_schema.sql
+MANIFEST_TABLE = 'import_manifest'
+
+# Progress of checkpointed (--resume) loads; see IMPORT_CHECKPOINT in supabase_schema.sql
+CHECKPOINT_TABLE = 'import_checkpoint'
+
+# Secondary indexes dropped by a bulk load until they are rebuilt; see IMPORT_PENDING_INDEX
+PENDING_INDEX_TABLE = 'import_pending_index'
+
+# Strategies that can commit batch by batch ('swap' loads a shadow table in one go)
+CHECKPOINT_STRATEGIES = ('replace', 'append', 'upsert')
+
+# Schema the bookkeeping tables are created from, so their DDL lives in one place
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'supabase_schema.sql')
+
+BOOKKEEPING_TABLES = (MANIFEST_TABLE, CHECKPOINT_TABLE, PENDING_INDEX_TABLE)
+
+
+def bookkeeping_ddl(table_name, schema_file=SCHEMA_FILE):
+    """The table's CREATE TABLE statement from supabase_schema.sql"""
+    with open(schema_file) as f:
+        sql = f.read()
+    match = re.search(rf"CREATE TABLE IF NOT EXISTS {table_name.upper()} \(.*?\n\);", sql, re.S)
+    if match is None:
+        raise KeyError(f"{table_name.upper()} not found in {schema_file}")
+    return match.group(0)
+
+
+def ensure_bookkeeping(conn):
+    """Create the import bookkeeping tables on databases set up before them"""
+    with conn.cursor() as cur:
+        for table_name in BOOKKEEPING_TABLES:
+            cur.execute("SELECT to_regclass(%s)", (table_name,))
+            if cur.fetchone()[0] is None:
+                cur.execute(bookkeeping_ddl(table_name))
+    conn.commit()
+
+
+def manifest_hash(conn, table_name):
+    """Source hash of the table's last successful load (None if not recorded)"""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT source_hash FROM {MANIFEST_TABLE} WHERE table_name = %s",
+                    (table_name,))
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def _forget_referencing(cur, table_name):
+    """Drop manifest and checkpoint entries of tables whose rows a delete from table_name cascades into"""
+    for bookkeeping in (MANIFEST_TABLE, CHECKPOINT_TABLE):
+        cur.execute(f"""
+            DELETE FROM {bookkeeping}
+            WHERE upper(table_name) IN (
+                SELECT upper(c.relname)
+                FROM pg_constraint con
+                JOIN pg_class c ON c.oid = con.conrelid
+                WHERE con.contype = 'f' AND con.confrelid = %s::regclass
+                  AND con.conrelid <> con.confrelid
+            )
+        """, (table_name.lower(),))
+
+
+def record_load(conn, spec, source, digest, stats):
+    """Record a successful load of spec.name from source in the manifest
+
+    Clears the table's checkpoint. A 'replace' load deletes from the table,
+    which cascades into the tables referencing it (LOKASI -> everything
+    else); their entries are dropped so they are reloaded next time
+    instead of being skipped or resumed.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO {MANIFEST_TABLE}
+                    (table_name, source_file, source_hash, row_count, load_strategy, load_seconds, loaded_at)
+                VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    source_file = EXCLUDED.source_file,
+                    source_hash = EXCLUDED.source_hash,
+                    row_count = EXCLUDED.row_count,
+                    load_strategy = EXCLUDED.load_strategy,
+                    load_seconds = EXCLUDED.load_seconds,
+                    loaded_at = EXCLUDED.loaded_at
+            """, (spec.name, source, digest, stats.get('total_rows', stats['rows']),
+                  stats['strategy'], stats['seconds']))
+            cur.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = %s", (spec.name,))
+            if stats['strategy'] == 'replace':
+                _forget_referencing(cur, spec.name)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def skipped_stats(spec, digest):
+    """Stats entry for a table left alone because its source is unchanged"""
+    stats = _load_stats(spec.name, 0, 0.0, 0)
+    stats.update({'strategy': 'skip', 'skipped': True, 'source_hash': digest,
+                  'parse_seconds': None, 'convert_seconds': None, 'write_seconds': 0.0,
+                  'index_seconds': 0.0})
+    return stats
+
+
+def get_checkpoint(conn, table_name, digest):
+    """(rows, batches) already committed from the source with this hash, or None"""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT rows_done, batches_done FROM {CHECKPOINT_TABLE} "
+                    f"WHERE table_name = %s AND source_hash = %s", (table_name, digest))
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def checkpointed_load(conn, spec, data, source, digest, strategy=None, resume=False):
+    """Load prepared rows batch by batch, committing each with a checkpoint
+
+    Every batch is committed in the same transaction as the checkpoint row
+    recording how many prepared rows of this source are in the table, so
+    after a dropped connection a resumed run skips exactly those rows. A
+    fresh start empties the table ('replace') together with the first
+    batch and forgets the table's previous manifest entry.
+
+    `data` is a prepared DataFrame or an iterable of prepared chunks.
+    Returns load stats plus resumed_rows (rows skipped as already loaded),
+    total_rows and batches.
+    """
+    strategy = resolve_strategy(conn, spec, strategy)
+    if strategy not in CHECKPOINT_STRATEGIES:
+        raise ValueError(f"'{strategy}' loads of {spec.name} cannot be checkpointed")
+
+    start = time.perf_counter()
+    checkpoint = get_checkpoint(conn, spec.name, digest) if resume else None
+    fresh = checkpoint is None
+    position, batches = checkpoint or (0, 0)
+    to_skip = resumed_rows = position
+    rows = bytes_sent = inserted = updated = 0
+    commit_seconds = 0.0
+
+    columns, chunks = as_chunks(data)
+
+    def begin_fresh(cur):
+        if strategy == 'replace':
+            cur.execute(f"DELETE FROM {spec.name}")
+            _forget_referencing(cur, spec.name)
+        cur.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = %s", (spec.name,))
+
+    for chunk in chunks:
+        if to_skip >= len(chunk):
+            to_skip -= len(chunk)
+            continue
+        chunk, to_skip = chunk.iloc[to_skip:], 0
+
+        try:
+            with conn.cursor() as cur:
+                if fresh:
+                    begin_fresh(cur)
+
+            if strategy == 'upsert':
+                batch_rows, batch_inserted, batch_updated, batch_bytes = merge_chunks(
+                    conn, spec.name, chunk, spec.conflict_key, columns)
+                inserted += batch_inserted
+                updated += batch_updated
+            else:
+                batch_rows, batch_bytes = copy_chunks(conn, spec.name, chunk, columns)
+
+            position += len(chunk)
+            batches += 1
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    INSERT INTO {CHECKPOINT_TABLE}
+                        (table_name, source_file, source_hash, load_strategy, rows_done, batches_done, updated_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                    ON CONFLICT (table_name) DO UPDATE SET
+                        source_file = EXCLUDED.source_file,
+                        source_hash = EXCLUDED.source_hash,
+                        load_strategy = EXCLUDED.load_strategy,
+                        rows_done = EXCLUDED.rows_done,
+                        batches_done = EXCLUDED.batches_done,
+                        updated_at = EXCLUDED.updated_at
+                """, (spec.name, source, digest, strategy, position, batches))
+            commit_seconds += _commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+
+        fresh = False
+        rows += batch_rows
+        bytes_sent += batch_bytes
+
+    if fresh:
+        # Empty source: a fresh 'replace' still has to empty the table
+        try:
+            with conn.cursor() as cur:
+                begin_fresh(cur)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    stats = _load_stats(spec.name, rows, time.perf_counter() - start, bytes_sent, commit_seconds)
+    stats.update(strategy=strategy, resumed_rows=resumed_rows, total_rows=position, batches=batches)
+    if strategy == 'upsert':
+        stats.update(inserted=inserted, updated=updated, unchanged=rows - inserted - updated)
+    return stats
+
+
+# =====================================================
+# BULK MODE INDEX HANDLING
+# =====================================================
+
+# maintenance_work_mem for each index build after a bulk load
+BULK_MAINTENANCE_WORK_MEM = os.getenv('IMPORT_MAINTENANCE_WORK_MEM', '256MB')
+
+
+def get_secondary_indexes(conn, table_name):
+    """[(index, definition)] of a table's indexes that back no key or constraint
+
+    Primary keys, unique indexes (ON CONFLICT targets) and constraint
+    indexes stay in place during a bulk load.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT x.indexrelid::regclass::text, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            WHERE x.indrelid = %s::regclass
+              AND NOT x.indisprimary AND NOT x.indisunique
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+            ORDER BY 1
+        """, (table_name.lower(),))
+        return cur.fetchall()
+
+
+def drop_secondary_indexes(conn, table_name):
+    """Drop a table's secondary indexes ahead of a bulk load
+
+    Their definitions are saved in IMPORT_PENDING_INDEX in the same
+    transaction, so indexes dropped by an interrupted load are rebuilt by
+    the next one; the table's manifest entry is dropped too, so that next
+    load is not skipped. Returns the number of indexes dropped.
+    """
+    try:
+        indexes = get_secondary_indexes(conn, table_name)
+        with conn.cursor() as cur:
+            for index_name, definition in indexes:
+                cur.execute(f"""
+                    INSERT INTO {PENDING_INDEX_TABLE} (table_name, index_name, definition)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (table_name, index_name) DO UPDATE SET definition = EXCLUDED.definition
+                """, (table_name, index_name, definition))
+                cur.execute(f"DROP INDEX {index_name}")
+            if indexes:
+                cur.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = %s", (table_name,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(indexes)
+
+
+def pending_indexes(conn, table_name):
+    """[(index, definition)] dropped by a bulk load and not rebuilt yet"""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT index_name, definition FROM {PENDING_INDEX_TABLE} "
+                    f"WHERE table_name = %s ORDER BY index_name", (table_name,))
+        rows = cur.fetchall()
+    conn.commit()
+    return rows
+
+
+def _build_index(conn, table_name, index_name, definition):
+    """CREATE one pending index and clear its pending entry in one transaction"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL maintenance_work_mem = %s", (BULK_MAINTENANCE_WORK_MEM,))
+            cur.execute("SELECT to_regclass(%s)", (index_name,))
+            if cur.fetchone()[0] is None:
+                cur.execute(definition)
+            cur.execute(f"DELETE FROM {PENDING_INDEX_TABLE} WHERE table_name = %s AND index_name = %s",
+                        (table_name, index_name))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def rebuild_indexes(conn, table_name, connect=None, workers=None):
+    """Rebuild the indexes a bulk load dropped; returns how many were built
+
+    With connect() the builds run side by side on their own connections
+    (plain CREATE INDEX only takes a SHARE lock, which other builds and
+    readers share). CONCURRENTLY is not used: it scans the table twice and
+    concurrent builds wait on each other's snapshots, while nothing else
+    writes to the table during an import.
+    """
+    pending = pending_indexes(conn, table_name)
+    workers = min(workers or IMPORT_WORKERS, len(pending))
+    if connect is None or workers <= 1:
+        for index_name, definition in pending:
+            _build_index(conn, table_name, index_name, definition)
+        return len(pending)
+
+    def build(index):
+        build_conn = connect()
+        try:
+            _build_index(build_conn, table_name, *index)
+        finally:
+            build_conn.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as builders:
+        list(builders.map(build, pending))
+    return len(pending)
+
+
+def analyze_table(conn, table_name):
+    """Refresh planner statistics after a bulk load"""
+    with conn.cursor() as cur:
+        cur.execute(f"ANALYZE {table_name}")
+    conn.commit()
+
+
+def begin_bulk(conn, spec, strategy=None):
+    """Drop spec's secondary indexes if its load writes into the live table
+
+    'swap' loads already build indexes after COPY on the shadow table.
+    Returns True if the load runs in bulk mode.
+    """
+    if resolve_strategy(conn, spec, strategy) == 'swap':
+        return False
+    drop_secondary_indexes(conn, spec.name)
+    return True
+
+
+def finish_bulk(conn, spec, bulk, stats, connect=None, workers=None):
+    """Rebuild indexes dropped by this (or an interrupted) bulk load, then ANALYZE
+
+    Adds index_seconds and indexes_rebuilt to stats.
+    """
+    start = time.perf_counter()
+    rebuilt = rebuild_indexes(conn, spec.name, connect, workers)
+    if bulk or rebuilt:
+        analyze_table(conn, spec.name)
+    stats['indexes_rebuilt'] = rebuilt
+    stats['index_seconds'] = time.perf_counter() - start
+    return stats
+
+
+def run_import(conn, spec, df=None, source=None, strategy=None, chunksize=None, force=False,
+               resume=False, bulk=False, connect=None):
+    """Import one table as declared by its TableSpec
+
+    Reads spec.source (or the given source / DataFrame), prepares it and loads
+    it with the spec's load strategy, or `strategy` when given. With a
+    chunksize the source is streamed chunk by chunk straight into COPY.
+    A source file whose hash matches the table's last successful load in the
+    manifest is skipped unless force is set; DataFrames are always loaded.
+    With resume the source is committed in checkpointed batches of chunksize
+    (default CSV_CHUNK_ROWS) rows and an interrupted load of the same source
+    continues after its last committed batch.
+    With bulk the table's secondary indexes are dropped for the load and
+    rebuilt afterwards, in parallel on connections from connect() if given,
+    followed by ANALYZE.
+    Returns the load stats including the strategy used ('skip' if skipped)
+    and the parse / convert / write / commit / index timings (add_timings).
+    """
+    ensure_bookkeeping(conn)
+    if df is not None:
+        bulk = bulk and begin_bulk(conn, spec, strategy)
+        start = time.perf_counter()
+        data = prepare_table(spec, df)
+        timings = {'parse_seconds': None, 'convert_seconds': time.perf_counter() - start}
+        stats = load_prepared(conn, spec, data, strategy)
+        finish_bulk(conn, spec, bulk, stats, connect)
+        return add_timings(stats, timings)
+
+    source = source or spec.source
+    digest = file_hash(source)
+    if not force and manifest_hash(conn, spec.name) == digest:
+        return skipped_stats(spec, digest)
+
+    bulk = bulk and begin_bulk(conn, spec, strategy)
+    timings = {}
+    streamed = bool(resume or chunksize)
+    if resume:
+        data = iter_prepared(spec, source, chunksize or CSV_CHUNK_ROWS, timings)
+        stats = checkpointed_load(conn, spec, data, source, digest, strategy, resume=True)
+    elif chunksize:
+        stats = load_prepared(conn, spec, iter_prepared(spec, source, chunksize, timings), strategy)
+    else:
+        data, timings = prepare_source(spec, source)
+        stats = load_prepared(conn, spec, data, strategy)
+
+    finish_bulk(conn, spec, bulk, stats, connect)
+    record_load(conn, spec, source, digest, stats)
+    return add_timings(stats, timings, streamed)
+
+
+def forget_load(conn, spec, strategy):
+    """Drop the manifest and checkpoint entries of a table loaded without a source file
+
+    The table no longer holds what spec.source had, so the next file import
+    must not be skipped or resumed. A 'replace' cascades into the referencing
+    tables as in record_load.
+    """
+    try:
+        with conn.cursor() as cur:
+            for bookkeeping in (MANIFEST_TABLE, CHECKPOINT_TABLE):
+                cur.execute(f"DELETE FROM {bookkeeping} WHERE table_name = %s", (spec.name,))
+            if strategy == 'replace':
+                _forget_referencing(cur, spec.name)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def run_generated_import(conn, spec, chunks, strategy=None, bulk=False, connect=None):
+    """Stream DataFrame chunks produced in-process (a data generator) into spec's table
+
+    Each chunk is prepared and handed to COPY as soon as it is produced, so
+    the rows never touch a file and only one chunk is held at a time. Time
+    spent producing chunks is reported as parse_seconds. bulk and connect
+    work as in run_import.
+    """
+    ensure_bookkeeping(conn)
+    bulk = bulk and begin_bulk(conn, spec, strategy)
+    timings = {'parse_seconds': 0.0, 'convert_seconds': 0.0}
+
+    def prepared():
+        chunk_iter = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunk_iter, None)
+            produced = time.perf_counter()
+            timings['parse_seconds'] += produced - start
+            if chunk is None:
+                return
+            data = prepare_table(spec, chunk)
+            timings['convert_seconds'] += time.perf_counter() - produced
+            yield data
+
+    stats = load_prepared(conn, spec, prepared(), strategy)
+    finish_bulk(conn, spec, bulk, stats, connect)
+    forget_load(conn, spec, stats['strategy'])
+    return add_timings(stats, timings, streamed=True)
+
+
+# =====================================================
+# PARALLEL IMPORTS
+# =====================================================
+
+# Parser processes and writer connections used by run_parallel_import
+IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def prepare_source(spec, source=None, dtypes=None):
+    """Read and prepare one spec's source; runs in a worker process
+
+    `dtypes` overrides spec.source_dtypes for parsing, so specs sharing a
+    source can read the cache built with their merged dtypes.
+    Returns (data, {'parse_seconds': ..., 'convert_seconds': ...}).
+    """
+    start = time.perf_counter()
+    df = read_source(source or spec.source, dtypes or spec.source_dtypes, spec.name)
+    parsed = time.perf_counter()
+    data = prepare_table(spec, df)
+    return data, {'parse_seconds': parsed - start, 'convert_seconds': time.perf_counter() - parsed}
+
+
+def merged_source_dtypes(specs, sources=None):
+    """{source: dtypes of every spec reading it}, the one mapping its cache is keyed on"""
+    sources = sources or {}
+    merged = {}
+    for name, spec in specs.items():
+        merged.setdefault(sources.get(name) or spec.source, {}).update(spec.source_dtypes)
+    return merged
+
+
+def plan_imports(conn, specs, sources=None, strategy=None, force=False):
+    """Decide which tables need loading, using the manifest
+
+    Returns ({table: source hash}, {table: skipped stats}). A table is skipped
+    when its source hash matches its last successful load, unless force is
+    set or a table it depends on will be reloaded with 'replace' (the delete
+    cascades into it). Sources that cannot be hashed are left to the load to
+    report.
+    """
+    sources = sources or {}
+    ensure_bookkeeping(conn)
+
+    digests = {}
+    skipped = {}
+    replaced = set()
+    for name, spec in specs.items():
+        try:
+            digests[name] = file_hash(sources.get(name) or spec.source)
+        except OSError:
+            digests[name] = None
+
+        cascaded = any(dep in replaced for dep in spec.depends_on)
+        if (not force and not cascaded and digests[name]
+                and manifest_hash(conn, name) == digests[name]):
+            skipped[name] = skipped_stats(spec, digests[name])
+        elif resolve_strategy(conn, spec, strategy) == 'replace':
+            replaced.add(name)
+
+    conn.commit()
+    return digests, skipped
+
+
+def run_parallel_import(connect, specs, sources=None, workers=None, strategy=None, chunksize=None,
+                        force=False, resume=False, bulk=False):
+    """Import several tables concurrently
+
+    CSV parsing and conversion run in a process pool; writes run in a thread
+    pool where each thread keeps its own connection from connect(). A table
+    is written only after the tables in its depends_on (LOKASI) have been
+    written, but its parsing starts right away. With a chunksize each
+    writer streams its source instead, trading the parser processes for
+    bounded memory.
+
+    Tables whose source is unchanged since their last successful load are
+    skipped (see plan_imports) unless force is set. With resume every table
+    is committed in checkpointed batches and continues an interrupted load
+    (see checkpointed_load). With bulk each table's secondary indexes are
+    dropped for its load and rebuilt in parallel afterwards (see run_import).
+
+    Returns {table: stats} in spec order; failed tables get an 'error' entry,
+    unchanged ones a 'skipped' entry, and tables whose dependency failed are
+    not loaded.
+    """
+    all_specs = dict(specs)
+    sources = sources or {}
+    workers = max(1, workers or IMPORT_WORKERS)
+
+    conn = connect()
+    try:
+        digests, skipped = plan_imports(conn, all_specs, sources, strategy, force)
+    finally:
+        conn.close()
+    specs = {name: spec for name, spec in all_specs.items() if name not in skipped}
+    # Over all_specs, so skipping a table does not change a shared source's cache key
+    source_dtypes = merged_source_dtypes(all_specs, sources)
+
+    local = threading.local()
+    connections = []
+    connections_lock = threading.Lock()
+
+    def write(spec, data, timings):
+        conn = getattr(local, 'conn', None)
+        if conn is None or conn.closed:
+            conn = local.conn = connect()
+            with connections_lock:
+                connections.append(conn)
+        source = sources.get(spec.name) or spec.source
+        timings = dict(timings or {})
+        streamed = data is None
+        if streamed:
+            data = iter_prepared(spec, source, chunksize, timings, source_dtypes[source])
+        in_bulk = bulk and begin_bulk(conn, spec, strategy)
+        if resume and digests[spec.name]:
+            stats = checkpointed_load(conn, spec, data, source, digests[spec.name], strategy, resume=True)
+        else:
+            stats = load_prepared(conn, spec, data, strategy)
+        finish_bulk(conn, spec, in_bulk, stats, connect, workers)
+        if digests[spec.name]:
+            record_load(conn, spec, source, digests[spec.name], stats)
+        return add_timings(stats, timings, streamed)
+
+    results = dict(skipped)
+    parsed = {}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as parsers, \
+                ThreadPoolExecutor(max_workers=workers) as writers:
+            if chunksize:
+                # Parsed while writing, inside the writer thread
+                parsed = {name: (None, None) for name in specs}
+                running = {}
+            else:
+                # A source shared by several specs (LOKASI and STATISTIK_HARIAN) is
+                # parsed once into its cache before their preparation starts
+                by_source = {}
+                for name, spec in specs.items():
+                    by_source.setdefault(sources.get(name) or spec.source, []).append(name)
+
+                running = {}
+                for source, names in by_source.items():
+                    if len(names) > 1 and SOURCE_CACHE_DIR:
+                        task = parsers.submit(cache_source, source, source_dtypes[source], ', '.join(names))
+                        running[task] = ('cache', source)
+                    else:
+                        for name in names:
+                            task = parsers.submit(prepare_source, specs[name], source, source_dtypes[source])
+                            running[task] = ('parse', name)
+
+            while running or parsed:
+                done, _ = wait(running, return_when=FIRST_COMPLETED) if running else (set(), set())
+
+                for future in done:
+                    stage, name = running.pop(future)
+                    if stage == 'cache':
+                        # On failure each spec simply parses the CSV itself
+                        for spec_name in by_source[name]:
+                            task = parsers.submit(prepare_source, specs[spec_name], name, source_dtypes[name])
+                            running[task] = ('parse', spec_name)
+                        continue
+                    try:
+                        if stage == 'parse':
+                            parsed[name] = future.result()
+                        else:
+                            results[name] = future.result()
+                    except Exception as e:
+                        results[name] = {'table': name, 'error': str(e)}
+
+                # Start every parsed table whose dependencies are settled
+                for name in list(parsed):
+                    deps = [dep for dep in specs[name].depends_on if dep in all_specs]
+                    failed = [dep for dep in deps if 'error' in results.get(dep, {})]
+                    if failed:
+                        parsed.pop(name)
+                        results[name] = {'table': name, 'error': f"skipped, {failed[0]} failed"}
+                    elif all(dep in results for dep in deps):
+                        data, timings = parsed.pop(name)
+                        future = writers.submit(write, specs[name], data, timings)
+                        running[future] = ('write', name)
+    finally:
+        for conn in connections:
+            conn.close()
+
+    return {name: results[name] for name in all_specs if name in results}
+
+
+def summary_lines(results, wall_seconds=None):
+    """Per-table timing summary for run_import / run_parallel_import results"""
+    def seconds(value):
+        return '-' if value is None else f"{value:.2f}s"
+
+    lines = [f"{'TABLE':22} {'ROWS':>10} {'PARSE':>8} {'CONVERT':>8} {'WRITE':>8} {'COMMIT':>8} "
+             f"{'INDEX':>8} {'ROWS/S':>10}  STRATEGY"]
+    for name, stats in results.items():
+        if 'error' in stats:
+            lines.append(f"{name:22} FAILED: {stats['error']}")
+            continue
+        if stats.get('skipped'):
+            lines.append(f"{name:22} {'-':>10} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>10}  "
+                         f"skip (source unchanged)")
+            continue
+        lines.append(f"{name:22} {stats['rows']:>10,} {seconds(stats['parse_seconds']):>8} "
+                     f"{seconds(stats['convert_seconds']):>8} {seconds(stats['write_seconds']):>8} "
+                     f"{seconds(stats['commit_seconds']):>8} {seconds(stats.get('index_seconds')):>8} "
+                     f"{stats['rows_per_sec']:>10,.0f}  {stats['strategy']}")
+    if wall_seconds is not None:
+        lines.append(f"{'WALL CLOCK':22} {wall_seconds:>56.2f}s")
+    return lines
+
+
+# =====================================================
+# INSTRUMENTATION
+# =====================================================
+
+# Default JSON-lines file for --metrics
+METRICS_FILE = 'import_metrics.jsonl'
+
+# Stats copied into each metrics record, in this order
+METRIC_FIELDS = ('table', 'strategy', 'method', 'rows', 'bytes', 'parse_seconds', 'prepare_seconds',
+                 'convert_seconds', 'write_seconds', 'commit_seconds', 'index_seconds', 'seconds',
+                 'rows_per_sec',
+                 'inserted', 'updated', 'unchanged', 'resumed_rows', 'indexes_rebuilt', 'error')
+
+
+def add_timings(stats, timings, streamed=False):
+    """Split a load into parse, convert, write and commit time
+
+    `timings` has the source's parse_seconds and convert_seconds. Streamed
+    sources are parsed while COPY pulls rows, inside stats['seconds'], so
+    that time is taken out of write_seconds, which is left with the
+    network/server time of the load itself.
+    """
+    parse = timings.get('parse_seconds')
+    convert = timings.get('convert_seconds')
+    write = stats['seconds'] - stats.get('commit_seconds', 0.0)
+    if streamed:
+        write -= (parse or 0.0) + (convert or 0.0)
+
+    stats['parse_seconds'] = parse
+    stats['convert_seconds'] = convert
+    stats['write_seconds'] = max(write, 0.0)
+    return stats
+
+
+def metrics_record(stats, **extra):
+    """One JSON-serializable metrics record for a table's stats"""
+    record = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+    record.update(extra)
+    for field in METRIC_FIELDS:
+        if field not in stats:
+            continue
+        value = stats[field]
+        if isinstance(value, float):
+            value = round(value, 4) if value != float('inf') else None
+        record[field] = value
+    return record
+
+
+def write_metrics(results, path=METRICS_FILE, **extra):
+    """Append one JSON line per stats entry to path
+
+    `results` is a {table: stats} dict or a list of stats. Keyword
+    arguments (mode, workers, ...) are added to every record.
+    """
+    entries = results.values() if isinstance(results, dict) else results
+    with open(path, 'a') as f:
+        for stats in entries:
+            f.write(json.dumps(metrics_record(stats, **extra)) + '\n')
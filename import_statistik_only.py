@@ -1,12 +1,20 @@
 """
 Import only STATISTIK_HARIAN data
 """
-import pandas as pd
-import numpy as np
+import argparse
 from supabase_config_standalone import get_db_connection
-from tqdm import tqdm
+from import_engine import CSV_CHUNK_ROWS, METRICS_FILE, run_import, write_metrics
+from table_specs import STATISTIK_HARIAN
 
-def import_statistik_harian():
+def connect():
+    """Open a database connection for an index rebuild worker"""
+    conn = get_db_connection()
+    if not conn:
+        raise ConnectionError("Could not connect to the database")
+    return conn
+
+def import_statistik_harian(strategy=None, chunksize=None, force=False, resume=False, bulk=False,
+                            metrics=None):
     """Import daily statistics data"""
     print("Importing STATISTIK_HARIAN data...")
     
@@ -15,118 +23,30 @@ def import_statistik_harian():
         return False
     
     try:
-        # Read the enhanced CSV file
-        df = pd.read_csv('covid_19_indonesia_enhanced.csv')
-        
-        # Strip whitespace from column names and data
-        df.columns = df.columns.str.strip()
-        df = df.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-        
-        # Map column names from CSV to database columns
-        column_mapping = {
-            'Date': 'tanggal',
-            'Location ISO Code': 'iso_code',
-            'New Cases': 'kasus_baru',
-            'New Deaths': 'kematian_baru', 
-            'New Recovered': 'sembuh_baru',
-            'Total Cases': 'total_kasus',
-            'Total Deaths': 'total_kematian',
-            'Total Recovered': 'total_sembuh',
-            'Total Active Cases': 'total_aktif',
-            'New Cases per Million': 'kasus_baru_per_juta',
-            'Total Cases per Million': 'total_kasus_per_juta',
-            'New Deaths per Million': 'kematian_baru_per_juta',
-            'Total Deaths per Million': 'total_kematian_per_juta',
-            'Case Fatality Rate': 'case_fatality_rate',
-            'Case Recovered Rate': 'case_recovered_rate',
-            'Growth Factor of New Cases': 'growth_factor_cases',
-            'Growth Factor of New Deaths': 'growth_factor_deaths'
-        }
-        
-        # Rename columns
-        df = df.rename(columns=column_mapping)
-        
-        # Prepare data
-        df['tanggal'] = pd.to_datetime(df['tanggal'])
-        
-        # Clean all numeric columns - remove % signs and convert empty strings to NaN
-        for col in df.columns:
-            if col in ['iso_code', 'tanggal']:  # Skip non-numeric columns
-                continue
-            
-            # Convert to string, clean, then to numeric
-            df[col] = df[col].astype(str)
-            df[col] = df[col].str.replace('%', '')  # Remove % signs
-            df[col] = df[col].replace(['', 'nan', 'NaN', 'None'], np.nan)  # Replace empty/invalid with NaN
-            df[col] = pd.to_numeric(df[col], errors='coerce')  # Convert to numeric
-        
-        # Fill NaN values with appropriate defaults
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        df[numeric_columns] = df[numeric_columns].fillna(0)
-        
-        # Fill categorical columns
-        if 'age_group_risk' in df.columns:
-            df['age_group_risk'] = df['age_group_risk'].fillna('Medium')
-        
-        cursor = conn.cursor()
-        
-        # Clear existing data
-        cursor.execute("DELETE FROM STATISTIK_HARIAN")
-        print("Cleared existing STATISTIK_HARIAN data")
-        
-        # Prepare insert query with available columns
-        available_columns = [
-            'iso_code', 'tanggal', 'kasus_baru', 'kematian_baru', 'sembuh_baru',
-            'total_kasus', 'total_kematian', 'total_sembuh', 'total_aktif',
-            'kasus_baru_per_juta', 'total_kasus_per_juta', 'kematian_baru_per_juta',
-            'total_kematian_per_juta', 'case_fatality_rate', 'case_recovered_rate',
-            'growth_factor_cases', 'growth_factor_deaths'
-        ]
-        
-        # Add enhanced columns if they exist
-        enhanced_columns = [
-            'temperature_avg', 'humidity_avg', 'air_quality_index', 'rainfall_mm',
-            'unemployment_rate', 'poverty_rate', 'education_index', 'internet_penetration',
-            'hospital_beds_per_1000', 'doctors_per_1000', 'nurses_per_1000',
-            'ventilators_available', 'public_transport_usage', 'private_vehicle_density',
-            'flight_frequency', 'median_age', 'elderly_population_pct', 'urban_population_pct'
-        ]
-        
-        for col in enhanced_columns:
-            if col in df.columns:
-                available_columns.append(col)
-        
-        print(f"Using columns: {available_columns}")
-        
-        placeholders = ', '.join(['%s'] * len(available_columns))
-        insert_query = f"""
-        INSERT INTO STATISTIK_HARIAN ({', '.join(available_columns)})
-        VALUES ({placeholders})
-        """
-        
-        # Insert data in batches
-        batch_size = 1000
-        total_rows = len(df)
-        
-        print(f"Importing {total_rows} records in batches of {batch_size}...")
-        
-        for i in tqdm(range(0, total_rows, batch_size), desc="Importing batches"):
-            batch = df.iloc[i:i+batch_size]
-            
-            for _, row in batch.iterrows():
-                values = []
-                for col in available_columns:
-                    if col in row and pd.notna(row[col]):
-                        values.append(row[col])
-                    else:
-                        values.append(None)
-                
-                cursor.execute(insert_query, values)
-            
-            conn.commit()
-            print(f"Committed batch {i//batch_size + 1}")
-        
-        print(f"SUCCESS: Successfully imported {total_rows} daily statistics records")
+        # Mapping, '%' cleanup, dtypes and defaults are declared in table_specs.py
+        if chunksize:
+            print(f"Streaming {STATISTIK_HARIAN.source} to COPY in chunks of {chunksize:,} rows...")
+        else:
+            print(f"Importing {STATISTIK_HARIAN.source} with COPY...")
+        stats = run_import(conn, STATISTIK_HARIAN, strategy=strategy, chunksize=chunksize,
+                           force=force, resume=resume, bulk=bulk, connect=connect)
+        if stats.get('skipped'):
+            print(f"SKIPPED: {STATISTIK_HARIAN.source} unchanged since the last import (use --force to reload)")
+            return True
+        
+        print(f"SUCCESS: Successfully imported {stats['rows']} daily statistics records "
+              f"in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/s, "
+              f"{stats['bytes'] / 1e6:.1f} MB sent)")
+        if stats['strategy'] == 'upsert':
+            print(f"   {stats['inserted']:,} inserted, {stats['updated']:,} updated, "
+                  f"{stats['unchanged']:,} unchanged")
+        if stats.get('resumed_rows'):
+            print(f"   resumed after {stats['resumed_rows']:,} rows committed by an earlier run")
+        if stats.get('indexes_rebuilt'):
+            print(f"   rebuilt {stats['indexes_rebuilt']} indexes in {stats['index_seconds']:.1f}s")
+        if metrics:
+            write_metrics([stats], metrics, mode=strategy or 'default')
+            print(f"Metrics appended to {metrics}")
         return True
         
     except Exception as e:
@@ -140,4 +60,26 @@ def import_statistik_harian():
             conn.close()
 
 if __name__ == "__main__":
-    import_statistik_harian()
+    parser = argparse.ArgumentParser(description="Import STATISTIK_HARIAN only")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help="upsert on (iso_code, tanggal) instead of reloading the table")
+    mode.add_argument('--swap', action='store_true',
+                      help="reload into a shadow copy and swap it in by rename")
+    parser.add_argument('--chunksize', type=int, nargs='?', const=CSV_CHUNK_ROWS, default=None,
+                        help=f"stream the CSV in chunks of this many rows (default {CSV_CHUNK_ROWS}) "
+                             f"to keep memory flat")
+    parser.add_argument('--force', action='store_true',
+                        help="reload even if the source file is unchanged since the last import")
+    parser.add_argument('--resume', action='store_true',
+                        help="commit in checkpointed batches and continue an interrupted import "
+                             "of the same source file where it stopped")
+    parser.add_argument('--bulk', action='store_true',
+                        help="drop secondary indexes while loading, then rebuild them in parallel and ANALYZE")
+    parser.add_argument('--metrics', nargs='?', const=METRICS_FILE, default=None, metavar='PATH',
+                        help=f"append per-table timings as JSON lines (default {METRICS_FILE})")
+    args = parser.parse_args()
+    if args.resume and args.swap:
+        parser.error("--resume commits batch by batch and cannot be combined with --swap")
+    import_statistik_harian('upsert' if args.incremental else 'swap' if args.swap else None,
+                            args.chunksize, args.force, args.resume, args.bulk, args.metrics)
@@ -20,9 +20,12 @@ from supabase_config import (
     supabase_config, 
     display_connection_status,
     check_table_exists,
-    get_db_connection
+    db_connection
 )
 
+# Seconds to wait for the first health check before each rerun while it is pending
+HEALTH_POLL_SECONDS = 1
+
 # Page configuration
 st.set_page_config(
     page_title=supabase_config.app_title,
@@ -229,85 +232,107 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=supabase_config.cache_ttl)  # Cache with configured TTL
-def load_all_data():
-    """Load data from all tables using Supabase"""
-    conn = get_db_connection()
-    if not conn:
-        return {}
-    
+# Dataset registry - each dataset is loaded and cached on its own, the first
+# time a page that declares it (see requires_datasets) is opened
+CORE_DATASETS = {
+    'latest_stats': "SELECT * FROM latest_statistics ORDER BY nama_provinsi",
+    'national_stats': "SELECT * FROM national_daily_stats ORDER BY tanggal",
+    'daily_stats': """
+        SELECT 
+            s.*,
+            l.nama_provinsi,
+            l.island,
+            l.populasi,
+            l.population_density
+        FROM STATISTIK_HARIAN s
+        JOIN LOKASI l ON s.iso_code = l.iso_code
+        ORDER BY s.tanggal, l.nama_provinsi
+    """
+}
+
+# Additional tables and aggregated views - missing ones degrade to an empty frame
+ADDITIONAL_DATASETS = {
+    'rumah_sakit': """
+        SELECT rs.*, l.nama_provinsi 
+        FROM RUMAH_SAKIT rs 
+        JOIN LOKASI l ON rs.iso_code = l.iso_code
+    """,
+    'vaksinasi': """
+        SELECT vd.*, l.nama_provinsi 
+        FROM VAKSINASI_DETAIL vd 
+        JOIN LOKASI l ON vd.iso_code = l.iso_code
+        ORDER BY vd.tanggal DESC
+    """,
+    'kebijakan': """
+        SELECT kp.*, l.nama_provinsi 
+        FROM KEBIJAKAN_PEMERINTAH kp 
+        JOIN LOKASI l ON kp.iso_code = l.iso_code
+        ORDER BY kp.tanggal_mulai DESC
+    """,
+    'kapasitas_kesehatan': "SELECT * FROM kapasitas_kesehatan_provinsi",
+    'vaksinasi_terkini': "SELECT * FROM vaksinasi_terkini"
+}
+
+DATASETS = {**CORE_DATASETS, **ADDITIONAL_DATASETS}
+
+# Tables backing the optional dashboards (used to build the menu)
+ADDITIONAL_TABLES = ['RUMAH_SAKIT', 'VAKSINASI_DETAIL', 'KEBIJAKAN_PEMERINTAH']
+
+def requires_datasets(*names):
+    """Declare the datasets a dashboard page needs"""
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        raise KeyError(f"Unknown dataset(s): {', '.join(unknown)}")
+    
+    def decorator(func):
+        func.datasets = names
+        return func
+    return decorator
+
+@st.cache_data(ttl=supabase_config.cache_ttl, show_spinner=False)  # Cache with configured TTL
+def load_dataset(name):
+    """Load a single registered dataset (errors are raised, so they are not cached)"""
+    # Checkout errors propagate to load_datasets, which reports them once
+    with db_connection(raise_errors=True) as conn:
+        return pd.read_sql(DATASETS[name], conn)
+
+def load_datasets(names):
+    """Load the given datasets; returns None if a core dataset fails"""
+    data = {}
+    
+    for name in names:
+        try:
+            data[name] = load_dataset(name)
+        except Exception as e:
+            if name in CORE_DATASETS:
+                st.error(f"Error loading data: {e}")
+                return None
+            st.warning(f"Dataset '{name}' not available: {e}")
+            data[name] = pd.DataFrame()
+    
+    return data
+
+# Short ttl like the sidebar table status, so freshly imported tables unlock the full menu quickly
+@st.cache_data(ttl=60, show_spinner=False)
+def check_additional_data():
+    """Check whether any additional table has rows without loading them"""
     try:
-        data = {}
-        
-        # Original core data
-        data['latest_stats'] = pd.read_sql("SELECT * FROM latest_statistics ORDER BY nama_provinsi", conn)
-        data['national_stats'] = pd.read_sql("SELECT * FROM national_daily_stats ORDER BY tanggal", conn)
-        
-        # Daily statistics for detailed analysis
-        data['daily_stats'] = pd.read_sql("""
-            SELECT 
-                s.*,
-                l.nama_provinsi,
-                l.island,
-                l.populasi,
-                l.population_density
-            FROM STATISTIK_HARIAN s
-            JOIN LOKASI l ON s.iso_code = l.iso_code
-            ORDER BY s.tanggal, l.nama_provinsi
-        """, conn)
-        
-        # Data from additional tables (with error handling)
-        # Load additional tables (only tables that are actually used)
-        additional_tables = {
-            'rumah_sakit': """
-                SELECT rs.*, l.nama_provinsi 
-                FROM RUMAH_SAKIT rs 
-                JOIN LOKASI l ON rs.iso_code = l.iso_code
-            """,
-            'vaksinasi': """
-                SELECT vd.*, l.nama_provinsi 
-                FROM VAKSINASI_DETAIL vd 
-                JOIN LOKASI l ON vd.iso_code = l.iso_code
-                ORDER BY vd.tanggal DESC
-            """,
-            'kebijakan': """
-                SELECT kp.*, l.nama_provinsi 
-                FROM KEBIJAKAN_PEMERINTAH kp 
-                JOIN LOKASI l ON kp.iso_code = l.iso_code
-                ORDER BY kp.tanggal_mulai DESC
-            """
-        }
-        
-        # Load additional tables with error handling
-        for table_name, query in additional_tables.items():
-            try:
-                data[table_name] = pd.read_sql(query, conn)
-            except Exception as e:
-                st.warning(f"Table '{table_name}' not available: {e}")
-                data[table_name] = pd.DataFrame()
-        
-        # Load aggregated views (with error handling)
-        additional_views = {
-            'kapasitas_kesehatan': "SELECT * FROM kapasitas_kesehatan_provinsi",
-            'vaksinasi_terkini': "SELECT * FROM vaksinasi_terkini"
-        }
-        
-        for view_name, query in additional_views.items():
-            try:
-                data[view_name] = pd.read_sql(query, conn)
-            except Exception as e:
-                st.warning(f"View '{view_name}' not available: {e}")
-                data[view_name] = pd.DataFrame()
-        
-        return data
-    
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return {}
-    finally:
-        if conn:
-            conn.close()
+        # Quiet on a failed checkout; load_datasets reports it for the page
+        with db_connection(raise_errors=True) as conn:
+            for table in ADDITIONAL_TABLES:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+                        if cur.fetchone()[0]:
+                            return True
+                except Exception:
+                    conn.rollback()
+    except Exception:
+        pass
+    
+    return False
 
+@requires_datasets('national_stats', 'kapasitas_kesehatan', 'vaksinasi')
 def create_unified_kpi_dashboard(data):
     """Create comprehensive KPI dashboard"""
     st.markdown('<div class="section-header">📊 Dashboard KPI Terpadu</div>', unsafe_allow_html=True)
@@ -648,6 +673,7 @@ def create_provincial_comparison(latest_stats, daily_stats):
     
     st.plotly_chart(fig, use_container_width=True)
 
+@requires_datasets('latest_stats', 'national_stats')
 def create_original_visualizations(data):
     """Create original dashboard visualizations"""
     st.markdown('<div class="section-header">🗺️ Visualisasi Geospasial & Tren</div>', unsafe_allow_html=True)
@@ -766,6 +792,7 @@ def create_original_visualizations(data):
         
         st.plotly_chart(fig, use_container_width=True)
 
+@requires_datasets('rumah_sakit', 'latest_stats')
 def create_healthcare_dashboard(data):
     """Create healthcare capacity dashboard"""
     st.markdown('<div class="section-header">🏥 Dashboard Kapasitas Sistem Kesehatan</div>', unsafe_allow_html=True)
@@ -841,6 +868,7 @@ def create_healthcare_dashboard(data):
             )
             st.plotly_chart(fig, use_container_width=True)
 
+@requires_datasets('vaksinasi')
 def create_vaccination_dashboard(data):
     """Create vaccination analytics dashboard"""
     st.markdown('<div class="section-header">💉 Dashboard Analitik Vaksinasi</div>', unsafe_allow_html=True)
@@ -931,6 +959,7 @@ def create_vaccination_dashboard(data):
         )
         st.plotly_chart(fig, use_container_width=True)
 
+@requires_datasets('kebijakan')
 def create_policy_dashboard(data):
     """Create policy impact analysis dashboard"""
     st.markdown('<div class="section-header">📋 Dashboard Dampak Kebijakan</div>', unsafe_allow_html=True)
@@ -991,6 +1020,7 @@ def create_policy_dashboard(data):
         fig.update_layout(xaxis_tickangle=45)
         st.plotly_chart(fig, use_container_width=True)
 
+@requires_datasets('daily_stats', 'rumah_sakit')
 def create_provincial_analysis(data):
     """Create detailed provincial analysis"""
     st.markdown('<div class="section-header">🔍 Analisis Detail Provinsi</div>', unsafe_allow_html=True)
@@ -1097,6 +1127,16 @@ def create_provincial_analysis(data):
                 with col4:
                     st.metric("Ventilators", f"{province_rs['ventilator_count'].sum():,}")
 
+# Sidebar menu entry -> page function
+PAGES = {
+    "🏠 KPI Terpadu": create_unified_kpi_dashboard,
+    "🗺️ Geospasial & Tren": create_original_visualizations,
+    "🔍 Analisis Provinsi": create_provincial_analysis,
+    "🏥 Kapasitas Kesehatan": create_healthcare_dashboard,
+    "💉 Analitik Vaksinasi": create_vaccination_dashboard,
+    "📋 Dampak Kebijakan": create_policy_dashboard
+}
+
 def main():
     """Main comprehensive application"""
     # Header
@@ -1112,8 +1152,16 @@ def main():
     # Display connection status in sidebar (commented out for cleaner UI)
     # connection_ok = display_connection_status()
     
-    # Test connection silently without displaying in sidebar
-    connection_ok, _ = supabase_config.test_connection()
+    # Read the cached health check silently (no round trip on widget reruns)
+    connection_ok = supabase_config.is_healthy()
+    
+    if not connection_ok and not supabase_config.health_checked():
+        # First check still running (slow or unreachable database); wait for it in
+        # bounded steps behind a placeholder instead of rerunning in a tight loop
+        placeholder = st.empty()
+        placeholder.info("⏳ Memeriksa koneksi database (checking…)")
+        supabase_config.health_checked(timeout=HEALTH_POLL_SECONDS)
+        st.rerun()
     
     if not connection_ok:
         st.error("❌ Tidak dapat terhubung ke database Supabase")
@@ -1140,26 +1188,8 @@ def main():
             """)
         return
     
-    # Load all data
-    with st.spinner("Memuat semua data dari database..."):
-        data = load_all_data()
-    
-    if not data or len(data) == 0:
-        st.error("Gagal memuat data. Pastikan database sudah disetup.")
-        st.info("Jalankan script berikut untuk setup:")
-        st.code("""
-# Setup database
-python supabase_data_import.py
-
-# Setup enhanced tables (optional)
-python generate_enhanced_dummy_data.py
-python import_enhanced_data.py
-        """)
-        return
-    
-    # Check data availability
-    has_original = 'latest_stats' in data and len(data['latest_stats']) > 0
-    has_additional_data = any(len(data.get(table, [])) > 0 for table in ['rumah_sakit', 'vaksinasi', 'kebijakan'])
+    # Check data availability (cheap existence check, no table is loaded here)
+    has_additional_data = check_additional_data()
     
     if has_additional_data:
         st.markdown("""
@@ -1190,25 +1220,27 @@ python import_enhanced_data.py
         ])
     
     page = st.sidebar.selectbox("Pilih Dashboard:", menu_options)
+    page_func = PAGES[page]
+    
+    # Load only the datasets the selected dashboard declares
+    with st.spinner("Memuat data dashboard..."):
+        data = load_datasets(page_func.datasets)
+    
+    if data is None:
+        st.error("Gagal memuat data. Pastikan database sudah disetup.")
+        st.info("Jalankan script berikut untuk setup:")
+        st.code("""
+# Setup database
+python supabase_data_import.py
+
+# Setup enhanced tables (optional)
+python generate_enhanced_dummy_data.py
+python import_enhanced_data.py
+        """)
+        return
     
     # Display selected dashboard
-    if page == "🏠 KPI Terpadu":
-        create_unified_kpi_dashboard(data)
-        
-    elif page == "🗺️ Geospasial & Tren":
-        create_original_visualizations(data)
-        
-    elif page == "🔍 Analisis Provinsi":
-        create_provincial_analysis(data)
-        
-    elif page == "🏥 Kapasitas Kesehatan" and has_additional_data:
-        create_healthcare_dashboard(data)
-        
-    elif page == "💉 Analitik Vaksinasi" and has_additional_data:
-        create_vaccination_dashboard(data)
-        
-    elif page == "📋 Dampak Kebijakan" and has_additional_data:
-        create_policy_dashboard(data)
+    page_func(data)
     
     # Footer
     st.markdown("---")
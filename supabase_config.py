@@ -3,16 +3,260 @@ Supabase Configuration Module for COVID-19 Indonesia Dashboard
 """
 
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
 import streamlit as st
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import pandas as pd
-from typing import Optional, Tuple
+from typing import Callable, Iterator, Optional, Tuple
 
 # Load environment variables
 load_dotenv()
 
+class ConnectionPool:
+    """Bounded, thread-safe pool of PostgreSQL connections
+
+    Connections are opened lazily up to ``max_size``. On checkout a
+    connection is discarded if it is closed, left mid-transaction, older
+    than ``max_age`` seconds, or fails a ``SELECT 1`` ping after sitting
+    idle longer than ``health_check_interval`` seconds.
+    """
+
+    def __init__(self, connect: Callable[[], extensions.connection],
+                 min_size: int = 1, max_size: int = 10, max_age: float = 1800,
+                 health_check_interval: float = 30, timeout: float = 10):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, last_used) - LIFO keeps hot connections warm
+        self._created_at = {}  # conn -> monotonic creation time
+        self._size = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                self._size -= 1
+                break
+            self._idle.append((conn, time.monotonic()))
+
+    def _open(self) -> extensions.connection:
+        conn = self._connect()
+        self._created_at[conn] = time.monotonic()
+        return conn
+
+    def _is_expired(self, conn) -> bool:
+        return time.monotonic() - self._created_at.get(conn, 0) > self.max_age
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        """Health-check a connection taken from the idle list"""
+        if conn.closed or self._is_expired(conn):
+            return False
+        if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - last_used > self.health_check_interval:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                return False
+        return True
+
+    def _discard(self, conn):
+        self._created_at.pop(conn, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def getconn(self) -> extensions.connection:
+        """Check out a connection, waiting up to ``timeout`` seconds"""
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(f"connection pool exhausted ({self.max_size} connections in use)")
+                    self._cond.wait(remaining)
+                    continue
+
+            if conn is None:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            # Ping outside the lock so other sessions are not blocked on the round trip
+            if self._is_healthy(conn, last_used):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn: extensions.connection, discard: bool = False):
+        """Return a connection; any uncommitted work is rolled back"""
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._closed or conn.closed or self._is_expired(conn):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[extensions.connection]:
+        """Context manager that checks a connection out and returns it"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except Exception:
+            self.putconn(conn, discard=bool(conn.closed))
+            raise
+        else:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close idle connections; checked-out ones are closed on return"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage for display"""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+            }
+
+class HealthMonitor:
+    """Process-wide database health check running in a background thread
+
+    The check runs every ``interval`` seconds while healthy. After a
+    failure it is retried with exponential backoff (starting at
+    ``min_backoff`` and capped at ``max_backoff``). Readers only see the
+    cached result, so they never pay for a round trip.
+    """
+
+    def __init__(self, check: Callable[[], Tuple[bool, str]], interval: float = 30,
+                 min_backoff: float = 2, max_backoff: float = 300):
+        self._check = check
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._first_check = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._healthy = False
+        self._message = "Health check has not run yet"
+        self._last_checked: Optional[float] = None
+        self._failures = 0
+
+    def start(self):
+        """Start the background thread (idempotent)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-health-monitor", daemon=True)
+                self._thread.start()
+
+    def _next_delay(self) -> float:
+        if self._failures == 0:
+            return self.interval
+        return min(self.max_backoff, self.min_backoff * 2 ** (self._failures - 1))
+
+    def _run(self):
+        while True:
+            # Cleared before the check, so a refresh() that arrives while it runs
+            # makes the wait below return at once instead of being lost
+            self._wake.clear()
+            try:
+                healthy, message = self._check()
+            except Exception as e:
+                healthy, message = False, f"Health check failed: {e}"
+
+            with self._lock:
+                self._healthy = healthy
+                self._message = message
+                self._last_checked = time.time()
+                self._failures = 0 if healthy else self._failures + 1
+                delay = self._next_delay()
+            self._first_check.set()
+
+            self._wake.wait(delay)
+
+    def refresh(self):
+        """Ask the background thread to check again right away"""
+        self._wake.set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first check has completed (only slow once per process)"""
+        self.start()
+        return self._first_check.wait(timeout)
+
+    def has_checked(self) -> bool:
+        """Whether the first check has completed"""
+        return self._first_check.is_set()
+
+    def is_healthy(self) -> bool:
+        """Cached health result; never touches the database"""
+        with self._lock:
+            return self._healthy
+
+    def status(self) -> dict:
+        """Cached health details for display"""
+        with self._lock:
+            return {
+                "healthy": self._healthy,
+                "message": self._message,
+                "last_checked": self._last_checked,
+                "consecutive_failures": self._failures,
+                "next_check_in": self._next_delay(),
+            }
+
 class SupabaseConfig:
     """Supabase configuration and connection management"""
     
@@ -36,6 +280,21 @@ class SupabaseConfig:
         self.cache_ttl = int(os.getenv('CACHE_TTL', '3600'))
         self.debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
         
+        # Connection pool configuration (shared by all Streamlit sessions in this process)
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.pool_max_age = int(os.getenv('DB_POOL_MAX_AGE', '1800'))
+        self.pool_health_check_interval = int(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        
+        # Background health check configuration
+        self.health_check_interval = int(os.getenv('HEALTH_CHECK_INTERVAL', '30'))
+        self.health_check_max_backoff = int(os.getenv('HEALTH_CHECK_MAX_BACKOFF', '300'))
+        self.health_check_first_wait = float(os.getenv('HEALTH_CHECK_FIRST_WAIT', '2'))
+        self._health_monitor: Optional[HealthMonitor] = None
+        
     def validate_config(self) -> bool:
         """Validate that all required configuration is present"""
         required_fields = [
@@ -66,48 +325,115 @@ class SupabaseConfig:
             st.error(f"Failed to create Supabase client: {e}")
             return None
     
-    def get_db_connection(self) -> Optional[psycopg2.extensions.connection]:
-        """Create direct PostgreSQL connection to Supabase"""
+    def _connect(self) -> psycopg2.extensions.connection:
+        """Open a new PostgreSQL connection to Supabase (raises on failure)"""
+        if self.database_url:
+            # Use connection string if available
+            return psycopg2.connect(self.database_url)
+        
+        # Use individual parameters
+        return psycopg2.connect(
+            host=self.db_host,
+            database=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            port=self.db_port,
+            sslmode='require'  # Supabase requires SSL
+        )
+    
+    def get_pool(self) -> ConnectionPool:
+        """Get the process-wide connection pool, creating it on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self._connect,
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        max_age=self.pool_max_age,
+                        health_check_interval=self.pool_health_check_interval,
+                        timeout=self.pool_timeout
+                    )
+        return self._pool
+    
+    @contextmanager
+    def connection(self, raise_errors: bool = False) -> Iterator[Optional[psycopg2.extensions.connection]]:
+        """Borrow a pooled connection; yields None if none can be obtained
+
+        With ``raise_errors`` a failed checkout raises instead, without
+        showing an error, so the caller reports it once.
+        """
         try:
-            if self.database_url:
-                # Use connection string if available
-                conn = psycopg2.connect(self.database_url)
-            else:
-                # Use individual parameters
-                conn = psycopg2.connect(
-                    host=self.db_host,
-                    database=self.db_name,
-                    user=self.db_user,
-                    password=self.db_password,
-                    port=self.db_port,
-                    sslmode='require'  # Supabase requires SSL
-                )
-            
-            return conn
+            pool = self.get_pool()
+            conn = pool.getconn()
         except Exception as e:
+            if raise_errors:
+                raise
             st.error(f"Database connection error: {e}")
             if self.debug_mode:
                 st.exception(e)
-            return None
+            yield None
+            return
+        
+        try:
+            yield conn
+        except Exception:
+            pool.putconn(conn, discard=bool(conn.closed))
+            raise
+        else:
+            pool.putconn(conn)
+    
+    def close_pool(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
     
     def test_connection(self) -> Tuple[bool, str]:
-        """Test database connection"""
+        """Test database connection (one round trip; safe to call off the script thread)"""
         try:
-            conn = self.get_db_connection()
-            if not conn:
-                return False, "Failed to establish connection"
+            with self.get_pool().connection() as conn:
+                # Test query
+                with conn.cursor() as cur:
+                    cur.execute("SELECT version();")
+                    version = cur.fetchone()[0]
             
-            # Test query
-            with conn.cursor() as cur:
-                cur.execute("SELECT version();")
-                version = cur.fetchone()[0]
-            
-            conn.close()
             return True, f"Connection successful. PostgreSQL version: {version}"
             
         except Exception as e:
             return False, f"Connection test failed: {str(e)}"
     
+    def get_health_monitor(self) -> HealthMonitor:
+        """Get the process-wide health monitor, starting it on first use"""
+        if self._health_monitor is None:
+            with self._pool_lock:
+                if self._health_monitor is None:
+                    self._health_monitor = HealthMonitor(
+                        self.test_connection,
+                        interval=self.health_check_interval,
+                        max_backoff=self.health_check_max_backoff
+                    )
+        self._health_monitor.start()
+        return self._health_monitor
+    
+    def is_healthy(self) -> bool:
+        """Cached database health; only calls before the first check wait, briefly
+
+        Returns False while the first check is still running (e.g. against an
+        unreachable database); use health_checked() to tell the two apart.
+        """
+        monitor = self.get_health_monitor()
+        monitor.wait_ready(timeout=self.health_check_first_wait)
+        return monitor.is_healthy()
+    
+    def health_checked(self, timeout: float = 0) -> bool:
+        """Whether the background health check has completed at least once
+
+        Waits up to ``timeout`` seconds for the first check to finish.
+        """
+        return self.get_health_monitor().wait_ready(timeout)
+    
     def get_connection_info(self) -> dict:
         """Get connection information for display"""
         return {
@@ -117,15 +443,16 @@ class SupabaseConfig:
             "Database User": self.db_user,
             "Database Port": self.db_port,
             "Cache TTL": f"{self.cache_ttl} seconds",
+            "Connection Pool": f"{self.pool_min_size}-{self.pool_max_size} connections",
             "Debug Mode": self.debug_mode
         }
 
 # Global configuration instance
 supabase_config = SupabaseConfig()
 
-def get_db_connection():
-    """Get database connection - compatible with existing code"""
-    return supabase_config.get_db_connection()
+def db_connection(raise_errors: bool = False):
+    """Borrow a connection from the shared pool (context manager)"""
+    return supabase_config.connection(raise_errors)
 
 def get_supabase_client(use_service_role: bool = False):
     """Get Supabase client"""
@@ -138,148 +465,201 @@ def load_data_cached():
 
 def load_data():
     """Load data from Supabase database"""
-    conn = get_db_connection()
-    if not conn:
-        return None, None, None
-    
-    try:
-        # Load latest statistics
-        latest_stats_query = """
-        SELECT * FROM latest_statistics
-        ORDER BY nama_provinsi
-        """
-        latest_stats = pd.read_sql(latest_stats_query, conn)
+    with db_connection() as conn:
+        if not conn:
+            return None, None, None
         
-        # Load daily statistics
-        daily_stats_query = """
-        SELECT 
-            s.*,
-            l.nama_provinsi,
-            l.island,
-            l.populasi,
-            l.population_density
-        FROM STATISTIK_HARIAN s
-        JOIN LOKASI l ON s.iso_code = l.iso_code
-        ORDER BY s.tanggal, l.nama_provinsi
-        """
-        daily_stats = pd.read_sql(daily_stats_query, conn)
-        
-        # Load national daily statistics
-        national_stats_query = """
-        SELECT * FROM national_daily_stats
-        ORDER BY tanggal
-        """
-        national_stats = pd.read_sql(national_stats_query, conn)
+        try:
+            # Load latest statistics
+            latest_stats_query = """
+            SELECT * FROM latest_statistics
+            ORDER BY nama_provinsi
+            """
+            latest_stats = pd.read_sql(latest_stats_query, conn)
+            
+            # Load daily statistics
+            daily_stats_query = """
+            SELECT 
+                s.*,
+                l.nama_provinsi,
+                l.island,
+                l.populasi,
+                l.population_density
+            FROM STATISTIK_HARIAN s
+            JOIN LOKASI l ON s.iso_code = l.iso_code
+            ORDER BY s.tanggal, l.nama_provinsi
+            """
+            daily_stats = pd.read_sql(daily_stats_query, conn)
+            
+            # Load national daily statistics
+            national_stats_query = """
+            SELECT * FROM national_daily_stats
+            ORDER BY tanggal
+            """
+            national_stats = pd.read_sql(national_stats_query, conn)
+            
+            return latest_stats, daily_stats, national_stats
         
-        return latest_stats, daily_stats, national_stats
-    
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        if supabase_config.debug_mode:
-            st.exception(e)
-        return None, None, None
-    finally:
-        if conn:
-            conn.close()
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            if supabase_config.debug_mode:
+                st.exception(e)
+            return None, None, None
 
 def load_enhanced_data():
     """Load enhanced data from additional tables"""
-    conn = get_db_connection()
-    if not conn:
-        return {}
-    
-    try:
-        enhanced_data = {}
-        
-        # Load healthcare capacity
-        healthcare_query = "SELECT * FROM kapasitas_kesehatan_provinsi"
-        enhanced_data['healthcare'] = pd.read_sql(healthcare_query, conn)
-        
-        # Load vaccination data
-        vaccination_query = "SELECT * FROM vaksinasi_terkini"
-        enhanced_data['vaccination'] = pd.read_sql(vaccination_query, conn)
-        
-        # Load active clusters
-        cluster_query = "SELECT * FROM cluster_aktif"
-        enhanced_data['clusters'] = pd.read_sql(cluster_query, conn)
-        
-        # Load economic impact
-        economic_query = "SELECT * FROM dampak_ekonomi_terkini"
-        enhanced_data['economic'] = pd.read_sql(economic_query, conn)
+    with db_connection() as conn:
+        if not conn:
+            return {}
         
-        # Load hospital data
-        hospital_query = "SELECT * FROM RUMAH_SAKIT WHERE operational_status = 'Aktif'"
-        enhanced_data['hospitals'] = pd.read_sql(hospital_query, conn)
-        
-        # Load testing labs
-        labs_query = "SELECT * FROM TESTING_LABS"
-        enhanced_data['labs'] = pd.read_sql(labs_query, conn)
-        
-        # Load policies
-        policies_query = """
-        SELECT * FROM KEBIJAKAN_PEMERINTAH 
-        WHERE status_kebijakan = 'Aktif' 
-        ORDER BY tanggal_mulai DESC
-        """
-        enhanced_data['policies'] = pd.read_sql(policies_query, conn)
+        try:
+            enhanced_data = {}
+            
+            # Load healthcare capacity
+            healthcare_query = "SELECT * FROM kapasitas_kesehatan_provinsi"
+            enhanced_data['healthcare'] = pd.read_sql(healthcare_query, conn)
+            
+            # Load vaccination data
+            vaccination_query = "SELECT * FROM vaksinasi_terkini"
+            enhanced_data['vaccination'] = pd.read_sql(vaccination_query, conn)
+            
+            # Load active clusters
+            cluster_query = "SELECT * FROM cluster_aktif"
+            enhanced_data['clusters'] = pd.read_sql(cluster_query, conn)
+            
+            # Load economic impact
+            economic_query = "SELECT * FROM dampak_ekonomi_terkini"
+            enhanced_data['economic'] = pd.read_sql(economic_query, conn)
+            
+            # Load hospital data
+            hospital_query = "SELECT * FROM RUMAH_SAKIT WHERE operational_status = 'Aktif'"
+            enhanced_data['hospitals'] = pd.read_sql(hospital_query, conn)
+            
+            # Load testing labs
+            labs_query = "SELECT * FROM TESTING_LABS"
+            enhanced_data['labs'] = pd.read_sql(labs_query, conn)
+            
+            # Load policies
+            policies_query = """
+            SELECT * FROM KEBIJAKAN_PEMERINTAH 
+            WHERE status_kebijakan = 'Aktif' 
+            ORDER BY tanggal_mulai DESC
+            """
+            enhanced_data['policies'] = pd.read_sql(policies_query, conn)
+            
+            # Load mobility data (last 30 days)
+            mobility_query = """
+            SELECT * FROM MOBILITAS_HARIAN 
+            WHERE tanggal >= CURRENT_DATE - INTERVAL '30 days'
+            ORDER BY tanggal DESC
+            """
+            enhanced_data['mobility'] = pd.read_sql(mobility_query, conn)
+            
+            return enhanced_data
         
-        # Load mobility data (last 30 days)
-        mobility_query = """
-        SELECT * FROM MOBILITAS_HARIAN 
-        WHERE tanggal >= CURRENT_DATE - INTERVAL '30 days'
-        ORDER BY tanggal DESC
-        """
-        enhanced_data['mobility'] = pd.read_sql(mobility_query, conn)
+        except Exception as e:
+            st.error(f"Error loading enhanced data: {e}")
+            if supabase_config.debug_mode:
+                st.exception(e)
+            return {}
+
+# Tables defined in supabase_schema.sql
+MAIN_TABLES = ['LOKASI', 'STATISTIK_HARIAN']
+ENHANCED_TABLES = [
+    'RUMAH_SAKIT', 'VAKSINASI_DETAIL', 'KEBIJAKAN_PEMERINTAH',
+    'EKONOMI_REGIONAL', 'TESTING_LABS', 'CLUSTER_PENULARAN', 'MOBILITAS_HARIAN'
+]
+ALL_TABLES = MAIN_TABLES + ENHANCED_TABLES
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_table_status(tables: Tuple[str, ...] = tuple(ALL_TABLES)) -> dict:
+    """Existence and estimated row count for every table in one catalog query
+
+    Estimates are the larger of pg_stat_user_tables.n_live_tup and
+    pg_class.reltuples, so no table is scanned. n_live_tup is 0 rather
+    than NULL until the stats of a freshly COPYed table are flushed, and
+    reltuples is -1 until the table is first analyzed.
+    """
+    with db_connection() as conn:
+        if not conn:
+            return {}
         
-        return enhanced_data
-    
-    except Exception as e:
-        st.error(f"Error loading enhanced data: {e}")
-        if supabase_config.debug_mode:
-            st.exception(e)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT
+                        t.table_name,
+                        c.oid IS NOT NULL AS table_exists,
+                        GREATEST(COALESCE(s.n_live_tup, 0), c.reltuples, 0)::bigint AS estimated_rows
+                    FROM unnest(%s::text[]) AS t(table_name)
+                    LEFT JOIN pg_class c ON c.oid = to_regclass(lower(t.table_name))
+                    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                """, (list(tables),))
+                return {
+                    name: {"exists": exists, "rows": rows if exists else 0}
+                    for name, exists, rows in cur.fetchall()
+                }
+        except Exception as e:
+            if supabase_config.debug_mode:
+                st.error(f"Error reading table status: {e}")
+            return {}
+
+@st.cache_data(ttl=supabase_config.cache_ttl, show_spinner=False)
+def get_exact_row_counts(tables: Tuple[str, ...]) -> dict:
+    """Exact COUNT(*) for existing tables in a single round trip (opt-in, cached)"""
+    if not tables:
         return {}
-    finally:
-        if conn:
-            conn.close()
+    
+    with db_connection() as conn:
+        if not conn:
+            return {}
+        
+        try:
+            query = " UNION ALL ".join(
+                f"SELECT '{table}', COUNT(*) FROM {table}" for table in tables
+            )
+            with conn.cursor() as cur:
+                cur.execute(query)
+                return dict(cur.fetchall())
+        except Exception as e:
+            if supabase_config.debug_mode:
+                st.error(f"Error counting rows: {e}")
+            return {}
 
 def check_table_exists(table_name: str) -> bool:
     """Check if a table exists in the database"""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = %s
-                );
-            """, (table_name,))
-            return cur.fetchone()[0]
-    except Exception as e:
-        if supabase_config.debug_mode:
-            st.error(f"Error checking table {table_name}: {e}")
-        return False
-    finally:
-        conn.close()
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_name = %s
+                    );
+                """, (table_name,))
+                return cur.fetchone()[0]
+        except Exception as e:
+            if supabase_config.debug_mode:
+                st.error(f"Error checking table {table_name}: {e}")
+            return False
 
 def get_table_row_count(table_name: str) -> int:
     """Get row count for a table"""
-    conn = get_db_connection()
-    if not conn:
-        return 0
-    
-    try:
-        with conn.cursor() as cur:
-            cur.execute(f"SELECT COUNT(*) FROM {table_name};")
-            return cur.fetchone()[0]
-    except Exception as e:
-        if supabase_config.debug_mode:
-            st.error(f"Error counting rows in {table_name}: {e}")
-        return 0
-    finally:
-        conn.close()
+    with db_connection() as conn:
+        if not conn:
+            return 0
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM {table_name};")
+                return cur.fetchone()[0]
+        except Exception as e:
+            if supabase_config.debug_mode:
+                st.error(f"Error counting rows in {table_name}: {e}")
+            return 0
 
 def display_connection_status():
     """Display connection status in Streamlit sidebar"""
@@ -289,8 +669,13 @@ def display_connection_status():
         st.sidebar.error("❌ Configuration Invalid")
         return False
     
-    # Test connection
-    success, message = supabase_config.test_connection()
+    # Cached result from the background health monitor
+    success = supabase_config.is_healthy()
+    message = supabase_config.get_health_monitor().status()["message"]
+    
+    if not success and not supabase_config.health_checked():
+        st.sidebar.info("⏳ Checking connection…")
+        return False
     
     if success:
         st.sidebar.success("✅ Connected to Supabase")
@@ -302,26 +687,27 @@ def display_connection_status():
                 if key not in ["Database User", "Database Password"]:  # Hide sensitive info
                     st.write(f"**{key}:** {value}")
         
-        # Show table status
+        # Show table status (one catalog query; exact counts are opt-in)
         with st.sidebar.expander("Database Status"):
-            main_tables = ['LOKASI', 'STATISTIK_HARIAN']
-            enhanced_tables = ['RUMAH_SAKIT', 'VAKSINASI_DETAIL', 'KEBIJAKAN_PEMERINTAH']
+            status = get_table_status(tuple(ALL_TABLES))
+            exact = st.checkbox("Exact row counts", value=False, key="exact_row_counts")
             
-            st.write("**Main Tables:**")
-            for table in main_tables:
-                if check_table_exists(table.lower()):
-                    count = get_table_row_count(table)
-                    st.write(f"✅ {table}: {count:,} rows")
-                else:
-                    st.write(f"❌ {table}: Not found")
+            counts = {}
+            if exact:
+                existing = tuple(t for t in ALL_TABLES if status.get(t, {}).get("exists"))
+                counts = get_exact_row_counts(existing)
             
-            st.write("**Enhanced Tables:**")
-            for table in enhanced_tables:
-                if check_table_exists(table.lower()):
-                    count = get_table_row_count(table)
-                    st.write(f"✅ {table}: {count:,} rows")
-                else:
-                    st.write(f"❌ {table}: Not found")
+            for label, tables in [("Main Tables", MAIN_TABLES), ("Enhanced Tables", ENHANCED_TABLES)]:
+                st.write(f"**{label}:**")
+                for table in tables:
+                    info = status.get(table)
+                    if info and info["exists"]:
+                        if table in counts:
+                            st.write(f"✅ {table}: {counts[table]:,} rows")
+                        else:
+                            st.write(f"✅ {table}: ~{info['rows']:,} rows")
+                    else:
+                        st.write(f"❌ {table}: Not found")
         
         return True
     else:
@@ -7,12 +7,22 @@ import numpy as np
 from datetime import datetime, timedelta
 import sys
 import os
-from tqdm import tqdm
+import argparse
+import time
 import warnings
+import psycopg2
+from psycopg2.extensions import parse_dsn
 warnings.filterwarnings('ignore')
 
 # Import Supabase configuration (standalone version)
 from supabase_config_standalone import supabase_config, get_db_connection
+from import_engine import (CSV_CHUNK_ROWS, IMPORT_WORKERS, METRICS_FILE, run_import, run_parallel_import,
+                           summary_lines, write_metrics)
+from import_benchmark import (BENCHMARK_DSN, BENCHMARK_REPORT, benchmark_lines, run_benchmark,
+                              write_benchmark_report)
+from view_benchmark import (HISTORY_DAYS, VIEW_BENCHMARK_REPORT, run_view_benchmark, view_benchmark_lines,
+                            write_view_benchmark_report)
+from table_specs import MAIN_SPECS, ENHANCED_SPECS, SYNTHETIC_MAIN_SPECS
 
 def validate_environment():
     """Validate environment configuration"""
@@ -40,277 +50,87 @@ def check_file_exists(filename):
     print(f"SUCCESS: Found file: {filename}")
     return True
 
-def import_lokasi_data():
-    """Import location data"""
-    print("\nImporting LOKASI data...")
-    
-    conn = get_db_connection()
-    if not conn:
-        return False
-    
-    try:
-        # Read the enhanced CSV file
-        df = pd.read_csv('covid_19_indonesia_enhanced.csv')
-        
-        # Strip whitespace from column names and data
-        df.columns = df.columns.str.strip()
-        df = df.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-        
-        # Map column names from CSV to database columns
-        column_mapping = {
-            'Location ISO Code': 'iso_code',
-            'Province': 'nama_provinsi', 
-            'Population': 'populasi',
-            'Area (km2)': 'luas_wilayah',
-            'Latitude': 'latitude',
-            'Longitude': 'longitude',
-            'Island': 'island',
-            'Population Density': 'population_density'
-        }
-        
-        # Rename columns
-        df_renamed = df.rename(columns=column_mapping)
-        
-        # Get unique locations with renamed columns
-        lokasi_data = df_renamed[['iso_code', 'nama_provinsi', 'populasi', 'luas_wilayah', 
-                                 'latitude', 'longitude', 'island', 'population_density']].drop_duplicates()
-        
-        # Add additional location fields with default values
-        lokasi_data['area_km2'] = lokasi_data['luas_wilayah']
-        
-        # Use existing data from CSV if available, otherwise use random
-        if 'Total Regencies' in df.columns:
-            lokasi_data['total_regencies'] = df_renamed.groupby('iso_code')['Total Regencies'].first()
-        else:
-            lokasi_data['total_regencies'] = np.random.randint(5, 30, len(lokasi_data))
-            
-        if 'Total Cities' in df.columns:
-            lokasi_data['total_cities'] = df_renamed.groupby('iso_code')['Total Cities'].first()
-        else:
-            lokasi_data['total_cities'] = np.random.randint(1, 10, len(lokasi_data))
-            
-        # Fill other fields
-        lokasi_data['total_districts'] = np.random.randint(50, 500, len(lokasi_data))
-        lokasi_data['total_urban_villages'] = np.random.randint(100, 1000, len(lokasi_data))
-        lokasi_data['total_rural_villages'] = np.random.randint(200, 2000, len(lokasi_data))
-        lokasi_data['time_zone'] = 'WIB'  # Default timezone
-        lokasi_data['special_status'] = None
-        
-        # Clean data
-        lokasi_data = lokasi_data.fillna(0)
-        
-        # Insert data
-        cursor = conn.cursor()
-        
-        # Clear existing data
-        cursor.execute("DELETE FROM LOKASI")
-        
-        insert_query = """
-        INSERT INTO LOKASI (
-            iso_code, nama_provinsi, populasi, luas_wilayah, latitude, longitude,
-            island, population_density, area_km2, total_regencies, total_cities,
-            total_districts, total_urban_villages, total_rural_villages, time_zone, special_status
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        for _, row in tqdm(lokasi_data.iterrows(), total=len(lokasi_data), desc="Importing locations"):
-            cursor.execute(insert_query, tuple(row))
-        
-        conn.commit()
-        print(f"SUCCESS: Successfully imported {len(lokasi_data)} location records")
-        return True
-        
-    except Exception as e:
-        print(f"ERROR: Error importing LOKASI data: {e}")
-        conn.rollback()
-        return False
-    finally:
-        if conn:
-            conn.close()
+def report_stats(stats):
+    """Print the outcome of one table load"""
+    if stats.get('skipped'):
+        print(f"SKIPPED: {stats['table']} source unchanged since the last import (use --force to reload)")
+        return
+    print(f"SUCCESS: Successfully imported {stats['rows']:,} records to {stats['table']} "
+          f"in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/s)")
+    if stats['strategy'] == 'upsert':
+        print(f"   {stats['inserted']:,} inserted, {stats['updated']:,} updated, "
+              f"{stats['unchanged']:,} unchanged")
+    if stats.get('resumed_rows'):
+        print(f"   resumed after {stats['resumed_rows']:,} rows committed by an earlier run")
+    if stats.get('indexes_rebuilt'):
+        print(f"   rebuilt {stats['indexes_rebuilt']} indexes in {stats['index_seconds']:.1f}s")
 
-def import_statistik_harian_data():
-    """Import daily statistics data"""
-    print("\nImporting STATISTIK_HARIAN data...")
-    
+def connect():
+    """Open a database connection for an import worker"""
     conn = get_db_connection()
     if not conn:
-        return False
+        raise ConnectionError("Could not connect to the database")
+    return conn
+
+def import_spec(spec, conn=None, strategy=None, chunksize=None, force=False, resume=False,
+                bulk=False):
+    """Import one table through its TableSpec and report throughput"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            return False
     
     try:
-        # Read the enhanced CSV file
-        df = pd.read_csv('covid_19_indonesia_enhanced.csv')
-        
-        # Strip whitespace from column names and data
-        df.columns = df.columns.str.strip()
-        df = df.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-        
-        # Map column names from CSV to database columns
-        column_mapping = {
-            'Date': 'tanggal',
-            'Location ISO Code': 'iso_code',
-            'New Cases': 'kasus_baru',
-            'New Deaths': 'kematian_baru', 
-            'New Recovered': 'sembuh_baru',
-            'Total Cases': 'total_kasus',
-            'Total Deaths': 'total_kematian',
-            'Total Recovered': 'total_sembuh',
-            'Total Active Cases': 'total_aktif',
-            'New Cases per Million': 'kasus_baru_per_juta',
-            'Total Cases per Million': 'total_kasus_per_juta',
-            'New Deaths per Million': 'kematian_baru_per_juta',
-            'Total Deaths per Million': 'total_kematian_per_juta',
-            'Case Fatality Rate': 'case_fatality_rate',
-            'Case Recovered Rate': 'case_recovered_rate',
-            'Growth Factor of New Cases': 'growth_factor_cases',
-            'Growth Factor of New Deaths': 'growth_factor_deaths'
-        }
-        
-        # Rename columns
-        df = df.rename(columns=column_mapping)
-        
-        # Prepare data
-        df['tanggal'] = pd.to_datetime(df['tanggal'])
-        
-        # Fill NaN values with appropriate defaults
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        df[numeric_columns] = df[numeric_columns].fillna(0)
-        
-        # Fill categorical columns
-        df['age_group_risk'] = df['age_group_risk'].fillna('Medium')
-        
-        cursor = conn.cursor()
-        
-        # Clear existing data
-        cursor.execute("DELETE FROM STATISTIK_HARIAN")
-        
-        # Prepare insert query with all columns
-        columns = [
-            'iso_code', 'tanggal', 'kasus_baru', 'kematian_baru', 'sembuh_baru',
-            'total_kasus', 'total_kematian', 'total_sembuh', 'total_aktif',
-            'kasus_baru_per_juta', 'total_kasus_per_juta', 'kematian_baru_per_juta',
-            'total_kematian_per_juta', 'case_fatality_rate', 'case_recovered_rate',
-            'growth_factor_cases', 'growth_factor_deaths', 'tests_conducted',
-            'positivity_rate', 'hospital_capacity', 'icu_occupancy',
-            'vaccinations_total', 'vaccinations_new', 'fully_vaccinated',
-            'vaccination_rate', 'mobility_index', 'economic_impact_score',
-            'school_closure_level', 'stringency_index', 'age_group_risk',
-            'comorbidity_rate', 'healthcare_workers_infected', 'temperature_avg',
-            'humidity_avg', 'air_quality_index', 'rainfall_mm', 'unemployment_rate',
-            'poverty_rate', 'education_index', 'internet_penetration',
-            'hospital_beds_per_1000', 'doctors_per_1000', 'nurses_per_1000',
-            'ventilators_available', 'public_transport_usage', 'private_vehicle_density',
-            'flight_frequency', 'median_age', 'elderly_population_pct', 'urban_population_pct'
-        ]
-        
-        placeholders = ', '.join(['%s'] * len(columns))
-        insert_query = f"""
-        INSERT INTO STATISTIK_HARIAN ({', '.join(columns)})
-        VALUES ({placeholders})
-        """
-        
-        # Insert data in batches
-        batch_size = 1000
-        total_rows = len(df)
-        
-        for i in tqdm(range(0, total_rows, batch_size), desc="Importing daily statistics"):
-            batch = df.iloc[i:i+batch_size]
-            
-            for _, row in batch.iterrows():
-                values = [row[col] if col in row and pd.notna(row[col]) else None for col in columns]
-                cursor.execute(insert_query, values)
-            
-            conn.commit()
-        
-        print(f"SUCCESS: Successfully imported {total_rows} daily statistics records")
+        stats = run_import(conn, spec, strategy=strategy, chunksize=chunksize, force=force,
+                           resume=resume, bulk=bulk, connect=connect)
+        report_stats(stats)
         return True
         
     except Exception as e:
-        print(f"ERROR: Error importing STATISTIK_HARIAN data: {e}")
+        print(f"ERROR: Error importing {spec.name} data: {e}")
         if supabase_config.debug_mode:
             import traceback
             traceback.print_exc()
         conn.rollback()
         return False
     finally:
-        if conn:
+        if own_conn:
             conn.close()
 
-def import_enhanced_data():
+def import_lokasi_data(strategy=None, chunksize=None, force=False, resume=False):
+    """Import location data"""
+    print("\nImporting LOKASI data...")
+    return import_spec(MAIN_SPECS['LOKASI'], strategy=strategy, chunksize=chunksize, force=force,
+                       resume=resume)
+
+def import_statistik_harian_data(strategy=None, chunksize=None, force=False, resume=False):
+    """Import daily statistics data"""
+    print("\nImporting STATISTIK_HARIAN data...")
+    return import_spec(MAIN_SPECS['STATISTIK_HARIAN'], strategy=strategy, chunksize=chunksize,
+                       force=force, resume=resume)
+
+def import_enhanced_data(strategy=None, force=False):
     """Import enhanced data from dummy_data folder"""
     print("\nImporting enhanced data...")
     
-    enhanced_tables = {
-        'RUMAH_SAKIT': 'dummy_data/rumah_sakit.csv',
-        'VAKSINASI_DETAIL': 'dummy_data/vaksinasi_detail.csv',
-        'KEBIJAKAN_PEMERINTAH': 'dummy_data/kebijakan_pemerintah.csv',
-        'EKONOMI_REGIONAL': 'dummy_data/ekonomi_regional.csv',
-        'TESTING_LABS': 'dummy_data/testing_labs.csv',
-        'CLUSTER_PENULARAN': 'dummy_data/cluster_penularan.csv',
-        'MOBILITAS_HARIAN': 'dummy_data/mobilitas_harian.csv'
-    }
-    
     conn = get_db_connection()
     if not conn:
         return False
     
     success_count = 0
     
-    for table_name, file_path in enhanced_tables.items():
-        try:
-            if not os.path.exists(file_path):
-                print(f"WARNING: File not found: {file_path}, skipping {table_name}")
-                continue
-            
-            print(f"Importing {table_name}...")
-            
-            # Read CSV
-            df = pd.read_csv(file_path)
-            
-            # Clean data
-            df = df.fillna('')
-            
-            # Convert date columns
-            date_columns = [col for col in df.columns if 'tanggal' in col.lower() or 'date' in col.lower()]
-            for col in date_columns:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-            
-            cursor = conn.cursor()
-            
-            # Clear existing data
-            cursor.execute(f"DELETE FROM {table_name}")
-            
-            # Get column names (excluding auto-generated ID columns)
-            columns = [col for col in df.columns if not col.lower().startswith('id_')]
-            
-            if not columns:
-                print(f"WARNING: No valid columns found for {table_name}")
-                continue
-            
-            placeholders = ', '.join(['%s'] * len(columns))
-            insert_query = f"""
-            INSERT INTO {table_name} ({', '.join(columns)})
-            VALUES ({placeholders})
-            """
-            
-            # Insert data
-            for _, row in tqdm(df.iterrows(), total=len(df), desc=f"Importing {table_name}"):
-                values = [row[col] if pd.notna(row[col]) else None for col in columns]
-                cursor.execute(insert_query, values)
-            
-            conn.commit()
-            print(f"SUCCESS: Successfully imported {len(df)} records to {table_name}")
+    for table_name, spec in ENHANCED_SPECS.items():
+        if not os.path.exists(spec.source):
+            print(f"WARNING: File not found: {spec.source}, skipping {table_name}")
+            continue
+        
+        print(f"Importing {table_name}...")
+        if import_spec(spec, conn, strategy, force=force):
             success_count += 1
-            
-        except Exception as e:
-            print(f"ERROR: Error importing {table_name}: {e}")
-            if supabase_config.debug_mode:
-                import traceback
-                traceback.print_exc()
-            conn.rollback()
     
     conn.close()
-    print(f"\nSUCCESS: Successfully imported {success_count}/{len(enhanced_tables)} enhanced tables")
+    print(f"\nSUCCESS: Successfully imported {success_count}/{len(ENHANCED_SPECS)} enhanced tables")
     return success_count > 0
 
 def verify_import():
@@ -367,8 +187,102 @@ def verify_import():
         if conn:
             conn.close()
 
+def main_specs(synthetic=False):
+    """LOKASI and STATISTIK_HARIAN specs: from the enhanced CSV, or generated by --core"""
+    return SYNTHETIC_MAIN_SPECS if synthetic else MAIN_SPECS
+
+def run_benchmark_mode(args):
+    """Compare write methods on a local PostgreSQL stand-in instead of importing"""
+    specs = {name: spec for name, spec in {**main_specs(args.synthetic), **ENHANCED_SPECS}.items()
+             if os.path.exists(spec.source)}
+    params = parse_dsn(args.benchmark_dsn)
+    print(f"Benchmarking {len(specs)} tables on {params.get('host')}:{params.get('port')}/"
+          f"{params.get('dbname')} (execute, execute_values, COPY)...")
+    
+    results = run_benchmark(lambda: psycopg2.connect(args.benchmark_dsn), specs,
+                            max_rows=args.benchmark_rows)
+    
+    print()
+    for line in benchmark_lines(results):
+        print(line)
+    output = args.benchmark_output or BENCHMARK_REPORT
+    write_benchmark_report(results, params, output)
+    print(f"\nSUCCESS: Benchmark report saved to {output}")
+    if args.metrics:
+        write_metrics(results, args.metrics, mode='benchmark')
+        print(f"Metrics appended to {args.metrics}")
+
+def run_view_benchmark_mode(args):
+    """Time the latest-row views against growing history on a local PostgreSQL stand-in"""
+    params = parse_dsn(args.benchmark_dsn)
+    print(f"Benchmarking latest-row views on {params.get('host')}:{params.get('port')}/"
+          f"{params.get('dbname')} with {', '.join(map(str, HISTORY_DAYS))} days of history...")
+    
+    results = run_view_benchmark(lambda: psycopg2.connect(args.benchmark_dsn))
+    
+    print()
+    for line in view_benchmark_lines(results):
+        print(line)
+    output = args.benchmark_output or VIEW_BENCHMARK_REPORT
+    write_view_benchmark_report(results, params, output)
+    print(f"\nSUCCESS: View benchmark report saved to {output}")
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Import COVID-19 Indonesia data into Supabase")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help="upsert on natural keys instead of reloading every table")
+    mode.add_argument('--swap', action='store_true',
+                      help="reload each table into a shadow copy and swap it in by rename")
+    parser.add_argument('--workers', type=int, default=IMPORT_WORKERS,
+                        help=f"parser processes and writer connections (default {IMPORT_WORKERS})")
+    parser.add_argument('--chunksize', type=int, nargs='?', const=CSV_CHUNK_ROWS, default=None,
+                        help=f"stream CSVs in chunks of this many rows (default {CSV_CHUNK_ROWS}) "
+                             f"to keep memory flat")
+    parser.add_argument('--force', action='store_true',
+                        help="reload tables even if their source file is unchanged since the last import")
+    parser.add_argument('--bulk', action='store_true',
+                        help="drop secondary indexes while loading, then rebuild them in parallel and ANALYZE")
+    parser.add_argument('--resume', action='store_true',
+                        help="commit in checkpointed batches and continue an interrupted import "
+                             "of the same source files where it stopped")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="load LOKASI and STATISTIK_HARIAN from dummy_data/ "
+                             "(generate_enhanced_dummy_data.py --core) instead of the enhanced CSV")
+    parser.add_argument('--metrics', nargs='?', const=METRICS_FILE, default=None, metavar='PATH',
+                        help=f"append per-table timings as JSON lines (default {METRICS_FILE})")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="compare per-row execute, execute_values and COPY on a local PostgreSQL "
+                             "instead of importing")
+    parser.add_argument('--benchmark-views', action='store_true',
+                        help="time latest_statistics and vaksinasi_terkini against their old correlated "
+                             "MAX subqueries as history grows, on a local PostgreSQL, instead of importing")
+    parser.add_argument('--benchmark-dsn', default=BENCHMARK_DSN,
+                        help="local database for --benchmark and --benchmark-views (default BENCHMARK_DATABASE_URL or "
+                             "localhost:5432/postgres)")
+    parser.add_argument('--benchmark-rows', type=int, default=None,
+                        help="benchmark at most this many rows per table")
+    parser.add_argument('--benchmark-output', default=None,
+                        help=f"Markdown comparison table (default {BENCHMARK_REPORT}, "
+                             f"or {VIEW_BENCHMARK_REPORT} with --benchmark-views)")
+    args = parser.parse_args()
+    if args.resume and args.swap:
+        parser.error("--resume commits batch by batch and cannot be combined with --swap")
+    return args
+
 def main():
     """Main import function"""
+    args = parse_args()
+    strategy = 'upsert' if args.incremental else 'swap' if args.swap else None
+    
+    if args.benchmark:
+        run_benchmark_mode(args)
+        return
+    if args.benchmark_views:
+        run_view_benchmark_mode(args)
+        return
+    
     print("Starting Supabase Data Import for COVID-19 Indonesia Dashboard")
     print("=" * 70)
     
@@ -377,33 +291,56 @@ def main():
         sys.exit(1)
     
     # Check required files
-    required_files = ['covid_19_indonesia_enhanced.csv']
+    core_specs = main_specs(args.synthetic)
+    required_files = list(dict.fromkeys(spec.source for spec in core_specs.values()))
     for file in required_files:
         if not check_file_exists(file):
             print(f"\nERROR: Required file missing: {file}")
-            print("Please ensure you have run the data generation scripts first.")
+            if args.synthetic:
+                print("Run 'python generate_enhanced_dummy_data.py --core' to create it.")
+            else:
+                print("Please ensure you have run the data generation scripts first.")
             sys.exit(1)
     
     print("\nStarting data import process...")
     
-    # Import main data
-    success = True
-    
-    # Import LOKASI data
-    if not import_lokasi_data():
-        success = False
+    # Import every table: CSV parsing in worker processes, writes on pooled connections
+    specs = dict(core_specs)
     
-    # Import STATISTIK_HARIAN data
-    if not import_statistik_harian_data():
-        success = False
-    
-    # Import enhanced data (optional)
+    # Enhanced data is optional
     if os.path.exists('dummy_data'):
-        import_enhanced_data()
+        for table_name, spec in ENHANCED_SPECS.items():
+            if os.path.exists(spec.source):
+                specs[table_name] = spec
+            else:
+                print(f"WARNING: File not found: {spec.source}, skipping {table_name}")
     else:
         print("\nWARNING: dummy_data folder not found, skipping enhanced data import")
         print("Run 'python generate_enhanced_dummy_data.py' to create enhanced data")
     
+    workers = args.workers
+    print(f"\nImporting {len(specs)} tables with {workers} workers (LOKASI first)...")
+    start = time.perf_counter()
+    results = run_parallel_import(connect, specs, workers=workers, strategy=strategy,
+                                  chunksize=args.chunksize, force=args.force, resume=args.resume,
+                                  bulk=args.bulk)
+    wall_seconds = time.perf_counter() - start
+    
+    for table_name, stats in results.items():
+        if 'error' in stats:
+            print(f"ERROR: Error importing {table_name} data: {stats['error']}")
+        else:
+            report_stats(stats)
+    
+    print("\nTiming summary:")
+    for line in summary_lines(results, wall_seconds):
+        print(line)
+    if args.metrics:
+        write_metrics(results, args.metrics, mode=strategy or 'default', workers=workers)
+        print(f"Metrics appended to {args.metrics}")
+    
+    success = all('error' not in results.get(name, {'error': 'missing'}) for name in core_specs)
+    
     # Verify import
     if success:
         verify_import()
@@ -404,6 +404,45 @@ CREATE TABLE IF NOT EXISTS MOBILITAS_HARIAN (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- =====================================================
+-- IMPORT BOOKKEEPING
+-- =====================================================
+-- import_engine.ensure_bookkeeping membuat tabel-tabel ini dari statement di bawah
+
+-- IMPORT_MANIFEST - Sumber terakhir yang berhasil diimport per tabel
+-- Import scripts skip a table while its source file hash is unchanged (--force reloads)
+CREATE TABLE IF NOT EXISTS IMPORT_MANIFEST (
+    table_name VARCHAR(50) PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    source_hash CHAR(64) NOT NULL, -- SHA-256 of the source file content
+    row_count BIGINT,
+    load_strategy VARCHAR(20),
+    load_seconds DECIMAL(10,3),
+    loaded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- IMPORT_CHECKPOINT - Progress import --resume yang belum selesai per tabel
+-- Each batch commits together with rows_done, so an interrupted load continues after it
+CREATE TABLE IF NOT EXISTS IMPORT_CHECKPOINT (
+    table_name VARCHAR(50) PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    source_hash CHAR(64) NOT NULL, -- checkpoint only applies to this version of the source
+    load_strategy VARCHAR(20),
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    batches_done INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- IMPORT_PENDING_INDEX - Index yang di-drop selama import --bulk
+-- Saved in the same transaction as the DROP; the next import rebuilds whatever is left here
+CREATE TABLE IF NOT EXISTS IMPORT_PENDING_INDEX (
+    table_name VARCHAR(50) NOT NULL,
+    index_name TEXT NOT NULL,
+    definition TEXT NOT NULL, -- pg_get_indexdef() output
+    dropped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (table_name, index_name)
+);
+
 -- =====================================================
 -- INDEXES FOR OPTIMAL PERFORMANCE
 -- =====================================================
@@ -415,7 +454,9 @@ CREATE INDEX IF NOT EXISTS idx_lokasi_island ON LOKASI(island);
 -- Indexes untuk STATISTIK_HARIAN
 CREATE INDEX IF NOT EXISTS idx_statistik_tanggal ON STATISTIK_HARIAN(tanggal);
 CREATE INDEX IF NOT EXISTS idx_statistik_iso_code ON STATISTIK_HARIAN(iso_code);
-CREATE INDEX IF NOT EXISTS idx_statistik_iso_tanggal ON STATISTIK_HARIAN(iso_code, tanggal);
+-- Natural key (iso_code, tanggal): target of incremental upserts
+DROP INDEX IF EXISTS idx_statistik_iso_tanggal;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_statistik_iso_tanggal ON STATISTIK_HARIAN(iso_code, tanggal);
 CREATE INDEX IF NOT EXISTS idx_statistik_vaccination_rate ON STATISTIK_HARIAN(vaccination_rate);
 CREATE INDEX IF NOT EXISTS idx_statistik_positivity_rate ON STATISTIK_HARIAN(positivity_rate);
 CREATE INDEX IF NOT EXISTS idx_statistik_stringency_index ON STATISTIK_HARIAN(stringency_index);
@@ -430,7 +471,8 @@ CREATE INDEX IF NOT EXISTS idx_rumah_sakit_tipe ON RUMAH_SAKIT(tipe_rumah_sakit)
 CREATE INDEX IF NOT EXISTS idx_rumah_sakit_covid_referral ON RUMAH_SAKIT(covid_referral);
 
 -- Indexes untuk VAKSINASI_DETAIL
-CREATE INDEX IF NOT EXISTS idx_vaksinasi_iso_tanggal ON VAKSINASI_DETAIL(iso_code, tanggal);
+DROP INDEX IF EXISTS idx_vaksinasi_iso_tanggal;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_vaksinasi_iso_tanggal ON VAKSINASI_DETAIL(iso_code, tanggal);
 CREATE INDEX IF NOT EXISTS idx_vaksinasi_tanggal ON VAKSINASI_DETAIL(tanggal);
 
 -- Indexes untuk KEBIJAKAN_PEMERINTAH
@@ -439,7 +481,8 @@ CREATE INDEX IF NOT EXISTS idx_kebijakan_jenis ON KEBIJAKAN_PEMERINTAH(jenis_keb
 CREATE INDEX IF NOT EXISTS idx_kebijakan_status ON KEBIJAKAN_PEMERINTAH(status_kebijakan);
 
 -- Indexes untuk EKONOMI_REGIONAL
-CREATE INDEX IF NOT EXISTS idx_ekonomi_iso_tahun_bulan ON EKONOMI_REGIONAL(iso_code, tahun, bulan);
+DROP INDEX IF EXISTS idx_ekonomi_iso_tahun_bulan;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_ekonomi_iso_tahun_bulan ON EKONOMI_REGIONAL(iso_code, tahun, bulan);
 CREATE INDEX IF NOT EXISTS idx_ekonomi_tahun_bulan ON EKONOMI_REGIONAL(tahun, bulan);
 
 -- Indexes untuk TESTING_LABS
@@ -452,7 +495,8 @@ CREATE INDEX IF NOT EXISTS idx_cluster_jenis ON CLUSTER_PENULARAN(jenis_cluster)
 CREATE INDEX IF NOT EXISTS idx_cluster_status ON CLUSTER_PENULARAN(status_cluster);
 
 -- Indexes untuk MOBILITAS_HARIAN
-CREATE INDEX IF NOT EXISTS idx_mobilitas_iso_tanggal ON MOBILITAS_HARIAN(iso_code, tanggal);
+DROP INDEX IF EXISTS idx_mobilitas_iso_tanggal;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mobilitas_iso_tanggal ON MOBILITAS_HARIAN(iso_code, tanggal);
 CREATE INDEX IF NOT EXISTS idx_mobilitas_tanggal ON MOBILITAS_HARIAN(tanggal);
 
 -- =====================================================
@@ -460,6 +504,9 @@ CREATE INDEX IF NOT EXISTS idx_mobilitas_tanggal ON MOBILITAS_HARIAN(tanggal);
 -- =====================================================
 
 -- View: Latest statistics per province
+-- Baris terbaru diambil per provinsi lewat LATERAL ... ORDER BY tanggal DESC LIMIT 1,
+-- satu index scan mundur pada uq_statistik_iso_tanggal, sehingga biayanya per provinsi
+-- tidak tumbuh dengan panjang histori (lihat supabase_data_import.py --benchmark-views)
 CREATE OR REPLACE VIEW latest_statistics AS
 SELECT 
     l.iso_code,
@@ -498,12 +545,13 @@ SELECT
     s.elderly_population_pct,
     s.urban_population_pct
 FROM LOKASI l
-JOIN STATISTIK_HARIAN s ON l.iso_code = s.iso_code
-WHERE s.tanggal = (
-    SELECT MAX(tanggal) 
+CROSS JOIN LATERAL (
+    SELECT * 
     FROM STATISTIK_HARIAN s2 
-    WHERE s2.iso_code = s.iso_code
-);
+    WHERE s2.iso_code = l.iso_code 
+    ORDER BY s2.tanggal DESC 
+    LIMIT 1
+) s;
 
 -- View: National daily statistics
 CREATE OR REPLACE VIEW national_daily_stats AS
@@ -564,7 +612,7 @@ LEFT JOIN RUMAH_SAKIT rs ON l.iso_code = rs.iso_code
 LEFT JOIN TESTING_LABS tl ON l.iso_code = tl.iso_code
 GROUP BY l.iso_code, l.nama_provinsi;
 
--- View: Latest vaccination per province
+-- View: Latest vaccination per province (top-1 per provinsi via uq_vaksinasi_iso_tanggal)
 CREATE OR REPLACE VIEW vaksinasi_terkini AS
 SELECT 
     l.iso_code,
@@ -579,12 +627,13 @@ SELECT
     vd.vaksin_pfizer,
     vd.vaksin_moderna
 FROM LOKASI l
-JOIN VAKSINASI_DETAIL vd ON l.iso_code = vd.iso_code
-WHERE vd.tanggal = (
-    SELECT MAX(tanggal) 
+CROSS JOIN LATERAL (
+    SELECT * 
     FROM VAKSINASI_DETAIL vd2 
-    WHERE vd2.iso_code = vd.iso_code
-);
+    WHERE vd2.iso_code = l.iso_code 
+    ORDER BY vd2.tanggal DESC 
+    LIMIT 1
+) vd;
 
 -- View: Active clusters per province
 CREATE OR REPLACE VIEW cluster_aktif AS
@@ -600,7 +649,7 @@ JOIN CLUSTER_PENULARAN cp ON l.iso_code = cp.iso_code
 WHERE cp.status_cluster = 'Aktif'
 GROUP BY l.iso_code, l.nama_provinsi, cp.jenis_cluster;
 
--- View: Latest economic impact
+-- View: Latest economic impact (top-1 per provinsi via uq_ekonomi_iso_tahun_bulan)
 CREATE OR REPLACE VIEW dampak_ekonomi_terkini AS
 SELECT 
     l.iso_code,
@@ -613,14 +662,13 @@ SELECT
     er.penurunan_omzet_umkm,
     er.bantuan_sosial_milyar
 FROM LOKASI l
-JOIN EKONOMI_REGIONAL er ON l.iso_code = er.iso_code
-WHERE (er.tahun, er.bulan) = (
-    SELECT tahun, bulan 
+CROSS JOIN LATERAL (
+    SELECT * 
     FROM EKONOMI_REGIONAL er2 
-    WHERE er2.iso_code = er.iso_code 
-    ORDER BY tahun DESC, bulan DESC 
+    WHERE er2.iso_code = l.iso_code 
+    ORDER BY er2.tahun DESC, er2.bulan DESC 
     LIMIT 1
-);
+) er;
 
 -- =====================================================
 -- FUNCTIONS AND TRIGGERS
@@ -696,6 +744,9 @@ COMMENT ON TABLE EKONOMI_REGIONAL IS 'Data dampak ekonomi regional akibat COVID-
 COMMENT ON TABLE TESTING_LABS IS 'Data laboratorium testing COVID-19';
 COMMENT ON TABLE CLUSTER_PENULARAN IS 'Data cluster penularan COVID-19';
 COMMENT ON TABLE MOBILITAS_HARIAN IS 'Data mobilitas masyarakat harian';
+COMMENT ON TABLE IMPORT_MANIFEST IS 'Hash file sumber dari import terakhir yang berhasil per tabel';
+COMMENT ON TABLE IMPORT_CHECKPOINT IS 'Batch terakhir yang sudah di-commit dari import yang terputus';
+COMMENT ON TABLE IMPORT_PENDING_INDEX IS 'Definisi index yang di-drop oleh bulk import dan belum dibangun ulang';
 
 COMMENT ON VIEW latest_statistics IS 'Statistik terkini per provinsi';
 COMMENT ON VIEW national_daily_stats IS 'Statistik harian nasional';
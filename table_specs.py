@@ -0,0 +1,401 @@
+"""
+Table Specifications for COVID-19 Indonesia Dashboard Imports
+Declarative description of how every table in supabase_schema.sql is loaded
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+# Source file for LOKASI and STATISTIK_HARIAN
+ENHANCED_SOURCE = 'covid_19_indonesia_enhanced.csv'
+
+# Folder with the generated enhancement tables
+DUMMY_DATA_DIR = 'dummy_data'
+
+# A source may be stored as CSV or as Parquet (generate_enhanced_dummy_data.py --format parquet)
+SOURCE_EXTENSIONS = ('.csv', '.parquet')
+
+
+def resolve_source(path):
+    """The most recently written of path and its .csv / .parquet siblings
+
+    Returns path itself when none of them exists, so callers can report it.
+    """
+    if path is None:
+        return None
+    stem, ext = os.path.splitext(path)
+    if ext not in SOURCE_EXTENSIONS:
+        return path
+    candidates = [f"{stem}{extension}" for extension in SOURCE_EXTENSIONS]
+    existing = [candidate for candidate in candidates if os.path.exists(candidate)]
+    if not existing:
+        return path
+    return max(existing, key=lambda candidate: (os.path.getmtime(candidate), candidate == path))
+
+
+class TableSpec:
+    """How one table is read, cleaned, typed and loaded
+
+    - columns: {db_column: dtype} in insert order ('str', 'category', 'int',
+      'float', 'percent', 'bool', 'date')
+    - column_mapping: renames from source headers to db columns
+    - optional_columns: columns that are skipped when the source lacks them
+    - strip_whitespace: strip header names and string values
+    - transform: callable(df) -> df run after renaming (derived tables)
+    - fill_numeric / fill_values: NULL replacements after typing
+    - conflict_key: natural key backed by a unique index (required for 'upsert')
+    - depends_on: tables whose rows must be loaded first (foreign keys)
+    - unique_rows: keep only the first row per conflict_key, also across
+      streamed chunks (derived tables)
+    - load_strategy: 'replace' (DELETE + COPY), 'append' (COPY),
+      'upsert' (COPY into staging, then INSERT ... ON CONFLICT for changed rows)
+      or 'swap' (COPY into a shadow copy, then swap it in by rename). Tables
+      that other tables reference (LOKASI) or that use row level security
+      cannot be swapped and fall back to 'upsert'; 'upsert' without a
+      conflict_key falls back to 'replace' (see resolve_strategy)
+
+    `source` resolves to the newer of the declared file and its .csv /
+    .parquet sibling (see resolve_source).
+    """
+
+    def __init__(self, name, columns, source=None, column_mapping=None, optional_columns=(),
+                 strip_whitespace=False, transform=None, fill_numeric=None, fill_values=None,
+                 conflict_key=(), depends_on=(), unique_rows=False, load_strategy='replace',
+                 label=None):
+        self.name = name
+        self.columns = columns
+        self.declared_source = source
+        self.column_mapping = column_mapping or {}
+        self.optional_columns = set(optional_columns)
+        self.strip_whitespace = strip_whitespace
+        self.transform = transform
+        self.fill_numeric = fill_numeric
+        self.fill_values = fill_values or {}
+        self.conflict_key = tuple(conflict_key)
+        self.depends_on = tuple(depends_on)
+        self.unique_rows = unique_rows
+        self.load_strategy = load_strategy
+        self.label = label or name.replace('_', ' ').title()
+
+    @property
+    def source(self):
+        return resolve_source(self.declared_source)
+
+    @property
+    def source_dtypes(self):
+        """{source header: dtype} so the CSV parser can type columns while reading"""
+        source_names = {column: header for header, column in self.column_mapping.items()}
+        return {source_names.get(col, col): dtype for col, dtype in self.columns.items()}
+
+    @property
+    def required_columns(self):
+        return [col for col in self.columns if col not in self.optional_columns]
+
+    def __repr__(self):
+        return f"TableSpec({self.name!r}, strategy={self.load_strategy!r})"
+
+
+# =====================================================
+# MAIN TABLES (derived from covid_19_indonesia_enhanced.csv)
+# =====================================================
+
+LOKASI_MAPPING = {
+    'Location ISO Code': 'iso_code',
+    'Province': 'nama_provinsi',
+    'Population': 'populasi',
+    'Area (km2)': 'luas_wilayah',
+    'Latitude': 'latitude',
+    'Longitude': 'longitude',
+    'Island': 'island',
+    'Population Density': 'population_density',
+    'Total Regencies': 'total_regencies',
+    'Total Cities': 'total_cities'
+}
+
+
+def _keyed_randint(keys, low, high, salt):
+    """Random ints in [low, high) seeded by each key, so every import draws the same values
+
+    Redrawing on each prepare would make every LOKASI row differ from its
+    stored version and --incremental would rewrite them all.
+    """
+    return np.array([np.random.default_rng([salt, zlib.crc32(str(key).encode())]).integers(low, high)
+                     for key in keys], dtype=np.int64)
+
+
+def derive_lokasi(df):
+    """Reduce the daily source to one row per location"""
+    lokasi = df.drop_duplicates(subset='iso_code').reset_index(drop=True)
+    iso_codes = lokasi['iso_code']
+
+    lokasi['area_km2'] = lokasi['luas_wilayah']
+
+    # Use existing data from CSV if available, otherwise use random (stable per iso_code)
+    if 'total_regencies' not in lokasi.columns:
+        lokasi['total_regencies'] = _keyed_randint(iso_codes, 5, 30, salt=1)
+    if 'total_cities' not in lokasi.columns:
+        lokasi['total_cities'] = _keyed_randint(iso_codes, 1, 10, salt=2)
+
+    # Fill other fields
+    lokasi['total_districts'] = _keyed_randint(iso_codes, 50, 500, salt=3)
+    lokasi['total_urban_villages'] = _keyed_randint(iso_codes, 100, 1000, salt=4)
+    lokasi['total_rural_villages'] = _keyed_randint(iso_codes, 200, 2000, salt=5)
+    lokasi['time_zone'] = 'WIB'  # Default timezone
+    lokasi['special_status'] = None
+    return lokasi
+
+
+STATISTIK_MAPPING = {
+    'Date': 'tanggal',
+    'Location ISO Code': 'iso_code',
+    'New Cases': 'kasus_baru',
+    'New Deaths': 'kematian_baru',
+    'New Recovered': 'sembuh_baru',
+    'Total Cases': 'total_kasus',
+    'Total Deaths': 'total_kematian',
+    'Total Recovered': 'total_sembuh',
+    'Total Active Cases': 'total_aktif',
+    'New Cases per Million': 'kasus_baru_per_juta',
+    'Total Cases per Million': 'total_kasus_per_juta',
+    'New Deaths per Million': 'kematian_baru_per_juta',
+    'Total Deaths per Million': 'total_kematian_per_juta',
+    'Case Fatality Rate': 'case_fatality_rate',
+    'Case Recovered Rate': 'case_recovered_rate',
+    'Growth Factor of New Cases': 'growth_factor_cases',
+    'Growth Factor of New Deaths': 'growth_factor_deaths'
+}
+
+STATISTIK_COLUMNS = {
+    'iso_code': 'str', 'tanggal': 'date',
+    'kasus_baru': 'int', 'kematian_baru': 'int', 'sembuh_baru': 'int',
+    'total_kasus': 'int', 'total_kematian': 'int', 'total_sembuh': 'int', 'total_aktif': 'int',
+    'kasus_baru_per_juta': 'float', 'total_kasus_per_juta': 'float',
+    'kematian_baru_per_juta': 'float', 'total_kematian_per_juta': 'float',
+    # Published as '2.5%' in the source
+    'case_fatality_rate': 'percent', 'case_recovered_rate': 'percent',
+    'growth_factor_cases': 'float', 'growth_factor_deaths': 'float',
+    # Healthcare & testing
+    'tests_conducted': 'int', 'positivity_rate': 'float',
+    'hospital_capacity': 'float', 'icu_occupancy': 'float',
+    # Vaccination
+    'vaccinations_total': 'int', 'vaccinations_new': 'int',
+    'fully_vaccinated': 'int', 'vaccination_rate': 'float',
+    # Economic & social impact
+    'mobility_index': 'float', 'economic_impact_score': 'int',
+    'school_closure_level': 'int', 'stringency_index': 'float',
+    # Demographics & risk factors
+    'age_group_risk': 'category', 'comorbidity_rate': 'float', 'healthcare_workers_infected': 'int',
+    # Weather & environment
+    'temperature_avg': 'float', 'humidity_avg': 'float',
+    'air_quality_index': 'int', 'rainfall_mm': 'float',
+    # Social & economic indicators
+    'unemployment_rate': 'float', 'poverty_rate': 'float',
+    'education_index': 'float', 'internet_penetration': 'float',
+    # Healthcare infrastructure
+    'hospital_beds_per_1000': 'float', 'doctors_per_1000': 'float',
+    'nurses_per_1000': 'float', 'ventilators_available': 'int',
+    # Transportation & mobility
+    'public_transport_usage': 'float', 'private_vehicle_density': 'float',
+    'flight_frequency': 'int',
+    # Demographic details
+    'median_age': 'float', 'elderly_population_pct': 'float', 'urban_population_pct': 'float'
+}
+
+LOKASI = TableSpec(
+    'LOKASI',
+    columns={
+        'iso_code': 'str', 'nama_provinsi': 'str', 'populasi': 'int',
+        'luas_wilayah': 'float', 'latitude': 'float', 'longitude': 'float',
+        'island': 'category', 'population_density': 'float', 'area_km2': 'float',
+        'total_regencies': 'int', 'total_cities': 'int', 'total_districts': 'int',
+        'total_urban_villages': 'int', 'total_rural_villages': 'int',
+        'time_zone': 'str', 'special_status': 'str'
+    },
+    source=ENHANCED_SOURCE,
+    column_mapping=LOKASI_MAPPING,
+    strip_whitespace=True,
+    transform=derive_lokasi,
+    fill_numeric=0,
+    # The country-level row (IDN) has no Province; nama_provinsi is NOT NULL
+    fill_values={'nama_provinsi': 'Indonesia'},
+    conflict_key=('iso_code',),
+    unique_rows=True,
+    label='Lokasi'
+)
+
+STATISTIK_HARIAN = TableSpec(
+    'STATISTIK_HARIAN',
+    columns=STATISTIK_COLUMNS,
+    source=ENHANCED_SOURCE,
+    column_mapping=STATISTIK_MAPPING,
+    # Enhanced columns are only loaded when the CSV has them
+    optional_columns=[col for col in STATISTIK_COLUMNS if col not in ('iso_code', 'tanggal')],
+    strip_whitespace=True,
+    fill_numeric=0,
+    fill_values={'age_group_risk': 'Medium'},
+    conflict_key=('iso_code', 'tanggal'),
+    depends_on=('LOKASI',),
+    label='Statistik Harian'
+)
+
+# =====================================================
+# ENHANCEMENT TABLES (dummy_data/*.csv)
+# =====================================================
+
+RUMAH_SAKIT = TableSpec(
+    'RUMAH_SAKIT',
+    columns={
+        'iso_code': 'str', 'nama_rumah_sakit': 'str', 'tipe_rumah_sakit': 'category',
+        'kelas_rumah_sakit': 'category', 'total_bed': 'int', 'icu_bed': 'int',
+        'isolation_bed': 'int', 'emergency_bed': 'int', 'ventilator_count': 'int',
+        'oxygen_capacity': 'int', 'ct_scan_available': 'bool', 'pcr_lab_available': 'bool',
+        'doctor_count': 'int', 'nurse_count': 'int', 'specialist_count': 'int',
+        'latitude': 'float', 'longitude': 'float', 'alamat': 'str',
+        'covid_referral': 'bool', 'operational_status': 'category'
+    },
+    source=f'{DUMMY_DATA_DIR}/rumah_sakit.csv',
+    depends_on=('LOKASI',),
+    label='Rumah Sakit'
+)
+
+VAKSINASI_DETAIL = TableSpec(
+    'VAKSINASI_DETAIL',
+    columns={
+        'iso_code': 'str', 'tanggal': 'date', 'vaksin_sinovac': 'int',
+        'vaksin_astrazeneca': 'int', 'vaksin_pfizer': 'int', 'vaksin_moderna': 'int',
+        'vaksin_novavax': 'int', 'vaksin_lainnya': 'int', 'dosis_1': 'int',
+        'dosis_2': 'int', 'dosis_booster': 'int', 'lansia_vaksin': 'int',
+        'dewasa_vaksin': 'int', 'remaja_vaksin': 'int', 'anak_vaksin': 'int',
+        'nakes_vaksin': 'int', 'guru_vaksin': 'int', 'petugas_publik_vaksin': 'int',
+        'puskesmas_vaksin': 'int', 'rumah_sakit_vaksin': 'int', 'sentra_vaksin': 'int',
+        'drive_thru_vaksin': 'int', 'kipi_ringan': 'int', 'kipi_sedang': 'int',
+        'kipi_berat': 'int'
+    },
+    source=f'{DUMMY_DATA_DIR}/vaksinasi_detail.csv',
+    conflict_key=('iso_code', 'tanggal'),
+    depends_on=('LOKASI',),
+    label='Vaksinasi Detail'
+)
+
+KEBIJAKAN_PEMERINTAH = TableSpec(
+    'KEBIJAKAN_PEMERINTAH',
+    columns={
+        'iso_code': 'str', 'tanggal_mulai': 'date', 'tanggal_selesai': 'date',
+        'jenis_kebijakan': 'category', 'nama_kebijakan': 'str', 'deskripsi_kebijakan': 'str',
+        'tingkat_keketatan': 'int', 'sektor_pendidikan': 'bool', 'sektor_ekonomi': 'bool',
+        'sektor_transportasi': 'bool', 'sektor_pariwisata': 'bool', 'sektor_ibadah': 'bool',
+        'compliance_rate': 'float', 'dampak_ekonomi_pct': 'float', 'status_kebijakan': 'category'
+    },
+    source=f'{DUMMY_DATA_DIR}/kebijakan_pemerintah.csv',
+    depends_on=('LOKASI',),
+    label='Kebijakan Pemerintah'
+)
+
+EKONOMI_REGIONAL = TableSpec(
+    'EKONOMI_REGIONAL',
+    columns={
+        'iso_code': 'str', 'tahun': 'int', 'bulan': 'int', 'pdrb_milyar': 'float',
+        'pertumbuhan_ekonomi': 'float', 'inflasi_rate': 'float',
+        'tingkat_pengangguran': 'float', 'tingkat_partisipasi_kerja': 'float',
+        'upah_minimum_regional': 'int', 'sektor_pertanian': 'float',
+        'sektor_industri': 'float', 'sektor_perdagangan': 'float', 'sektor_jasa': 'float',
+        'sektor_pariwisata': 'float', 'penurunan_omzet_umkm': 'float',
+        'penutupan_usaha': 'int', 'bantuan_sosial_milyar': 'float',
+        'recovery_index': 'float', 'business_confidence': 'float'
+    },
+    source=f'{DUMMY_DATA_DIR}/ekonomi_regional.csv',
+    conflict_key=('iso_code', 'tahun', 'bulan'),
+    depends_on=('LOKASI',),
+    label='Ekonomi Regional'
+)
+
+TESTING_LABS = TableSpec(
+    'TESTING_LABS',
+    columns={
+        'iso_code': 'str', 'nama_lab': 'str', 'jenis_lab': 'category', 'tipe_kepemilikan': 'category',
+        'kapasitas_harian_pcr': 'int', 'kapasitas_harian_antigen': 'int',
+        'kapasitas_harian_antibodi': 'int', 'mesin_pcr_count': 'int',
+        'extraction_kit_stock': 'int', 'reagent_stock': 'int', 'analis_count': 'int',
+        'teknisi_count': 'int', 'turnaround_time_pcr': 'int',
+        'turnaround_time_antigen': 'int', 'akreditasi_kemenkes': 'bool',
+        'iso_certified': 'bool', 'latitude': 'float', 'longitude': 'float',
+        'alamat': 'str', 'operational_24_hours': 'bool', 'drive_thru_available': 'bool'
+    },
+    source=f'{DUMMY_DATA_DIR}/testing_labs.csv',
+    depends_on=('LOKASI',),
+    label='Testing Labs'
+)
+
+CLUSTER_PENULARAN = TableSpec(
+    'CLUSTER_PENULARAN',
+    columns={
+        'iso_code': 'str', 'tanggal_terdeteksi': 'date', 'tanggal_selesai': 'date',
+        'nama_cluster': 'str', 'jenis_cluster': 'category', 'nama_lokasi': 'str',
+        'alamat_lokasi': 'str', 'latitude': 'float', 'longitude': 'float',
+        'kasus_index': 'int', 'total_kasus_terkait': 'int', 'total_kontak_erat': 'int',
+        'total_suspect': 'int', 'kasus_anak': 'int', 'kasus_dewasa': 'int',
+        'kasus_lansia': 'int', 'kasus_laki': 'int', 'kasus_perempuan': 'int',
+        'kasus_tanpa_gejala': 'int', 'kasus_ringan': 'int', 'kasus_sedang': 'int',
+        'kasus_berat': 'int', 'kasus_kritis': 'int', 'kasus_meninggal': 'int',
+        'contact_tracing_completed': 'bool', 'area_disinfection': 'bool',
+        'temporary_closure': 'bool', 'mass_testing': 'bool', 'status_cluster': 'category',
+        'catatan': 'str'
+    },
+    source=f'{DUMMY_DATA_DIR}/cluster_penularan.csv',
+    depends_on=('LOKASI',),
+    label='Cluster Penularan'
+)
+
+MOBILITAS_HARIAN = TableSpec(
+    'MOBILITAS_HARIAN',
+    columns={
+        'iso_code': 'str', 'tanggal': 'date', 'retail_recreation': 'float',
+        'grocery_pharmacy': 'float', 'parks': 'float', 'transit_stations': 'float',
+        'workplaces': 'float', 'residential': 'float', 'private_vehicle_movement': 'float',
+        'public_transport_usage': 'float', 'walking_cycling': 'float',
+        'morning_rush_hour': 'float', 'afternoon_activity': 'float',
+        'evening_rush_hour': 'float', 'night_activity': 'float',
+        'overall_mobility_index': 'float'
+    },
+    source=f'{DUMMY_DATA_DIR}/mobilitas_harian.csv',
+    conflict_key=('iso_code', 'tanggal'),
+    depends_on=('LOKASI',),
+    label='Mobilitas Harian'
+)
+
+# =====================================================
+# SYNTHETIC MAIN TABLES (generate_enhanced_dummy_data.py --core)
+# =====================================================
+
+SYNTHETIC_LOKASI = TableSpec(
+    'LOKASI',
+    columns=LOKASI.columns,
+    source=f'{DUMMY_DATA_DIR}/lokasi.csv',
+    fill_numeric=0,
+    conflict_key=('iso_code',),
+    label='Lokasi (synthetic)'
+)
+
+SYNTHETIC_STATISTIK_HARIAN = TableSpec(
+    'STATISTIK_HARIAN',
+    columns=STATISTIK_COLUMNS,
+    source=f'{DUMMY_DATA_DIR}/statistik_harian.csv',
+    fill_numeric=0,
+    fill_values={'age_group_risk': 'Medium'},
+    conflict_key=('iso_code', 'tanggal'),
+    depends_on=('LOKASI',),
+    label='Statistik Harian (synthetic)'
+)
+
+# All specs in foreign-key order (LOKASI first)
+MAIN_SPECS = {spec.name: spec for spec in [LOKASI, STATISTIK_HARIAN]}
+SYNTHETIC_MAIN_SPECS = {spec.name: spec for spec in [SYNTHETIC_LOKASI, SYNTHETIC_STATISTIK_HARIAN]}
+ENHANCED_SPECS = {
+    spec.name: spec for spec in [
+        RUMAH_SAKIT, VAKSINASI_DETAIL, KEBIJAKAN_PEMERINTAH, EKONOMI_REGIONAL,
+        TESTING_LABS, CLUSTER_PENULARAN, MOBILITAS_HARIAN
+    ]
+}
+TABLE_SPECS = {**MAIN_SPECS, **ENHANCED_SPECS}
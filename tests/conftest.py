@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the import engine and generator tests
+"""
+import os
+import re
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def not_null_columns(table_name):
+    """Columns declared NOT NULL (or PRIMARY KEY) for a table in supabase_schema.sql"""
+    with open(os.path.join(REPO_DIR, 'supabase_schema.sql')) as f:
+        schema = f.read()
+    body = re.search(rf"CREATE TABLE IF NOT EXISTS {table_name} \((.*?)\n\);", schema, re.S).group(1)
+    return [match.group(1) for match in re.finditer(r"^\s+(\w+) [^\n]*(?:NOT NULL|PRIMARY KEY)", body, re.M)]
+
+
+@pytest.fixture
+def enhanced_source():
+    """A few rows of covid_19_indonesia_enhanced.csv, including the country-level row"""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'Date': ['3/1/2020', '3/1/2020', '3/2/2020', '3/1/2020'],
+        'Location ISO Code': ['ID-JK', 'ID-JB', 'ID-JK', 'IDN'],
+        'Location': ['DKI Jakarta', 'Jawa Barat', 'DKI Jakarta', 'Indonesia'],
+        'Province': ['DKI Jakarta', 'Jawa Barat', 'DKI Jakarta', None],
+        'Island': ['Jawa', 'Jawa', 'Jawa', None],
+        'Population': [10846145, 45161325, 10846145, 265185520],
+        'Area (km2)': [664, 35378, 664, None],
+        'Latitude': [-6.2, -6.9, -6.2, None],
+        'Longitude': [106.8, 107.6, 106.8, None],
+        'Population Density': [16334.31, 1276.55, 16334.31, None],
+        'New Cases': [2, 0, 1, 2],
+        'New Deaths': [0, 0, 0, 0],
+        'New Recovered': [0, 0, 0, 0],
+        'Total Cases': [2, 0, 3, 2],
+        'Total Deaths': [0, 0, 0, 0],
+        'Total Recovered': [0, 0, 0, 0],
+        'Total Active Cases': [2, 0, 3, 2],
+        'Case Fatality Rate': ['0.00%', '0.00%', '0.00%', '0.00%'],
+        'Case Recovered Rate': ['0.00%', '0.00%', '0.00%', '0.00%']
+    })
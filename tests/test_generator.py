@@ -0,0 +1,58 @@
+"""
+Tests for the dummy data generator's determinism
+"""
+import hashlib
+import os
+
+import pandas as pd
+
+import generate_enhanced_dummy_data as generator
+
+
+def generate_files(directory, monkeypatch, **options):
+    """Run the generator in `directory`; returns {file: md5} without the timestamped metadata"""
+    monkeypatch.chdir(directory)
+    generator.main(chunk_rows=500, core=True, **options)
+    return {
+        name: hashlib.md5((directory / 'dummy_data' / name).read_bytes()).hexdigest()
+        for name in sorted(os.listdir(directory / 'dummy_data')) if name != 'metadata.json'
+    }
+
+
+def test_output_does_not_depend_on_worker_count(tmp_path, monkeypatch):
+    (tmp_path / 'one').mkdir()
+    (tmp_path / 'three').mkdir()
+
+    one = generate_files(tmp_path / 'one', monkeypatch, workers=1)
+    three = generate_files(tmp_path / 'three', monkeypatch, workers=3)
+
+    assert set(one) == {f"{table}.csv" for table in generator.GENERATORS}
+    assert one == three
+
+
+def test_generate_table_depends_only_on_its_seed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('dummy_data')
+    seeds = generator.table_seeds(42)
+
+    records, columns = generator.generate_table('rumah_sakit', seeds['rumah_sakit'], chunk_rows=100)
+    first = (tmp_path / 'dummy_data' / 'rumah_sakit.csv').read_bytes()
+    # Other tables drawing first must not change this table's stream
+    generator.generate_table('mobilitas_harian', seeds['mobilitas_harian'], chunk_rows=100)
+    generator.generate_table('rumah_sakit', generator.table_seeds(42)['rumah_sakit'], chunk_rows=100)
+
+    assert (tmp_path / 'dummy_data' / 'rumah_sakit.csv').read_bytes() == first
+    assert records == len(pd.read_csv(tmp_path / 'dummy_data' / 'rumah_sakit.csv'))
+    assert columns[0] == 'id_rumah_sakit'
+
+
+def test_scaled_files_come_with_their_own_lokasi(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    generator.main(scale=2, workers=1)
+
+    lokasi = set(pd.read_csv(tmp_path / 'dummy_data' / 'lokasi.csv')['iso_code'])
+    assert len(lokasi) == 68
+    for table in generator.GENERATORS:
+        codes = set(pd.read_csv(tmp_path / 'dummy_data' / f"{table}.csv", usecols=['iso_code'])['iso_code'])
+        assert codes <= lokasi, table
@@ -0,0 +1,51 @@
+"""
+Tests for the background database health monitor
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('streamlit')
+from supabase_config import HealthMonitor
+
+
+def test_refresh_during_a_check_is_not_lost():
+    in_check = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def check():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            in_check.set()
+            release.wait(5)
+        return True, "ok"
+
+    monitor = HealthMonitor(check, interval=60)
+    monitor.start()
+    assert in_check.wait(5)
+    monitor.refresh()  # arrives while the first check is still running
+    release.set()
+
+    deadline = time.monotonic() + 5
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+
+def test_first_wait_is_capped_for_an_unreachable_database():
+    release = threading.Event()
+
+    def check():
+        release.wait(5)
+        return False, "timeout"
+
+    monitor = HealthMonitor(check, interval=60)
+    start = time.monotonic()
+    assert not monitor.wait_ready(timeout=0.1)
+    assert time.monotonic() - start < 1
+    assert not monitor.has_checked() and not monitor.is_healthy()
+
+    release.set()
+    assert monitor.wait_ready(timeout=5) and monitor.has_checked()
@@ -0,0 +1,140 @@
+"""
+Tests for the pure parts of import_engine: parsing, typing and COPY rendering
+"""
+import logging
+
+import pandas as pd
+import pytest
+
+from import_engine import BOOKKEEPING_TABLES, DataFrameCopyReader, apply_schema, bookkeeping_ddl, parse_csv
+
+
+def test_parse_csv_falls_back_to_pandas_with_a_warning(tmp_path, caplog):
+    pytest.importorskip('pyarrow')
+    source = tmp_path / 'dates.csv'
+    source.write_text('tanggal,rate\n2021-13-45,1.5%\n')
+
+    with caplog.at_level(logging.WARNING, logger='import_engine'):
+        df = parse_csv(str(source), {'tanggal': 'date', 'rate': 'percent'}, table='KEBIJAKAN_PEMERINTAH')
+
+    assert df['rate'].tolist() == [1.5]
+    assert 'KEBIJAKAN_PEMERINTAH' in caplog.text and 'falling back to pandas' in caplog.text
+
+
+def test_parse_csv_reads_dates_as_month_first(tmp_path, caplog):
+    pytest.importorskip('pyarrow')
+    source = tmp_path / 'dates.csv'
+    source.write_text('tanggal\n3/4/2021\n12/31/2021\n')
+
+    with caplog.at_level(logging.WARNING, logger='import_engine'):
+        df = parse_csv(str(source), {'tanggal': 'date'})
+
+    assert df['tanggal'].tolist() == [pd.Timestamp('2021-03-04'), pd.Timestamp('2021-12-31')]
+    assert 'falling back to pandas' not in caplog.text
+
+
+def test_parse_csv_does_not_read_day_first_dates(tmp_path, caplog):
+    pytest.importorskip('pyarrow')
+    source = tmp_path / 'dates.csv'
+    source.write_text('tanggal\n31/12/2021\n')
+
+    with caplog.at_level(logging.WARNING, logger='import_engine'):
+        parse_csv(str(source), {'tanggal': 'date'})
+
+    assert 'falling back to pandas' in caplog.text
+
+
+def copy_chunks_fixture():
+    return [
+        pd.DataFrame({
+            'iso_code': ['ID-JK', 'ID-JB'],
+            'tanggal': pd.to_datetime(['2021-01-01', '2021-01-02']),
+            'kasus_baru': pd.array([5, None], dtype='Int64'),
+            'nama': ['Jakarta, Pusat', None]
+        }),
+        pd.DataFrame({
+            'iso_code': ['ID-JI'],
+            'tanggal': pd.to_datetime(['2021-01-03']),
+            'kasus_baru': pd.array([7], dtype='Int64'),
+            'nama': ['Surabaya – Kota']
+        })
+    ]
+
+
+COPY_CSV = ('ID-JK,2021-01-01,5,"Jakarta, Pusat"\n'
+            'ID-JB,2021-01-02,,\n'
+            'ID-JI,2021-01-03,7,Surabaya – Kota\n')
+
+
+@pytest.mark.parametrize('size', [-1, 1, 7, 1 << 20])
+def test_copy_reader_renders_chunks_as_copy_csv(size):
+    reader = DataFrameCopyReader(copy_chunks_fixture())
+
+    parts = []
+    while True:
+        part = reader.read(size)
+        if not part:
+            break
+        assert size < 0 or len(part) <= size
+        parts.append(part)
+
+    assert ''.join(parts) == COPY_CSV
+    assert reader.rows == 3
+    assert reader.bytes_sent == len(COPY_CSV.encode()) > len(COPY_CSV)
+
+
+def test_copy_reader_readline_crosses_chunks():
+    reader = DataFrameCopyReader(copy_chunks_fixture())
+
+    lines = list(iter(reader.readline, ''))
+
+    assert ''.join(lines) == COPY_CSV
+    assert len(lines) == 3
+    assert reader.bytes_sent == len(COPY_CSV.encode())
+
+
+def test_apply_schema_coerces_percent_bool_and_date():
+    df = pd.DataFrame({
+        'rate': ['12.5%', ' 3% ', 'n/a', None],
+        'count': ['1', '2.0', '', '4%'],
+        'flag': ['Yes', 'f', '1', 'maybe'],
+        'tanggal': ['2021-03-01', '2021-03-02', '', 'not a date'],
+        'kode': [1, 2, 3, 4],
+        'jenis': ['A', 'B', 'A', None],
+        'unused': [0, 0, 0, 0]
+    })
+
+    data = apply_schema(df, {'tanggal': 'date', 'rate': 'percent', 'count': 'int', 'flag': 'bool',
+                             'kode': 'str', 'jenis': 'category'})
+
+    assert list(data.columns) == ['tanggal', 'rate', 'count', 'flag', 'kode', 'jenis']
+    assert data['rate'].dtype == 'float64'
+    assert data['rate'].tolist()[:2] == [12.5, 3.0] and data['rate'].iloc[2:].isna().all()
+    assert data['count'].dtype == 'Int64'
+    assert data['count'].tolist() == [1, 2, pd.NA, 4]
+    assert data['flag'].tolist() == [True, False, True, pd.NA]
+    assert data['tanggal'].dtype.kind == 'M'
+    assert data['tanggal'].iloc[:2].dt.day.tolist() == [1, 2] and data['tanggal'].iloc[2:].isna().all()
+    assert data['kode'].tolist() == ['1', '2', '3', '4']
+    assert isinstance(data['jenis'].dtype, pd.CategoricalDtype)
+
+
+def test_apply_schema_passes_typed_columns_through():
+    df = pd.DataFrame({'rate': [1.5, None], 'n': [1, 2], 'ok': [True, False]})
+
+    data = apply_schema(df, {'rate': 'percent', 'n': 'int', 'ok': 'bool'})
+
+    assert data['rate'].dtype == 'float64' and data['n'].dtype == 'int64' and data['ok'].dtype == 'bool'
+
+
+def test_apply_schema_rejects_unknown_dtypes():
+    with pytest.raises(ValueError):
+        apply_schema(pd.DataFrame({'a': [1]}), {'a': 'decimal'})
+
+
+@pytest.mark.parametrize('table_name', BOOKKEEPING_TABLES)
+def test_bookkeeping_ddl_comes_from_the_schema(table_name):
+    ddl = bookkeeping_ddl(table_name)
+
+    assert ddl.startswith(f"CREATE TABLE IF NOT EXISTS {table_name.upper()} (")
+    assert 'table_name VARCHAR(50)' in ddl and ddl.endswith('\n);')
@@ -0,0 +1,89 @@
+"""
+Tests for plan_imports: which tables are skipped as unchanged and which are reloaded
+"""
+import pytest
+
+import import_engine
+from import_engine import file_hash, plan_imports
+from table_specs import TableSpec
+
+
+class FakeConnection:
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def specs(tmp_path):
+    def spec(name, depends_on=(), conflict_key=()):
+        source = tmp_path / f"{name.lower()}.csv"
+        source.write_text(f"{name}\n1\n")
+        return TableSpec(name, {'iso_code': 'str'}, source=str(source), conflict_key=conflict_key,
+                         depends_on=depends_on)
+
+    return {
+        'LOKASI': spec('LOKASI', conflict_key=('iso_code',)),
+        'STATISTIK_HARIAN': spec('STATISTIK_HARIAN', depends_on=('LOKASI',), conflict_key=('iso_code',)),
+        'RUMAH_SAKIT': spec('RUMAH_SAKIT', depends_on=('LOKASI',))
+    }
+
+
+@pytest.fixture
+def manifest(monkeypatch):
+    """{table: source hash of its last load}, standing in for the IMPORT_MANIFEST table"""
+    hashes = {}
+    monkeypatch.setattr(import_engine, 'ensure_bookkeeping', lambda conn: None)
+    monkeypatch.setattr(import_engine, 'manifest_hash', lambda conn, name: hashes.get(name))
+    return hashes
+
+
+def loaded(manifest, specs, *names):
+    for name in names:
+        manifest[name] = file_hash(specs[name].source)
+
+
+def test_first_import_loads_everything(specs, manifest):
+    digests, skipped = plan_imports(FakeConnection(), specs)
+
+    assert skipped == {}
+    assert digests == {name: file_hash(spec.source) for name, spec in specs.items()}
+
+
+def test_unchanged_sources_are_skipped(specs, manifest):
+    loaded(manifest, specs, *specs)
+
+    _, skipped = plan_imports(FakeConnection(), specs)
+
+    assert set(skipped) == set(specs)
+    assert all(stats['skipped'] for stats in skipped.values())
+
+
+def test_replacing_a_dependency_reloads_its_dependents(specs, manifest, tmp_path):
+    loaded(manifest, specs, *specs)
+    (tmp_path / 'lokasi.csv').write_text("LOKASI\n2\n")
+
+    _, skipped = plan_imports(FakeConnection(), specs)
+
+    # The DELETE on LOKASI cascades into every table that references it
+    assert skipped == {}
+
+
+def test_upserting_a_dependency_keeps_dependents_skipped(specs, manifest, tmp_path):
+    loaded(manifest, specs, *specs)
+    (tmp_path / 'lokasi.csv').write_text("LOKASI\n2\n")
+
+    _, skipped = plan_imports(FakeConnection(), specs, strategy='upsert')
+
+    assert set(skipped) == {'STATISTIK_HARIAN', 'RUMAH_SAKIT'}
+
+
+def test_force_and_missing_sources_are_never_skipped(specs, manifest, tmp_path):
+    loaded(manifest, specs, *specs)
+
+    _, forced = plan_imports(FakeConnection(), specs, force=True)
+    digests, skipped = plan_imports(FakeConnection(), specs,
+                                    sources={'RUMAH_SAKIT': str(tmp_path / 'missing.csv')})
+
+    assert forced == {}
+    assert digests['RUMAH_SAKIT'] is None
+    assert set(skipped) == {'LOKASI', 'STATISTIK_HARIAN'}
@@ -0,0 +1,71 @@
+"""
+Tests for the parsed-source Parquet cache
+"""
+import os
+
+import pytest
+
+import import_engine
+from import_engine import cache_source, iter_prepared, merged_source_dtypes, read_source, source_cache_path
+from table_specs import TableSpec
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / 'cache'
+    monkeypatch.setattr(import_engine, 'SOURCE_CACHE_DIR', str(path))
+    return path
+
+
+def write_csv(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_cache_key_includes_dtypes(tmp_path, cache_dir):
+    source = write_csv(tmp_path / 'data.csv', 'code,rate\n007,12.5%\n')
+
+    as_text = read_source(source, {'code': 'str', 'rate': 'percent'})
+    as_numbers = read_source(source, {'rate': 'percent'})
+
+    assert source_cache_path(source, {'code': 'str'}) != source_cache_path(source, {'code': 'int'})
+    assert as_text['code'].tolist() == ['007']
+    assert as_numbers['code'].tolist() == [7]
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_stale_cleanup_only_touches_the_same_source(tmp_path, cache_dir):
+    data = write_csv(tmp_path / 'data.csv', 'a\n1\n')
+    data_v2 = write_csv(tmp_path / 'data.v2.csv', 'a\n2\n')
+    other_dir = write_csv(tmp_path / 'other' / 'data.csv', 'a\n3\n')
+    for source in (data, data_v2, other_dir):
+        read_source(source)
+
+    # A new version of data.csv replaces only its own cache
+    old_cache = source_cache_path(data)
+    write_csv(tmp_path / 'data.csv', 'a\n44\n')
+    assert read_source(data)['a'].tolist() == [44]
+
+    assert not os.path.exists(old_cache)
+    for source in (data, data_v2, other_dir):
+        assert os.path.exists(source_cache_path(source))
+    assert read_source(data_v2)['a'].tolist() == [2]
+    assert read_source(other_dir)['a'].tolist() == [3]
+
+
+def test_chunked_reads_use_the_shared_cache(tmp_path, cache_dir, monkeypatch):
+    source = write_csv(tmp_path / 'shared.csv', 'code,rate\n007,12.5%\n')
+    codes = TableSpec('CODES', {'code': 'str'}, source=source)
+    rates = TableSpec('RATES', {'rate': 'percent'}, source=source)
+    dtypes = merged_source_dtypes({'CODES': codes, 'RATES': rates})[source]
+    assert dtypes == {'code': 'str', 'rate': 'percent'}
+
+    cache_source(source, dtypes)
+    monkeypatch.setattr(import_engine.pd, 'read_csv', None)  # must not fall back to the CSV
+    chunks = list(iter_prepared(rates, chunksize=10, dtypes=dtypes))
+
+    assert chunks[0]['rate'].tolist() == [12.5]
+    assert len(os.listdir(cache_dir)) == 1
@@ -0,0 +1,35 @@
+"""
+Tests for borrowing pooled connections in supabase_config
+"""
+import pytest
+
+pytest.importorskip('streamlit')
+import supabase_config
+from supabase_config import ConnectionPool, SupabaseConfig
+
+
+@pytest.fixture
+def failing_config(monkeypatch):
+    def connect():
+        raise ConnectionError("database unreachable")
+
+    errors = []
+    monkeypatch.setattr(supabase_config.st, 'error', errors.append)
+    config = SupabaseConfig()
+    config._pool = ConnectionPool(connect, min_size=0, max_size=1, timeout=0.1)
+    return config, errors
+
+
+def test_failed_checkout_is_reported_and_yields_none(failing_config):
+    config, errors = failing_config
+    with config.connection() as conn:
+        assert conn is None
+    assert len(errors) == 1
+
+
+def test_failed_checkout_raises_quietly_for_the_caller(failing_config):
+    config, errors = failing_config
+    with pytest.raises(ConnectionError):
+        with config.connection(raise_errors=True):
+            pass
+    assert errors == []
@@ -0,0 +1,19 @@
+"""
+Tests for the synthetic LOKASI and STATISTIK_HARIAN generators
+"""
+import numpy as np
+import pandas as pd
+
+import generate_enhanced_dummy_data as generator
+
+
+def test_statistik_harian_totals_are_cumulative():
+    chunks = generator.generate_statistik_harian_data(np.random.default_rng(1), 1, 1000)
+    data = pd.concat(chunks, ignore_index=True).sort_values(['iso_code', 'tanggal'])
+    per_location = data.groupby('iso_code')
+
+    assert (per_location['kasus_baru'].cumsum() == data['total_kasus']).all()
+    assert (per_location['kematian_baru'].cumsum() == data['total_kematian']).all()
+    assert (per_location['sembuh_baru'].cumsum() == data['total_sembuh']).all()
+    assert (data['total_aktif'] == data['total_kasus'] - data['total_kematian'] - data['total_sembuh']).all()
+    assert (data['total_aktif'] >= 0).all()
@@ -0,0 +1,150 @@
+"""
+View benchmark: latest-row views as STATISTIK_HARIAN history grows
+
+Builds the dashboard schema in a scratch schema of a local PostgreSQL
+stand-in, fills it with N locations and a growing number of days of
+history, and times each "latest row per province" view against the
+correlated MAX subquery it replaced. Everything runs in one transaction
+that is rolled back, so nothing in the stand-in database is changed.
+"""
+import statistics
+import time
+
+from import_benchmark import SCHEMA_FILE
+
+# Days of history per location, measured in this order (each step appends older days)
+HISTORY_DAYS = (30, 180, 365, 930, 1860)
+
+# Locations in the scratch LOKASI (34 = provinces)
+BENCH_LOCATIONS = 34
+
+# Timed runs per query and history size; the median is reported
+BENCH_REPEATS = 7
+
+# Comparison table written by --benchmark-views
+VIEW_BENCHMARK_REPORT = 'view_benchmark.md'
+
+BENCH_SCHEMA = '_bench_views'
+
+# Last day of the synthetic history
+BENCH_END_DATE = '2022-09-15'
+
+# The view definitions before the LATERAL rewrite, for comparison
+LEGACY_QUERIES = {
+    'latest_statistics': """
+        SELECT l.iso_code, l.nama_provinsi, s.*
+        FROM LOKASI l
+        JOIN STATISTIK_HARIAN s ON l.iso_code = s.iso_code
+        WHERE s.tanggal = (
+            SELECT MAX(tanggal) FROM STATISTIK_HARIAN s2 WHERE s2.iso_code = s.iso_code
+        )""",
+    'vaksinasi_terkini': """
+        SELECT l.iso_code, l.nama_provinsi, vd.*
+        FROM LOKASI l
+        JOIN VAKSINASI_DETAIL vd ON l.iso_code = vd.iso_code
+        WHERE vd.tanggal = (
+            SELECT MAX(tanggal) FROM VAKSINASI_DETAIL vd2 WHERE vd2.iso_code = vd.iso_code
+        )"""
+}
+
+# Rows appended for history days [start, stop) before BENCH_END_DATE, one per location and day
+HISTORY_INSERTS = {
+    'latest_statistics': """
+        INSERT INTO STATISTIK_HARIAN (iso_code, tanggal, kasus_baru, total_kasus, total_kematian,
+                                      total_sembuh, total_aktif, positivity_rate, vaccination_rate,
+                                      stringency_index, age_group_risk)
+        SELECT l.iso_code, DATE %(end)s - d, 10, 100000 - d * 10, 1000 - d / 10, 90000 - d * 9,
+               9000 - d, 10 + d %% 20, 50 - d %% 50, 50, 'Medium'
+        FROM LOKASI l, generate_series(%(start)s, %(stop)s - 1) d""",
+    'vaksinasi_terkini': """
+        INSERT INTO VAKSINASI_DETAIL (iso_code, tanggal, dosis_1, dosis_2, dosis_booster,
+                                      vaksin_sinovac, vaksin_astrazeneca, vaksin_pfizer, vaksin_moderna)
+        SELECT l.iso_code, DATE %(end)s - d, 5000, 4000, 1000, 4000, 3000, 2000, 1000
+        FROM LOKASI l, generate_series(%(start)s, %(stop)s - 1) d"""
+}
+
+
+def _median_seconds(cur, sql, repeats):
+    """Median wall time of running sql and fetching every row; returns (seconds, rows)"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cur.execute(sql)
+        rows = len(cur.fetchall())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), rows
+
+
+def run_view_benchmark(connect, history_days=HISTORY_DAYS, locations=BENCH_LOCATIONS,
+                       repeats=BENCH_REPEATS, schema_file=SCHEMA_FILE):
+    """Time each view and its legacy query for every history size
+
+    Returns a list of stats (view, query 'view' or 'legacy', history_days,
+    history_rows, rows, seconds, per_location_ms).
+    """
+    results = []
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+            cur.execute(f"SET LOCAL search_path TO {BENCH_SCHEMA}")
+            with open(schema_file) as f:
+                cur.execute(f.read())
+            cur.execute("""
+                INSERT INTO LOKASI (iso_code, nama_provinsi)
+                SELECT 'BV-' || lpad(i::text, 4, '0'), 'Lokasi ' || i FROM generate_series(1, %s) i
+            """, (locations,))
+
+            loaded = 0
+            for days in sorted(history_days):
+                for insert in HISTORY_INSERTS.values():
+                    cur.execute(insert, {'end': BENCH_END_DATE, 'start': loaded, 'stop': days})
+                loaded = days
+                cur.execute("ANALYZE LOKASI")
+                cur.execute("ANALYZE STATISTIK_HARIAN")
+                cur.execute("ANALYZE VAKSINASI_DETAIL")
+
+                for view, legacy_sql in LEGACY_QUERIES.items():
+                    for query, sql in (('view', f"SELECT * FROM {view}"), ('legacy', legacy_sql)):
+                        seconds, rows = _median_seconds(cur, sql, repeats)
+                        results.append({
+                            'view': view,
+                            'query': query,
+                            'history_days': days,
+                            'history_rows': days * locations,
+                            'rows': rows,
+                            'seconds': seconds,
+                            'per_location_ms': seconds * 1000 / locations
+                        })
+    finally:
+        # Scratch schema and all rows go away with the transaction
+        conn.rollback()
+        conn.close()
+    return results
+
+
+def view_benchmark_lines(results):
+    """Comparison table of run_view_benchmark results for the console"""
+    lines = [f"{'VIEW':20} {'QUERY':7} {'DAYS':>6} {'HISTORY ROWS':>13} {'ROWS':>6} "
+             f"{'MEDIAN':>10} {'PER LOCATION':>13}"]
+    for stats in results:
+        lines.append(f"{stats['view']:20} {stats['query']:7} {stats['history_days']:>6,} "
+                     f"{stats['history_rows']:>13,} {stats['rows']:>6,} "
+                     f"{stats['seconds'] * 1000:>8.2f}ms {stats['per_location_ms']:>11.3f}ms")
+    return lines
+
+
+def write_view_benchmark_report(results, conn_params, path=VIEW_BENCHMARK_REPORT):
+    """Write the comparison as a Markdown table"""
+    with open(path, 'w') as f:
+        f.write("# View Benchmark\n\n")
+        f.write(f"Run {time.strftime('%Y-%m-%d %H:%M')} against "
+                f"`{conn_params.get('host')}:{conn_params.get('port')}/{conn_params.get('dbname')}`. "
+                f"'view' is the LATERAL top-1 view from supabase_schema.sql, 'legacy' the correlated "
+                f"MAX subquery it replaced. Times are medians of repeated runs.\n\n")
+        f.write("| View | Query | History days | History rows | Rows | Median (ms) | Per location (ms) |\n")
+        f.write("|---|---|---:|---:|---:|---:|---:|\n")
+        for stats in results:
+            f.write(f"| {stats['view']} | {stats['query']} | {stats['history_days']:,} "
+                    f"| {stats['history_rows']:,} | {stats['rows']:,} | {stats['seconds'] * 1000:.2f} "
+                    f"| {stats['per_location_ms']:.3f} |\n")